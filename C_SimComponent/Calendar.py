@@ -0,0 +1,85 @@
+import bisect
+import numpy as np
+import pandas as pd
+
+
+#region WorkingCalendar
+class WorkingCalendar(object):
+    """Mapping between simulation (calendar) time and working time of a yard calendar.
+
+    Simulation time is measured from ``origin`` in units of ``time_unit`` hours (24.0: days,
+    as in the shipbuilding scripts). Every day from ``origin`` to ``end`` that is neither a
+    ``weekend`` day (0 = Monday) nor in ``holidays`` is worked in the given ``shifts``, each
+    a (start hour, end hour) pair; a shift may end after midnight (e.g. (22, 30)).
+
+    The working intervals are merged and indexed once with the working hours accumulated
+    before each of them, so both conversions are a binary search: ``working_time`` gives
+    the working hours elapsed at a simulation time and ``calendar_time`` the simulation time
+    at which a number of working hours is reached. ``delay`` is the timeout of a job of a
+    given number of working hours started now, which is all a Process needs per operation.
+    """
+    def __init__(self, origin, end, shifts=((8, 17),), holidays=(), weekend=(5, 6), time_unit=24.0):
+        self.origin = pd.Timestamp(origin)
+        self.time_unit = float(time_unit)
+
+        days = pd.date_range(self.origin.normalize(), pd.Timestamp(end).normalize(), freq='D')
+        days = days[~days.dayofweek.isin(list(weekend)) & ~days.isin(pd.DatetimeIndex(holidays).normalize())]
+        offset = ((days - self.origin) / pd.Timedelta(hours=1)).to_numpy()
+        shifts = np.asarray(shifts, dtype=float).reshape(-1, 2)
+        begin = (offset[:, None] + shifts[:, 0]).ravel()
+        end = (offset[:, None] + shifts[:, 1]).ravel()
+        order = np.argsort(begin, kind='stable')
+        begin, end = np.maximum(begin[order], 0.0), np.maximum(end[order], 0.0)  # origin 이전의 근무 시간은 제외
+
+        # 겹치거나 이어지는 shift를 하나의 근무 구간으로 병합
+        reach = np.maximum.accumulate(end)
+        first = np.concatenate([[True], begin[1:] > reach[:-1]]) if len(begin) > 0 else np.zeros(0, dtype=bool)
+        begin = begin[first]
+        end = np.maximum.reduceat(end, np.flatnonzero(first)) if len(end) > 0 else end
+        keep = end > begin
+        self.begin, self.end = begin[keep], end[keep]  # 근무 구간 [begin, end) (origin 기준 시간 단위: hour)
+        self.cumulative = np.concatenate([[0.0], np.cumsum(self.end - self.begin)])  # 각 구간 이전까지의 근무 시간
+
+        # delay에서 쓰는 list (scalar에는 bisect가 np.searchsorted보다 빠름)
+        self._begin, self._end = self.begin.tolist(), self.end.tolist()
+        self._cumulative = self.cumulative.tolist()
+        self._cumulative_end = self.cumulative[1:].tolist()
+
+    @property
+    def total_hours(self):
+        return float(self.cumulative[-1])
+
+    def working_time(self, time):
+        """Working hours elapsed from the origin to simulation ``time`` (scalar or array)."""
+        hours = np.asarray(time, dtype=float) * self.time_unit
+        i = np.searchsorted(self.begin, hours, side='right') - 1
+        j = np.maximum(i, 0)
+        elapsed = self.cumulative[j] + np.clip(hours - self.begin[j], 0.0, self.end[j] - self.begin[j])
+        return np.where(i >= 0, elapsed, 0.0)
+
+    def calendar_time(self, working):
+        """Earliest simulation time at which ``working`` working hours have elapsed (scalar or array)."""
+        working = np.asarray(working, dtype=float)
+        if np.any(working > self.total_hours):
+            raise ValueError("working time beyond the calendar end ({0} h)".format(self.total_hours))
+        i = np.minimum(np.searchsorted(self.cumulative[1:], working, side='left'), len(self.begin) - 1)
+        hours = np.where(working > 0, self.begin[i] + (working - self.cumulative[i]), 0.0)
+        return hours / self.time_unit
+
+    def delay(self, now, hours):
+        # 시각 now에 시작한 hours(근무 시간)짜리 작업의 timeout - 두 번의 binary search
+        if hours <= 0:
+            return 0.0
+        t = now * self.time_unit
+        i = bisect.bisect_right(self._begin, t) - 1
+        elapsed = self._cumulative[i] + min(max(t - self._begin[i], 0.0), self._end[i] - self._begin[i]) if i >= 0 else 0.0
+        target = elapsed + hours
+        j = bisect.bisect_left(self._cumulative_end, target)
+        if j == len(self._begin):
+            raise ValueError("working time beyond the calendar end ({0} h)".format(self.total_hours))
+        return (self._begin[j] + (target - self._cumulative[j])) / self.time_unit - now
+
+    def to_date(self, time):
+        # simulation 시각 -> 달력 날짜 (event log 저장 시 한 번에 변환)
+        return self.origin + pd.to_timedelta(np.asarray(time, dtype=float) * self.time_unit, unit='h')
+#endregion
@@ -0,0 +1,108 @@
+from enum import IntEnum
+
+import numpy as np
+import pandas as pd
+
+
+#region EventType
+class EventType(IntEnum):
+    # Part 생성 및 완료
+    PART_CREATED = 0
+    PART_COMPLETED = 1
+    # Routing
+    ROUTING_START = 2
+    ROUTING_FINISH = 3
+    # Process 입고, 작업, 출고
+    PROCESS_ENTERED = 4
+    WORK_START = 5
+    WORK_FINISH = 6
+    PART_TRANSFERRED = 7
+    PART_TRANSFERRED_TO_SINK = 8
+    # Transporter 이동 (빈 차량으로 상차 위치까지 / 적재 후 다음 process까지)
+    EMPTY_TRAVEL_START = 9
+    EMPTY_TRAVEL_FINISH = 10
+    LOADED_TRAVEL_START = 11
+    LOADED_TRAVEL_FINISH = 12
+    # Source에서 첫 process로 투입, 다음 process의 buffer가 가득 차 대기 (legacy model)
+    PART_RELEASED = 13
+    PART_BLOCKED = 14
+    # Machine 고장 및 수리 완료
+    MACHINE_BROKEN = 15
+    MACHINE_REPAIRED = 16
+#endregion
+
+
+#region Legacy conversion
+# event strings written by PostProcessing-era models and by earlier versions of SimComponents
+LEGACY_EVENTS = {
+    "part_created": EventType.PART_CREATED,
+    "Part Created": EventType.PART_CREATED,
+    "completed": EventType.PART_COMPLETED,
+    "Part Completed": EventType.PART_COMPLETED,
+    "Routing Start": EventType.ROUTING_START,
+    "Routing Finish": EventType.ROUTING_FINISH,
+    "Process_entered": EventType.PROCESS_ENTERED,
+    "Process In": EventType.PROCESS_ENTERED,
+    # SimComponents recorded "Part transferred" under the receiving process
+    "Part transferred": EventType.PROCESS_ENTERED,
+    "work_start": EventType.WORK_START,
+    "Work Start": EventType.WORK_START,
+    "work_finish": EventType.WORK_FINISH,
+    "Work Finish": EventType.WORK_FINISH,
+    "part_transferred_to_next_process": EventType.PART_TRANSFERRED,
+    "part_transferred_to_next_process_with_tp": EventType.PART_TRANSFERRED,
+    "Process to Process": EventType.PART_TRANSFERRED,
+    "part_transferred_to_Sink": EventType.PART_TRANSFERRED_TO_SINK,
+    "Process to Sink": EventType.PART_TRANSFERRED_TO_SINK,
+    "Source to Process": EventType.PART_RELEASED,
+    "Delay for Next Process": EventType.PART_BLOCKED,
+    "Machine Broken": EventType.MACHINE_BROKEN,
+    "machine_rerunning": EventType.MACHINE_REPAIRED,
+}
+
+# 이전 이름으로 조회하는 column (ex. cal_utilization(log, name, type="SubProcess"))
+COLUMN_ALIASES = {"SubProcess": "Machine"}
+
+EVENT_DTYPE = np.int8
+
+
+def to_event_codes(log):
+    """Return ``log`` with an integer ``Event`` column.
+
+    Logs that are already integer coded are returned unchanged. Legacy string logs are
+    converted: "<operation> Start"/"<operation> Finish" events of SimComponents become
+    WORK_START/WORK_FINISH with the operation name moved to the ``Operation`` column,
+    and the ``SubProcess`` column of older logs is renamed to ``Machine`` (EventLog still
+    accepts "SubProcess" through COLUMN_ALIASES).
+    """
+    if pd.api.types.is_integer_dtype(log["Event"]):
+        return log
+
+    log = log.rename(columns={"SubProcess": "Machine"})
+    event = log["Event"].astype(str)
+    codes = event.map(LEGACY_EVENTS)
+
+    # "<operation> Start" / "<operation> Finish"
+    unknown = codes.isna()
+    start = unknown & event.str.endswith(" Start")
+    finish = unknown & event.str.endswith(" Finish")
+    codes[start] = EventType.WORK_START
+    codes[finish] = EventType.WORK_FINISH
+    if start.any() or finish.any():
+        operation = log["Operation"].copy() if "Operation" in log.columns else pd.Series(None, index=log.index, dtype=object)
+        operation[start] = event[start].str[:-len(" Start")]
+        operation[finish] = event[finish].str[:-len(" Finish")]
+        log["Operation"] = operation
+
+    if codes.isna().any():
+        raise ValueError("Unknown events in log: {0}".format(sorted(event[codes.isna()].unique())))
+
+    log["Event"] = codes.astype(EVENT_DTYPE)
+    return log
+
+
+def read_event_log(filepath):
+    # Monitor.save_event_tracer가 저장한 csv 파일 읽기 (legacy log는 정수 코드로 변환)
+    log = pd.read_csv(filepath, index_col=0)
+    return to_event_codes(log)
+#endregion
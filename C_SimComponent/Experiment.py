@@ -0,0 +1,268 @@
+import os
+import random
+import numpy as np
+import pandas as pd
+import scipy.stats as st
+from functools import partial
+from itertools import repeat, product
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    from .OutputAnalysis import summarize, relative_half_width
+except ImportError:
+    from OutputAnalysis import summarize, relative_half_width
+
+
+#region Replication
+def _replicate(model_builder, seed_seq):
+    # 전역 난수(np.random, random)를 사용하는 모델도 replication별로 재현 가능하도록 seed 설정
+    state = seed_seq.generate_state(2)
+    np.random.seed(state[0])
+    random.seed(int(state[1]))
+    return model_builder(seed_seq)
+
+
+def run_replications(model_builder, num_replications, seed=None, confidence=0.95, n_jobs=None):
+    """Run independent replications of a model and summarize its KPIs.
+
+    ``model_builder(seed_seq)`` builds and runs one replication and returns a dict of KPIs;
+    ``seed_seq`` is that replication's ``numpy.random.SeedSequence``, spawned from ``seed``.
+    Replications run in a process pool (in-process when ``n_jobs`` is 1), so only the KPI
+    dicts travel between processes. Returns the per-replication KPIs and a summary with
+    confidence intervals. When the builder draws from ``SimComponents.RandomStreams(seed_seq)``,
+    running several scenarios with the same ``seed`` uses common random numbers.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(num_replications)
+    if n_jobs == 1:
+        kpis = _run_batch(None, model_builder, seeds)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            kpis = _run_batch(executor, model_builder, seeds)
+
+    kpis = pd.DataFrame(kpis)
+    return kpis, summarize(kpis, confidence)
+
+
+def _run_batch(executor, model_builder, seeds):
+    if executor is None:
+        return [_replicate(model_builder, seed_seq) for seed_seq in seeds]
+    return list(executor.map(_replicate, repeat(model_builder), seeds))
+
+
+def run_until_precision(model_builder, kpis=None, relative_precision=0.05, confidence=0.95, initial=10,
+                        max_replications=1000, seed=None, n_jobs=None):
+    """Add replications until every KPI in ``kpis`` reaches the requested relative precision.
+
+    After the ``initial`` replications, the number still needed is estimated from the
+    current relative half-widths (n * (h / target) ** 2) and launched as the next batch, so
+    easy KPIs stop after the first batch. Returns the per-replication KPIs and the summary.
+    """
+    seed_root = np.random.SeedSequence(seed)
+    results = []
+    num_next = initial
+    executor = ProcessPoolExecutor(max_workers=n_jobs) if n_jobs != 1 else None
+    try:
+        while True:
+            results += _run_batch(executor, model_builder, seed_root.spawn(num_next))
+            data = pd.DataFrame(results)
+            summary = summarize(data[kpis] if kpis is not None else data, confidence)
+            precision = np.array([relative_half_width(mean, half_width)
+                                  for mean, half_width in zip(summary["mean"], summary["half_width"])])
+            if np.all(precision <= relative_precision) or len(results) >= max_replications:
+                break
+            num_needed = int(np.ceil(len(results) * np.max(np.minimum(precision, 1e3) / relative_precision) ** 2))
+            num_next = min(max(num_needed - len(results), 1), max_replications - len(results))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return data, summarize(data, confidence)
+
+
+def run_with_batch_means(env, estimators, relative_precision=0.05, confidence=0.95, check_interval=1000.0,
+                         max_time=float('inf')):
+    """Extend a single long run until every batch-means estimator is precise enough.
+
+    ``estimators`` maps KPI names to ``OutputAnalysis.BatchMeans`` or ``MSEREstimator``
+    objects fed by the model. The run advances by ``check_interval`` and stops as soon as
+    all relative half-widths are below ``relative_precision`` (or at ``max_time``). Returns
+    the summary of the estimators, including the number of warm-up observations removed.
+    """
+    while True:
+        env.run(until=min(env.now + check_interval, max_time))
+        summary = dict()
+        for name, estimator in estimators.items():
+            mean, half_width = estimator.confidence_interval(confidence)
+            summary[name] = {"mean": mean, "half_width": half_width,
+                             "relative_half_width": relative_half_width(mean, half_width),
+                             "batch_size": estimator.batch_size, "warmup": getattr(estimator, "warmup", 0),
+                             "n": estimator.n}
+        summary = pd.DataFrame.from_dict(summary, orient="index")
+        if np.all(summary["relative_half_width"] <= relative_precision) or env.now >= max_time:
+            return summary
+#endregion
+
+
+#region Parameter sweep
+def expand_grid(grid):
+    # {"capacity": [1, 2], "IAT": [5, 7]} -> [{"capacity": 1, "IAT": 5}, {"capacity": 1, "IAT": 7}, ...]
+    names = list(grid.keys())
+    return [dict(zip(names, values)) for values in product(*grid.values())]
+
+
+def _to_python(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _point_key(point, names):
+    return tuple(_to_python(point[name]) for name in names)
+
+
+def _run_point(run, point):
+    result = run(**point)
+    return dict(point, **result)
+
+
+def run_sweep(run, grid, filepath=None, n_jobs=None, on_result=None):
+    """Evaluate ``run(**point)`` for every point of a parameter grid.
+
+    ``run`` returns a dict of results for one parameter combination. Points are submitted
+    to the process pool one by one, so a worker that finishes early takes the next pending
+    point instead of waiting on a fixed chunk. Each finished row is appended to the csv
+    ``filepath`` (and passed to ``on_result``) as soon as it arrives; when ``filepath``
+    already holds rows from an interrupted sweep, those points are not run again.
+    Returns all rows in grid order.
+    """
+    points = expand_grid(grid)
+    names = list(grid.keys())
+
+    rows = []
+    columns = None
+    if filepath is not None and os.path.dirname(filepath) and not os.path.exists(os.path.dirname(filepath)):
+        os.makedirs(os.path.dirname(filepath))
+    if filepath is not None and os.path.exists(filepath) and os.path.getsize(filepath) > 0:
+        previous = pd.read_csv(filepath)
+        columns = list(previous.columns)
+        rows = previous.to_dict('records')
+    done = set(_point_key(row, names) for row in rows)
+    pending = [point for point in points if _point_key(point, names) not in done]
+
+    def record(row):
+        nonlocal columns
+        rows.append(row)
+        if filepath is not None:
+            header = columns is None
+            if header:
+                columns = list(row.keys())
+            pd.DataFrame([row])[columns].to_csv(filepath, mode='a', header=header, index=False)
+        if on_result is not None:
+            on_result(row)
+
+    if n_jobs == 1:
+        for point in pending:
+            record(_run_point(run, point))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [executor.submit(_run_point, run, point) for point in pending]
+            for future in as_completed(futures):
+                record(future.result())
+
+    order = {_point_key(point, names): i for i, point in enumerate(points)}
+    rows = sorted(rows, key=lambda row: order.get(_point_key(row, names), len(points)))
+    return pd.DataFrame(rows)
+#endregion
+
+
+#region Ranking and selection
+def _apcs(means, stds, n, best):
+    # 근사 정선택확률(Bonferroni 하한): 1 - sum_i P(i가 best보다 좋음), 최소화 기준
+    others = np.arange(len(means)) != best
+    scale = np.sqrt(stds[best] ** 2 / n[best] + stds[others] ** 2 / n[others])
+    z = (means[others] - means[best]) / np.maximum(scale, 1e-12)
+    return 1 - np.sum(st.norm.cdf(-z))
+
+
+def ocba_allocation(means, stds, n, budget):
+    """Split ``budget`` extra replications by the OCBA rule (minimization).
+
+    ``n`` holds the replications done so far; the returned array holds the additional
+    replications per alternative and sums to ``budget``. When no alternative shows any
+    variation, more replications cannot change the ranking and nothing is allocated.
+    """
+    if np.all(np.asarray(stds, dtype=float) == 0):
+        return np.zeros(len(means), dtype=int)
+    means, stds, n = np.asarray(means, dtype=float), np.maximum(np.asarray(stds, dtype=float), 1e-12), np.asarray(n)
+    best = int(np.argmin(means))
+    delta = np.maximum(np.abs(means - means[best]), 1e-12)
+
+    # N_i / N_j = (s_i / d_i)^2 / (s_j / d_j)^2,  N_b = s_b * sqrt(sum_i (N_i / s_i)^2)
+    ratio = (stds / delta) ** 2
+    ratio[best] = 0.0
+    ratio[best] = stds[best] * np.sqrt(np.sum((ratio / stds) ** 2))
+    target = (n.sum() + budget) * ratio / ratio.sum()
+
+    additional = np.maximum(target - n, 0.0)
+    if additional.sum() == 0:
+        additional[best] = 1.0
+    additional = np.floor(additional * budget / additional.sum()).astype(int)
+    # 반올림으로 남은 replication은 목표 대비 가장 부족한 대안부터 배정
+    for i in np.argsort(-(target - n - additional))[:budget - additional.sum()]:
+        additional[i] += 1
+    return additional
+
+
+def select_best(model_builder, alternatives, kpi, minimize=True, initial=10, increment=None, max_replications=1000,
+                target_pcs=0.95, seed=None, n_jobs=None):
+    """Ranking and selection of the best alternative by OCBA.
+
+    ``alternatives`` maps names to keyword arguments of ``model_builder(seed_seq, **kwargs)``,
+    which returns a KPI dict as in ``run_replications``. After ``initial`` replications
+    each, every round allocates ``increment`` replications (default: one per alternative)
+    to the alternatives that are still competitive, and runs all of them concurrently in
+    the pool. Replication j of every alternative uses the same seed (common random
+    numbers). Stops when the approximate probability of correct selection reaches
+    ``target_pcs``, after ``max_replications`` in total, or as soon as every alternative
+    has a standard deviation of 0 (a deterministic model: the ranking cannot change).
+    Returns the best name, a summary per alternative and the approximate PCS.
+    """
+    names = list(alternatives.keys())
+    builders = [partial(model_builder, **alternatives[name]) for name in names]
+    increment = increment if increment is not None else len(names)
+    sign = 1.0 if minimize else -1.0
+
+    seed_root = np.random.SeedSequence(seed)
+    seeds = list()
+    results = [list() for _ in names]
+    additional = np.full(len(names), initial)
+    executor = ProcessPoolExecutor(max_workers=n_jobs) if n_jobs != 1 else None
+    try:
+        while True:
+            n = np.array([len(values) for values in results])
+            if (n + additional).max() > len(seeds):
+                seeds += seed_root.spawn(int((n + additional).max()) - len(seeds))
+            tasks = [(i, seeds[j]) for i in range(len(names)) for j in range(n[i], n[i] + additional[i])]
+            if executor is None:
+                values = [_replicate(builders[i], seed_seq)[kpi] for i, seed_seq in tasks]
+            else:
+                futures = [executor.submit(_replicate, builders[i], seed_seq) for i, seed_seq in tasks]
+                values = [future.result()[kpi] for future in futures]
+            for (i, _), value in zip(tasks, values):
+                results[i].append(value)
+
+            n = np.array([len(values) for values in results])
+            means = sign * np.array([np.mean(values) for values in results])
+            stds = np.array([np.std(values, ddof=1) for values in results])
+            best = int(np.argmin(means))
+            pcs = _apcs(means, stds, n, best)
+            if pcs >= target_pcs or n.sum() >= max_replications or np.all(stds == 0):
+                break
+            additional = ocba_allocation(means, stds, n, min(increment, max_replications - n.sum()))
+            if additional.sum() == 0:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    summary = pd.DataFrame({"mean": sign * means, "std": stds, "n": n}, index=names)
+    return names[best], summary, pcs
+#endregion
@@ -1,36 +1,100 @@
 from SimComponents import *
+from Experiment import select_best
+from Sensitivity import sobol_indices
+from PostProcessing import EventLog, cal_leadtime
 import simpy
+import pandas as pd
 
-filepath = '../result/event_log_test.csv'
-env = simpy.Environment()
-monitor = Monitor(filepath)
-
-operation = dict()
-operation['Ops1-1'] = Operation('Ops1-1', {'M1':4, 'M2':5}, ['M1','M2'])
-operation['Ops1-2'] = Operation('Ops1-2', {'M3':6, 'M4':5, 'M5':4}, ['M3','M4','M5'])
-operation['Ops1-3'] = Operation('Ops1-3', {'M3':4, 'M4':3, 'M5':5}, ['M3','M4','M5'])
-operation['Ops2-1'] = Operation('Ops2-1', {'M1':4, 'M2':5}, ['M1','M2'])
-operation['Ops2-2'] = Operation('Ops2-2', {'M3':4, 'M4':5, 'M5':6}, ['M3','M4','M5'])
-operation['Ops3-1'] = Operation('Ops3-1', {'M3':6, 'M4':5, 'M5':3}, ['M3','M4','M5'])
-operation['Ops3-2'] = Operation('Ops3-2', {'M1':5, 'M2':3}, ['M1','M2'])
-
-model = dict()
-model['M1'] = Process(env, 'M1', model, monitor, capacity=2, in_buffer=2, out_buffer=2)
-model['M2'] = Process(env, 'M2', model, monitor, capacity=2, in_buffer=2, out_buffer=2)
-model['M3'] = Process(env, 'M3', model, monitor, capacity=2, in_buffer=2, out_buffer=2)
-model['M4'] = Process(env, 'M4', model, monitor, capacity=2, in_buffer=2, out_buffer=2)
-model['M5'] = Process(env, 'M5', model, monitor, capacity=2, in_buffer=2, out_buffer=2)
-model['Routing'] = Routing(env, 'Routing', model, monitor, mode='LPT')
-model['Sink'] = Sink(env, monitor)
-
-jobtype1 = [operation['Ops1-1'], operation['Ops1-2'], operation['Ops1-3']]
-jobtype2 = [operation['Ops2-1'], operation['Ops2-2']]
-jobtype3 = [operation['Ops3-1'], operation['Ops3-2']]
-
-source1 = Source(env, 'Source_jobtype1', model, monitor, jobtype=jobtype1, IAT=15)
-source2 = Source(env, 'Source_jobtype2', model, monitor, jobtype=jobtype2, IAT=10)
-source3 = Source(env, 'Source_jobtype3', model, monitor, jobtype=jobtype3, IAT=10)
-
-env.run(until=1000)
-
-monitor.save_event_tracer()
\ No newline at end of file
+
+# stochastic model의 작업 시간 분포: 평균이 mean인 ±50% 범위 삼각분포 (각 Process의 난수 stream으로 생성)
+def _time(mean):
+    return 'triangular({0}, {1}, {2})'.format(0.5 * mean, mean, 1.5 * mean)
+
+
+def build_model(mode='LPT', filepath='../result/event_log_test.csv', until=1000, streams=None, IAT=(15, 10, 10),
+                capacity=2, calendar=None, wf_info=None, tp_info=None, network=None, time_scale=1.0, stochastic=False):
+    env = simpy.Environment()
+    monitor = Monitor(filepath, calendar=calendar)
+    # component별 독립 난수 stream (streams가 없으면 전역 np.random 사용)
+    stream = streams.stream if streams is not None else (lambda name: None)
+    # 작업자 pool (wf_info가 없으면 작업자 없이 machine만으로 작업)
+    workforce = Workforce(env, wf_info) if wf_info is not None else None
+    # transporter (tp_info와 distance matrix가 없으면 process 간 이동은 즉시 이루어짐)
+    transporter = TransporterFleet(env, monitor, tp_info, network) if tp_info is not None else None
+
+    # 작업 시간 (평균 작업 시간에 time_scale을 곱함) - stochastic이면 평균이 같은 분포에서 생성
+    op_time = lambda mean: _time(time_scale * mean) if stochastic else time_scale * mean
+
+    operation = dict()
+    operation['Ops1-1'] = Operation('Ops1-1', {'M1': op_time(4), 'M2': op_time(5)}, ['M1','M2'])
+    operation['Ops1-2'] = Operation('Ops1-2', {'M3': op_time(6), 'M4': op_time(5), 'M5': op_time(4)}, ['M3','M4','M5'])
+    operation['Ops1-3'] = Operation('Ops1-3', {'M3': op_time(4), 'M4': op_time(3), 'M5': op_time(5)}, ['M3','M4','M5'])
+    operation['Ops2-1'] = Operation('Ops2-1', {'M1': op_time(4), 'M2': op_time(5)}, ['M1','M2'])
+    operation['Ops2-2'] = Operation('Ops2-2', {'M3': op_time(4), 'M4': op_time(5), 'M5': op_time(6)}, ['M3','M4','M5'])
+    operation['Ops3-1'] = Operation('Ops3-1', {'M3': op_time(6), 'M4': op_time(5), 'M5': op_time(3)}, ['M3','M4','M5'])
+    operation['Ops3-2'] = Operation('Ops3-2', {'M1': op_time(5), 'M2': op_time(3)}, ['M1','M2'])
+
+    model = dict()
+    for name in ['M1', 'M2', 'M3', 'M4', 'M5']:
+        model[name] = Process(env, name, model, monitor, capacity=capacity, in_buffer=2, out_buffer=2, rng=stream(name),
+                              calendar=calendar, workforce=workforce)
+    model['Routing'] = Routing(env, 'Routing', model, monitor, mode=mode, rng=stream('Routing'), transporter=transporter)
+    model['Sink'] = Sink(env, monitor)
+    if workforce is not None:
+        model['Workforce'] = workforce
+    if transporter is not None:
+        model['Transporter'] = transporter
+
+    jobtype1 = [operation['Ops1-1'], operation['Ops1-2'], operation['Ops1-3']]
+    jobtype2 = [operation['Ops2-1'], operation['Ops2-2']]
+    jobtype3 = [operation['Ops3-1'], operation['Ops3-2']]
+
+    # stochastic이면 평균 도착 간격이 IAT인 지수분포 (각 Source의 난수 stream으로 생성), 아니면 일정한 간격
+    if stochastic:
+        IAT = ['exponential({0})'.format(mean) for mean in IAT]
+
+    source1 = Source(env, 'Source_jobtype1', model, monitor, jobtype=jobtype1, IAT=IAT[0], rng=stream('Source_jobtype1'))
+    source2 = Source(env, 'Source_jobtype2', model, monitor, jobtype=jobtype2, IAT=IAT[1], rng=stream('Source_jobtype2'))
+    source3 = Source(env, 'Source_jobtype3', model, monitor, jobtype=jobtype3, IAT=IAT[2], rng=stream('Source_jobtype3'))
+
+    env.run(until=until)
+
+    return model, monitor
+
+
+# replication 당 KPI: 완료된 part 수 (작업 시간과 도착 간격이 확률적인 model, seed별 난수 stream)
+def replication(seed_seq, mode='LPT'):
+    model, monitor = build_model(mode=mode, streams=RandomStreams(seed_seq), stochastic=True)
+    return {"Makepart": model['Sink'].parts_rec}
+
+
+# 완료된 part의 평균 lead time (event log를 파일로 저장하지 않고 계산)
+def _leadtime(monitor, finish_time):
+    log = EventLog(pd.DataFrame({"Time": monitor.time, "Event": monitor.event, "Part": monitor.part,
+                                 "Process": monitor.process_name, "Machine": monitor.machine_name}))
+    return cal_leadtime(log, mode="m", start_time=0.0, finish_time=finish_time)
+
+
+# sensitivity analysis 용 run: 같은 seed(CRN)로 parameter의 영향만 비교
+# capacity는 정수 parameter - 구간 [1, 5)에서 내림하여 1~4를 같은 폭으로 sampling
+def sensitivity_run(IAT1, IAT2, IAT3, capacity, time_scale, until=1000):
+    model, monitor = build_model(streams=RandomStreams(42), IAT=(IAT1, IAT2, IAT3), capacity=int(np.floor(capacity)),
+                                 time_scale=time_scale, until=until, stochastic=True)
+    return {"Makepart": model['Sink'].parts_rec, "Leadtime": _leadtime(monitor, until)}
+
+
+if __name__ == "__main__":
+    model, monitor = build_model()
+    monitor.save_event_tracer()
+
+    # Routing mode 비교 (OCBA, stochastic model - seed 고정으로 재현 가능)
+    best, summary, pcs = select_best(replication, {mode: {"mode": mode} for mode in ['least_util', 'SPT', 'LPT']},
+                                     kpi="Makepart", minimize=False, max_replications=300, seed=42)
+    print(summary)
+    print("best routing mode: {0} (PCS >= {1:.3f})".format(best, pcs))
+
+    # IAT, capacity, 작업 시간이 완료 part 수와 lead time에 미치는 영향 (Sobol indices)
+    bounds = {"IAT1": (10, 20), "IAT2": (5, 15), "IAT3": (5, 15), "capacity": (1, 5), "time_scale": (0.8, 1.2)}
+    for kpi in ["Makepart", "Leadtime"]:
+        print(kpi)
+        print(sobol_indices(sensitivity_run, bounds, kpi=kpi, n=128, seed=42))
@@ -0,0 +1,172 @@
+import heapq
+import numpy as np
+import pandas as pd
+
+try:
+    from .EventSchema import EventType, EVENT_DTYPE
+except ImportError:
+    from EventSchema import EventType, EVENT_DTYPE
+
+
+#region Recursion
+def _lindley(arrival, process_time):
+    # 단일 server FIFO: finish_j = max(arrival_j, finish_{j-1}) + p_j
+    #                            = S_j + max_{i<=j}(arrival_i - S_{i-1}),  S = cumsum(p)
+    cumulative = np.cumsum(process_time)
+    finish = cumulative + np.maximum.accumulate(arrival - (cumulative - process_time))
+    return finish - process_time, finish
+
+
+def _earliest_server(arrival, process_time, num):
+    # 다중 server FIFO: 도착 순서대로 가장 먼저 비는 server에 할당
+    free = [(0.0, m) for m in range(num)]
+    start = np.empty(len(arrival))
+    machine = np.empty(len(arrival), dtype=int)
+    for j in range(len(arrival)):
+        available, m = heapq.heappop(free)
+        start[j] = max(arrival[j], available)
+        machine[j] = m
+        heapq.heappush(free, (start[j] + process_time[j], m))
+    return start, start + process_time, machine
+
+
+def flow_line(release, process_time, server_num, routing_logic='cyclic'):
+    """Start and finish times of every part at every stage of a serial FIFO line.
+
+    ``release`` (n,) is the release time of each part in release order, ``process_time``
+    (n, k) its processing time at each of the k stages and ``server_num`` (k,) the number of
+    servers per stage; buffers are unlimited. With ``routing_logic='cyclic'`` (the Process
+    default) the parts entering a stage are assigned to its servers in turn and each server
+    is a single FIFO queue, so every stage is solved by the vectorized Lindley recursion.
+    With ``'fifo'`` a part takes the server that becomes free first (a heap per stage).
+    Returns the (n, k) arrays start, finish and machine index.
+    """
+    release = np.maximum.accumulate(np.asarray(release, dtype=float))  # Source는 순서대로 part를 투입
+    process_time = np.asarray(process_time, dtype=float)
+    n, k = process_time.shape
+
+    start = np.empty((n, k))
+    finish = np.empty((n, k))
+    machine = np.empty((n, k), dtype=int)
+    arrival, rank, trigger = release, np.arange(n), np.zeros(n)
+    for stage in range(k):
+        # 도착 순서: 동시에 끝난 part는 먼저 시작한 part, 작업 시작을 유발한 event가 먼저인 part,
+        # 이전 공정의 순서 순 (SimPy가 같은 시각의 event를 처리하는 순서)
+        order = np.lexsort((rank, trigger, start[:, stage - 1], arrival)) if stage > 0 else np.arange(n)
+        a, p = arrival[order], process_time[order, stage]
+        if routing_logic == 'cyclic':
+            m = np.arange(n) % server_num[stage]
+            s, f = np.empty(n), np.empty(n)
+            for server in range(min(server_num[stage], n)):
+                s[m == server], f[m == server] = _lindley(a[m == server], p[m == server])
+        else:
+            s, f, m = _earliest_server(a, p, server_num[stage])
+        start[order, stage], finish[order, stage], machine[order, stage] = s, f, m
+
+        # 같은 server의 이전 작업이 끝나는 순간 시작한 part는 그 작업의 시작 시각을, 아니면 도착 시각을 기록
+        previous = np.full(n, -1)
+        for server in range(server_num[stage]):
+            jobs = np.flatnonzero(m == server)
+            previous[jobs[1:]] = jobs[:-1]
+        busy = (previous >= 0) & (f[np.maximum(previous, 0)] == s)
+        trigger = np.empty(n)
+        trigger[order] = np.where(busy, s[np.maximum(previous, 0)], a)
+        arrival, rank = finish[:, stage], np.argsort(order, kind='stable')
+
+    return start, finish, machine
+
+
+def simultaneous_arrivals(finish):
+    """True when two parts reach the same stage after the first at the same time.
+
+    ``finish`` is the (n, k) array of ``flow_line``. SimPy hands simultaneous arrivals to
+    the next stage in the order of its internal event ids, which depends on everything
+    else happening at that instant, so the cyclic server assignment of ``flow_line`` can
+    differ from the Process model. Without such ties the schedule is identical; releases
+    at the same time are not a problem since the Source sends them in list order.
+    """
+    arrival = np.sort(np.asarray(finish)[:, :-1], axis=0)
+    return bool(np.any(arrival[1:] == arrival[:-1]))
+#endregion
+
+
+#region Routing table
+def is_flow_line(data, process_list):
+    """True when every part of the routing table visits ``process_list`` in order, then the Sink."""
+    k = len(process_list)
+    try:
+        route = data[[(i, 'process') for i in range(k + 1)]].values
+        times = data[[(i, 'process_time') for i in range(k)]].astype(float).values
+        data[(0, 'start_time')].astype(float)
+    except (KeyError, ValueError, TypeError):
+        return False
+    return bool(np.all(route == np.array(list(process_list) + ['Sink'], dtype=object))
+                and np.all(np.isfinite(times)) and np.all(times >= 0))
+
+
+def simulate_flow_line(data, process_list, server_num, routing_logic='cyclic', filepath=None, allow_ties=False):
+    """Flow-line fast path for a routing table that satisfies ``is_flow_line``.
+
+    Produces the event tracer of the SimPy model (integer event codes, the same events as
+    the Source/Process/Sink model including PART_RELEASED) and the time the last part
+    reaches the Sink; the tracer is saved to ``filepath`` if given. Like Process, only the
+    start time of the first stage releases a part and a job of zero duration records no
+    work start / finish. If parts arrive at a stage at the same time (``simultaneous_arrivals``)
+    the result may differ from the SimPy model, so unless ``allow_ties`` is set
+    ``(None, None)`` is returned and the caller should run the simulation instead.
+    """
+    k = len(process_list)
+    release = np.maximum.accumulate(data[(0, 'start_time')].astype(float).values)
+    process_time = data[[(i, 'process_time') for i in range(k)]].astype(float).values
+    start, finish, machine = flow_line(release, process_time, server_num, routing_logic=routing_logic)
+    if not allow_ties and simultaneous_arrivals(finish):
+        return None, None
+
+    n = len(data)
+    part = np.asarray(data.index)
+    everyone = np.ones(n, dtype=bool)
+    # event별 (시각, event, process, machine, 기록 여부) - SimPy 모델에서 한 part가 기록하는 순서대로
+    time, event, process = [release, release], [EventType.PART_CREATED, EventType.PART_RELEASED], ['Source', 'Source']
+    machine_name, recorded = [None, None], [everyone, everyone]
+    for stage, name in enumerate(process_list):
+        arrival = release if stage == 0 else finish[:, stage - 1]
+        machines = np.array(['{0}_{1}'.format(name, m) for m in range(server_num[stage])], dtype=object)
+        working = process_time[:, stage] > 0  # 작업 시간이 0이면 Work Start / Finish 없이 바로 다음 공정으로
+        time += [arrival, start[:, stage], finish[:, stage]]
+        event += [EventType.PROCESS_ENTERED, EventType.WORK_START, EventType.WORK_FINISH]
+        process += [name] * 3
+        machine_name += [None, machines[machine[:, stage]], machines[machine[:, stage]]]
+        recorded += [everyone, working, working]
+        if stage < k - 1:
+            time.append(finish[:, stage])
+            event.append(EventType.PART_TRANSFERRED)
+            process.append(name)
+            machine_name.append(None)
+            recorded.append(everyone)
+    # Sink.put이 완료를 기록한 다음 마지막 공정이 이동을 기록
+    time += [finish[:, -1], finish[:, -1]]
+    event += [EventType.PART_COMPLETED, EventType.PART_TRANSFERRED_TO_SINK]
+    process += ['Sink', process_list[-1]]
+    machine_name += [None, None]
+    recorded += [everyone, everyone]
+
+    keep = np.concatenate(recorded)
+    times = np.concatenate(time)[keep]
+    phases = np.repeat(np.arange(len(event)), n)[keep]
+    # 시간 순, 같은 시각에는 작업 종료 쪽 event(종료, 이동, 완료)를 먼저, 그 다음 part의 event 순서대로
+    finishing = np.repeat(np.isin(event, [EventType.WORK_FINISH, EventType.PART_TRANSFERRED,
+                                          EventType.PART_TRANSFERRED_TO_SINK, EventType.PART_COMPLETED]), n)[keep]
+    order = np.lexsort((phases, ~finishing, times))
+    event_tracer = pd.DataFrame({
+        'Time': times[order],
+        'Event': np.repeat(np.array(event, dtype=EVENT_DTYPE), n)[keep][order],
+        'Part': np.tile(part, len(event))[keep][order],
+        'Process': np.repeat(np.array(process, dtype=object), n)[keep][order],
+        'Machine': np.concatenate([np.full(n, None, dtype=object) if m is None else m
+                                   for m in machine_name])[keep][order]})
+
+    if filepath is not None:
+        event_tracer.to_csv(filepath)
+
+    return event_tracer, float(finish[:, -1].max()) if n > 0 else 0.0
+#endregion
@@ -0,0 +1,57 @@
+import os
+import pickle
+import hashlib
+import pandas as pd
+
+try:
+    import pyarrow  # parquet 사용 가능 여부
+    PARQUET = True
+except ImportError:
+    PARQUET = False
+
+
+def _digest(*values):
+    return hashlib.sha1(pickle.dumps(values, protocol=4)).hexdigest()[:16]
+
+
+def read_excel_cached(filepath, columns=None, cache_dir='../result/cache/input', **kwargs):
+    """``pd.read_excel`` served from a typed columnar cache.
+
+    The first load parses the workbook and stores the selected ``columns`` as parquet
+    (pickle when pyarrow is not installed or a column cannot be stored as parquet). Later
+    loads read the cache as long as the path, size and modification time of the workbook,
+    the columns and the ``read_excel`` arguments are unchanged; a stale entry of the same
+    selection is replaced.
+    """
+    stat = os.stat(filepath)
+    selection = _digest(os.path.abspath(filepath), columns, sorted(kwargs.items()))
+    version = _digest(stat.st_size, stat.st_mtime_ns)
+    name = '{0}-{1}'.format(os.path.splitext(os.path.basename(filepath))[0], selection)
+    path = os.path.join(cache_dir, '{0}-{1}'.format(name, version))
+
+    if os.path.exists(path + '.parquet'):
+        return pd.read_parquet(path + '.parquet')
+    if os.path.exists(path + '.pkl'):
+        return pd.read_pickle(path + '.pkl')
+
+    data = pd.read_excel(filepath, usecols=columns, **kwargs)
+    if columns is not None:
+        data = data[columns]
+
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+    for stale in os.listdir(cache_dir):
+        if stale.startswith(name + '-'):
+            os.remove(os.path.join(cache_dir, stale))
+    extension = '.pkl'
+    if PARQUET:
+        try:
+            data.to_parquet(path + '.tmp', index=True)
+            extension = '.parquet'
+        except (ValueError, TypeError, NotImplementedError):
+            pass  # parquet로 표현할 수 없는 column(혼합 type 등)은 pickle로 저장
+    if extension == '.pkl':
+        data.to_pickle(path + '.tmp')
+    os.replace(path + '.tmp', path + extension)
+
+    return data
@@ -0,0 +1,236 @@
+import bisect
+import heapq
+import numpy as np
+import pandas as pd
+
+
+def _routing(data):
+    # Part.data: {'start_time': [...], 'process_time': [...], 'process': [...]} 또는 (step, field) MultiIndex Series
+    if isinstance(data, pd.Series):
+        data = {field: list(data.xs(field, level=1)) for field in ['start_time', 'process_time', 'process']}
+    route = list(data['process'])
+    end = route.index('Sink') if 'Sink' in route else len(route)
+    return data['start_time'][0], list(data['process_time'][:end]), route[:end]
+
+
+#region MaxPlusSchedule
+class MaxPlusSchedule(object):
+    """Deterministic evaluator of a plan of FIFO processes without SimPy.
+
+    The routings are compiled once into flat arrays (one entry per operation). ``evaluate``
+    then handles the arrivals in time order with a heap and keeps, per process, an array
+    with the time each server becomes available: an operation starts at
+    max(arrival, availability of its server) and its finish is the arrival at the next
+    process. Servers are chosen cyclically as in Process (``routing_logic='cyclic'``) or as
+    the one that becomes free first (``'fifo'``); buffers are unlimited and, like Source,
+    parts are released in list order at the start time of their first activity.
+
+    Without simultaneous arrivals the result is identical to the SimPy model. Arrivals at
+    the same time are ordered by an approximation of SimPy's event order, so with
+    integer-valued plans the cyclic server assignment (and the KPIs) can differ slightly.
+    """
+    def __init__(self, release, routes, process_times, process_list, ids=None):
+        self.process_list = list(process_list)
+        index = {name: i for i, name in enumerate(self.process_list)}
+
+        self.ids = list(ids) if ids is not None else list(range(len(routes)))
+        self.release = np.maximum.accumulate(np.asarray(release, dtype=float))
+        self.length = np.array([len(route) for route in routes])
+        self.offset = np.concatenate([[0], np.cumsum(self.length)])
+        self.process = np.array([index[name] for route in routes for name in route], dtype=int)
+        self.process_time = np.array([t for times in process_times for t in times], dtype=float)
+
+    @classmethod
+    def from_routings(cls, routings, process_list, ids=None):
+        # routings: 투입 순서대로 각 part의 Part.data, ids: part 이름 (증분 평가에서 part를 식별)
+        compiled = [_routing(data) for data in routings]
+        release, process_times, routes = zip(*compiled) if compiled else ((), (), ())
+        return cls(release, routes, process_times, process_list, ids=ids)
+
+    def _initial_state(self, server_num, after=-np.inf):
+        # 시각 after 이후에 투입되는 part의 투입 event와 빈 server
+        release = self.release.tolist()
+        offset = self.offset.tolist()
+        events = [(release[i], 0, 0.0, i, i, offset[i]) for i in range(len(release))
+                  if offset[i] < offset[i + 1] and release[i] >= after]
+        heapq.heapify(events)
+        return {"events": events, "seq": len(events),
+                "available": [[0.0] * int(num) for num in server_num],  # process별 server 가용 시각
+                "sent": [0] * len(server_num),
+                "free": [[(0.0, m) for m in range(int(num))] for num in server_num]}
+
+    def _run(self, state, start, finish, completion, routing_logic='cyclic', checkpoints=None, every=1000):
+        # state에서 시작해 남은 event를 모두 처리하고 처리한 operation 수를 반환.
+        # checkpoints가 주어지면 약 every개의 operation마다, 같은 시각의 event를 모두 처리한 직후의 state를
+        # (다음 event 시각, state) 형태로 저장
+        process = self.process.tolist()
+        process_time = self.process_time.tolist()
+        offset = self.offset.tolist()
+        events, available, sent, free = state["events"], state["available"], state["sent"], state["free"]
+        seq = state["seq"]
+
+        # (도착 시각, 구분, event 생성 시각, 순번, part, 다음 operation) - 같은 시각의 도착은 SimPy의 처리 순서를 따름:
+        # Source에서 투입된 part(구분 0)가 이전 공정에서 이동한 part(구분 1)보다 먼저 도착하고,
+        # 이동한 part는 작업 종료 event가 먼저 생성된(먼저 시작한) part부터 도착
+        count, last, now = 0, 0, -np.inf
+        while events:
+            if checkpoints is not None and count - last >= every and events[0][0] > now:
+                checkpoints.append((events[0][0], self._snapshot(events, seq, available, sent, free)))
+                last = count
+            arrival, _, _, _, part, op = heapq.heappop(events)
+            now = arrival
+            p = process[op]
+            if routing_logic == 'cyclic':
+                m = sent[p] % len(available[p])
+                sent[p] += 1
+                begin = max(arrival, available[p][m])
+                available[p][m] = begin + process_time[op]
+            else:
+                ready, m = heapq.heappop(free[p])
+                begin = max(arrival, ready)
+                heapq.heappush(free[p], (begin + process_time[op], m))
+            start[op], finish[op] = begin, begin + process_time[op]
+            if op + 1 < offset[part + 1]:
+                heapq.heappush(events, (finish[op], 1, begin, seq, part, op + 1))
+                seq += 1
+            else:
+                completion[part] = finish[op]
+            count += 1
+
+        state["seq"] = seq
+        return count
+
+    def _snapshot(self, events, seq, available, sent, free):
+        # 이동 event를 (part id, step) 기준의 array로 저장 - 투입 event는 schedule에서 다시 생성
+        transfers = np.array([event for event in events if event[1] == 1], dtype=float).reshape(-1, 6)
+        part = transfers[:, 4].astype(int)
+        ids = np.empty(len(part), dtype=object)
+        for k, i in enumerate(part.tolist()):
+            ids[k] = self.ids[i]
+        return {"time": transfers[:, 0], "created": transfers[:, 2], "order": transfers[:, 3].astype(np.int64),
+                "part": ids, "step": transfers[:, 5].astype(int) - self.offset[part], "seq": seq,
+                "available": [list(a) for a in available], "sent": list(sent), "free": [list(f) for f in free]}
+
+    def evaluate(self, server_num, routing_logic='cyclic'):
+        """Start and finish time of every operation (flat, in routing order) and part completion times."""
+        start = np.empty(len(self.process))
+        finish = np.empty(len(self.process))
+        completion = self.release.copy()
+        self._run(self._initial_state(server_num), start, finish, completion, routing_logic=routing_logic)
+        return start, finish, completion
+
+    def summarize(self, server_num, start, finish, completion):
+        # cal_process_metrics / cal_leadtime(mode="m")와 같은 정의: 구간 [0, makespan]
+        makespan = completion.max() if len(completion) > 0 else 0.0
+        working_time = np.bincount(self.process, weights=finish - start, minlength=len(self.process_list))
+        utilization = working_time / (np.asarray(server_num, dtype=float) * makespan) if makespan > 0 else np.zeros(len(working_time))
+        return {"utilization": utilization, "leadtime": float(np.mean(completion - self.release)),
+                "makespan": float(makespan)}
+
+    def kpis(self, server_num, routing_logic='cyclic'):
+        return self.summarize(server_num, *self.evaluate(server_num, routing_logic=routing_logic))
+#endregion
+
+
+#region IncrementalSchedule
+def _match(old, new):
+    """Position in ``old`` of each part of ``new`` (-1 if none), the unchanged parts and their operations in ``old``.
+
+    A part is unchanged when it exists in both schedules with the same release time,
+    routing, processing times and preceding part (so the order of simultaneous releases
+    is also compared). The operation map is -1 for the operations of changed parts.
+    """
+    position = {part: j for j, part in enumerate(old.ids)}
+    j = np.array([position.get(part, -1) for part in new.ids], dtype=int)
+    same = (j >= 0) & (new.length == old.length[j]) & (new.release == old.release[j])
+    previous = np.concatenate([[-1], j[:-1]])
+    same &= (j - 1 == previous) & ((previous >= 0) | (np.arange(len(j)) == 0))
+
+    part = np.repeat(np.arange(len(j)), new.length)
+    op = np.where(same[part], old.offset[j[part]] + np.arange(len(part)) - new.offset[part], -1)
+    valid = np.flatnonzero(op >= 0)
+    differ = (new.process[valid] != old.process[op[valid]]) | (new.process_time[valid] != old.process_time[op[valid]])
+    same &= np.bincount(part[valid[differ]], minlength=len(j)) == 0
+    return j, same, np.where(same[part], op, -1)
+
+
+class IncrementalSchedule(object):
+    """Re-evaluation of an edited plan from the earliest time the edit can affect.
+
+    The first ``evaluate`` runs the whole MaxPlusSchedule and stores the result together
+    with checkpoints of the evaluator state (server availability, cyclic counters, pending
+    arrivals) every ``checkpoint_every`` operations. For a new schedule of the same processes
+    the parts (identified by ``schedule.ids``) that were added, removed or changed are found
+    and the earliest of their old and new release times is the first time the two plans can
+    differ. The results before the last checkpoint not later than that time are kept, the
+    state is restored and only the remaining events are processed; the result is the same
+    as a full ``evaluate`` of the new schedule. ``resimulated`` is the share of operations
+    processed again in the last evaluation.
+    """
+    def __init__(self, server_num, routing_logic='cyclic', checkpoint_every=1000):
+        self.server_num = list(server_num)
+        self.routing_logic = routing_logic
+        self.checkpoint_every = checkpoint_every
+        self.schedule = None
+        self.result = None
+        self.checkpoints = []
+        self.resimulated = 1.0
+
+    def _run(self, schedule, state, start, finish, completion):
+        count = schedule._run(state, start, finish, completion, routing_logic=self.routing_logic,
+                              checkpoints=self.checkpoints, every=self.checkpoint_every)
+        self.resimulated = count / len(schedule.process) if len(schedule.process) > 0 else 0.0
+        return start, finish, completion
+
+    def _resume(self, schedule):
+        old = self.schedule
+        j, same, op = _match(old, schedule)
+        removed = np.ones(len(old.ids), dtype=bool)
+        removed[j[same]] = False
+        time = min(schedule.release[~same].min(initial=np.inf), old.release[removed].min(initial=np.inf))
+        if np.isinf(time):
+            self.resimulated = 0.0
+            return self.result
+
+        # 첫 변경 시각 이전의 마지막 checkpoint (모든 event가 그 시각 이전인 state)
+        k = bisect.bisect_right([checkpoint[0] for checkpoint in self.checkpoints], time)
+        if k == 0:
+            self.checkpoints = []
+            return self._run(schedule, schedule._initial_state(self.server_num), np.empty(len(schedule.process)),
+                             np.empty(len(schedule.process)), schedule.release.copy())
+        restart, saved = self.checkpoints[k - 1]
+        del self.checkpoints[k:]
+
+        # 변경되지 않은 part의 결과를 옮기고, restart 이후의 operation은 다시 계산
+        kept = op >= 0
+        start, finish = np.full(len(schedule.process), np.nan), np.full(len(schedule.process), np.nan)
+        start[kept], finish[kept] = self.result[0][op[kept]], self.result[1][op[kept]]
+        completion = schedule.release.copy()
+        completion[same] = self.result[2][j[same]]
+
+        # checkpoint의 이동 event를 새 schedule의 part / operation 번호로 변환, 투입 event는 새 schedule에서 생성
+        index = {part: i for i, part in enumerate(schedule.ids)}
+        part = np.array([index[p] for p in saved["part"]], dtype=int)
+        op = schedule.offset[part] + saved["step"]
+        state = schedule._initial_state(self.server_num, after=restart)
+        state["events"] += list(zip(saved["time"].tolist(), [1] * len(part), saved["created"].tolist(),
+                                    saved["order"].tolist(), part.tolist(), op.tolist()))
+        heapq.heapify(state["events"])
+        state.update(seq=saved["seq"], available=[list(a) for a in saved["available"]], sent=list(saved["sent"]),
+                     free=[list(f) for f in saved["free"]])
+        return self._run(schedule, state, start, finish, completion)
+
+    def evaluate(self, schedule):
+        """Start, finish and completion times of ``schedule``, re-using the previous evaluation if possible."""
+        if self.schedule is None or schedule.process_list != self.schedule.process_list:
+            self.checkpoints = []
+            result = self._run(schedule, schedule._initial_state(self.server_num), np.empty(len(schedule.process)),
+                               np.empty(len(schedule.process)), schedule.release.copy())
+        else:
+            result = self._resume(schedule)
+        self.schedule, self.result = schedule, result
+        return result
+
+    def kpis(self, schedule):
+        return schedule.summarize(self.server_num, *self.evaluate(schedule))
+#endregion
@@ -0,0 +1,137 @@
+import os
+import numpy as np
+import pandas as pd
+
+
+#region GaussianProcess
+class GaussianProcess(object):
+    """Gaussian-process regression with a squared-exponential kernel.
+
+    Inputs are scaled to [0, 1] and outputs standardized before fitting. The length scale
+    is chosen from ``length_scales`` by the log marginal likelihood; ``noise`` is the
+    variance of the simulation noise relative to the output variance.
+    """
+    def __init__(self, length_scales=(0.1, 0.2, 0.5, 1.0, 2.0), noise=1e-2):
+        self.length_scales = length_scales
+        self.noise = noise
+
+    def _kernel(self, a, b):
+        d = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2)
+        return np.exp(-0.5 * d / self.length_scale ** 2)
+
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.x_min = X.min(axis=0)
+        self.x_range = np.where(X.max(axis=0) > self.x_min, X.max(axis=0) - self.x_min, 1.0)
+        self.y_mean = y.mean()
+        self.y_std = y.std() if y.std() > 0 else 1.0
+        self.X = (X - self.x_min) / self.x_range
+        z = (y - self.y_mean) / self.y_std
+
+        best, selected = -np.inf, None
+        for length_scale in self.length_scales:
+            self.length_scale = length_scale
+            K = self._kernel(self.X, self.X) + self.noise * np.eye(len(self.X))
+            try:
+                L = np.linalg.cholesky(K)
+            except np.linalg.LinAlgError:
+                continue
+            alpha = np.linalg.solve(L.T, np.linalg.solve(L, z))
+            likelihood = -0.5 * z @ alpha - np.log(np.diag(L)).sum()
+            if likelihood > best:
+                best, selected = likelihood, (length_scale, L, alpha)
+        if selected is None:
+            raise np.linalg.LinAlgError("kernel matrix is not positive definite for any length scale in {0} "
+                                        "(noise={1}); increase noise".format(self.length_scales, self.noise))
+        self.length_scale, self.L, self.alpha = selected
+        return self
+
+    def predict(self, X):
+        X = (np.asarray(X, dtype=float) - self.x_min) / self.x_range
+        k = self._kernel(X, self.X)
+        mean = k @ self.alpha
+        v = np.linalg.solve(self.L, k.T)
+        var = np.maximum(1.0 - (v ** 2).sum(axis=0), 0.0)
+        return self.y_mean + self.y_std * mean, self.y_std * np.sqrt(var)
+#endregion
+
+
+#region Metamodel
+class Metamodel(object):
+    """Answer what-if queries from a surrogate, simulating only when it is unsure.
+
+    ``run(**point)`` is the simulation (the same convention as ``run_sweep``) and
+    ``parameters`` the names of its numeric inputs. Every simulated point is recorded and
+    one Gaussian process per KPI is refitted lazily. A query is answered by the surrogate
+    when the point lies within the range of the recorded runs and each predicted KPI has a
+    standard deviation below ``relative_std`` of its predicted value (and at least
+    ``min_samples`` runs are recorded); otherwise the model is simulated and the result
+    added to the records. With ``filepath`` the records are kept in a csv, so a
+    ``run_sweep`` result file can seed the metamodel.
+    """
+    def __init__(self, run, parameters, kpis=None, relative_std=0.02, min_samples=5, filepath=None):
+        self.run = run
+        self.parameters = list(parameters)
+        self.kpis = kpis
+        self.relative_std = relative_std
+        self.min_samples = min_samples
+        self.filepath = filepath
+
+        self.records = []
+        self.models = None
+        if filepath is not None and os.path.exists(filepath) and os.path.getsize(filepath) > 0:
+            self.records = pd.read_csv(filepath).to_dict('records')
+            if self.kpis is None:
+                self.kpis = [column for column in self.records[0] if column not in self.parameters]
+
+    def observe(self, point, result):
+        row = dict(point)
+        row.update(result)
+        if self.kpis is None:
+            self.kpis = [name for name in result if name not in self.parameters]
+        if self.filepath is not None:
+            header = not (os.path.exists(self.filepath) and os.path.getsize(self.filepath) > 0)
+            pd.DataFrame([row])[self.parameters + self.kpis].to_csv(self.filepath, mode='a', header=header, index=False)
+        self.records.append(row)
+        self.models = None
+
+    def fit(self):
+        data = pd.DataFrame(self.records)
+        X = data[self.parameters].values
+        self.models = {kpi: GaussianProcess().fit(X, data[kpi].values) for kpi in self.kpis}
+        # 이미 시뮬레이션한 point는 surrogate 대신 기록된 값을 사용
+        self.observed = {tuple(x): i for i, x in enumerate(X.tolist())}
+        self.lower, self.upper = X.min(axis=0), X.max(axis=0)
+
+    def predict(self, points):
+        """Surrogate mean and standard deviation of every KPI, one row per point."""
+        if self.models is None:
+            self.fit()
+        X = pd.DataFrame(points)[self.parameters].values
+        mean, std = dict(), dict()
+        for kpi, model in self.models.items():
+            mean[kpi], std[kpi] = model.predict(X)
+        return pd.DataFrame(mean), pd.DataFrame(std)
+
+    def __call__(self, **point):
+        """Return ``(kpis, source)`` with source "record", "surrogate" or "simulation"."""
+        if len(self.records) >= self.min_samples:
+            if self.models is None:
+                self.fit()
+            key = tuple(float(point[name]) for name in self.parameters)
+            if key in self.observed:
+                row = self.records[self.observed[key]]
+                return {kpi: row[kpi] for kpi in self.kpis}, "record"
+
+            # 기록된 범위 밖의 point(외삽)는 항상 시뮬레이션
+            inside = np.all((np.array(key) >= self.lower) & (np.array(key) <= self.upper))
+            mean, std = self.predict([point])
+            mean, std = mean.iloc[0], std.iloc[0]
+            if inside and np.all(std <= self.relative_std * np.abs(mean)):
+                return mean.to_dict(), "surrogate"
+
+        result = self.run(**point)
+        self.observe(point, result)
+        return {kpi: result[kpi] for kpi in self.kpis}, "simulation"
+#endregion
@@ -0,0 +1,119 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+
+#region ServerOptimizer
+class ServerOptimizer(object):
+    """Minimize the total number of servers subject to utilization / lead-time limits.
+
+    ``evaluate(server_num)`` runs one simulation for a tuple of server counts (one per
+    process) and returns ``{"utilization": array, "leadtime": float}``. Every evaluated
+    configuration is cached, and batches of new configurations are simulated in a process
+    pool (``initializer``/``initargs`` load the model data once per worker). The search is
+    a simultaneous per-process bisection followed by a genetic search around its result.
+    """
+    def __init__(self, evaluate, num_processes, utilization_limit=0.9, leadtime_limit=None, max_servers=1024,
+                 n_jobs=None, initializer=None, initargs=()):
+        self.evaluate = evaluate
+        self.num_processes = num_processes
+        self.utilization_limit = utilization_limit
+        self.leadtime_limit = leadtime_limit
+        self.max_servers = max_servers
+
+        self.cache = dict()  # server 수 tuple -> KPI
+        self.num_simulations = 0
+
+        if n_jobs == 1:
+            self.executor = None
+            if initializer is not None:
+                initializer(*initargs)
+        else:
+            self.executor = ProcessPoolExecutor(max_workers=n_jobs, initializer=initializer, initargs=initargs)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    def evaluate_many(self, candidates):
+        candidates = [tuple(int(s) for s in candidate) for candidate in candidates]
+        new = list(dict.fromkeys(candidate for candidate in candidates if candidate not in self.cache))
+        if self.executor is None:
+            results = [self.evaluate(candidate) for candidate in new]
+        else:
+            results = list(self.executor.map(self.evaluate, new))
+        for candidate, kpi in zip(new, results):
+            self.cache[candidate] = kpi
+        self.num_simulations += len(new)
+        return [self.cache[candidate] for candidate in candidates]
+
+    def violation(self, kpi):
+        # 제약 위반 정도 (0이면 feasible)
+        violation = np.sum(np.maximum(np.asarray(kpi["utilization"]) - self.utilization_limit, 0.0))
+        if self.leadtime_limit is not None:
+            violation += max(kpi["leadtime"] - self.leadtime_limit, 0.0) / self.leadtime_limit
+        return violation
+
+    def bisection(self):
+        # 1) 모든 process가 utilization 한도를 만족할 때까지 server 수를 두 배로 늘려 상한 탐색
+        lo = np.zeros(self.num_processes, dtype=int)
+        hi = np.ones(self.num_processes, dtype=int)
+        while True:
+            utilization = np.asarray(self.evaluate_many([hi])[0]["utilization"])
+            over = (utilization > self.utilization_limit) & (hi < self.max_servers)
+            if not np.any(over):
+                break
+            lo[over] = hi[over]
+            hi[over] = np.minimum(hi[over] * 2, self.max_servers)
+
+        # 2) 각 process의 (lo, hi] 구간을 동시에 이분 탐색 - 시뮬레이션 1회로 모든 process의 구간을 갱신
+        while np.any(hi - lo > 1):
+            searching = hi - lo > 1
+            mid = np.where(searching, (lo + hi) // 2, hi)
+            utilization = np.asarray(self.evaluate_many([mid])[0]["utilization"])
+            feasible = utilization <= self.utilization_limit
+            hi = np.where(searching & feasible, mid, hi)
+            lo = np.where(searching & ~feasible, mid, lo)
+
+        # 3) process 간 상호작용으로 위반이 남으면 위반 process의 server 수를 증가
+        while True:
+            kpi = self.evaluate_many([hi])[0]
+            utilization = np.asarray(kpi["utilization"])
+            if self.violation(kpi) == 0 or np.all(hi >= self.max_servers):
+                return hi
+            over = utilization > self.utilization_limit
+            if not np.any(over):  # lead time 위반: 가장 바쁜 process 증설
+                over = utilization == utilization.max()
+            hi = np.where(over, np.minimum(hi + 1, self.max_servers), hi)
+
+    def genetic_search(self, start, population_size=16, generations=10, penalty=1000.0, seed=None):
+        rng = np.random.default_rng(seed)
+        start = np.asarray(start, dtype=int)
+
+        def mutate(x):
+            step = rng.integers(-1, 2, size=len(x)) * (rng.random(len(x)) < max(1.0 / len(x), 0.1))
+            return np.clip(x + step, 1, self.max_servers)
+
+        population = [start] + [mutate(start) for _ in range(population_size - 1)]
+        best, best_kpi = start, self.evaluate_many([start])[0]
+        for generation in range(generations):
+            kpis = self.evaluate_many(population)
+            fitness = np.array([x.sum() + penalty * self.violation(kpi) for x, kpi in zip(population, kpis)])
+            for x, kpi in zip(population, kpis):
+                if self.violation(kpi) == 0 and (self.violation(best_kpi) > 0 or x.sum() < best.sum()):
+                    best, best_kpi = x, kpi
+
+            # elitism + tournament selection, uniform crossover, mutation
+            order = np.argsort(fitness)
+            children = [population[order[0]], population[order[1]]]
+            while len(children) < population_size:
+                a, b = (min(rng.choice(len(population), 2, replace=False), key=lambda i: fitness[i]) for _ in range(2))
+                mask = rng.random(self.num_processes) < 0.5
+                children.append(mutate(np.where(mask, population[a], population[b])))
+            population = children
+
+        return best, best_kpi
+
+    def optimize(self, population_size=16, generations=10, seed=None):
+        start = self.bisection()
+        return self.genetic_search(start, population_size=population_size, generations=generations, seed=seed)
+#endregion
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+import scipy.stats as st
+
+
+def confidence_interval(values, confidence=0.95):
+    # Student-t 신뢰구간의 (평균, half width)
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    mean = np.mean(values) if n > 0 else np.nan
+    if n < 2:
+        return mean, np.inf
+    half_width = st.t.ppf((1 + confidence) / 2, n - 1) * np.std(values, ddof=1) / np.sqrt(n)
+    return mean, half_width
+
+
+def summarize(kpis, confidence=0.95):
+    """Mean, standard deviation and confidence interval of each KPI column of ``kpis``."""
+    rows = dict()
+    for column in kpis.columns:
+        values = kpis[column].dropna().values
+        mean, half_width = confidence_interval(values, confidence)
+        rows[column] = {"mean": mean, "std": np.std(values, ddof=1) if len(values) > 1 else np.nan,
+                        "half_width": half_width, "lower": mean - half_width, "upper": mean + half_width,
+                        "n": len(values)}
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def relative_half_width(mean, half_width):
+    return abs(half_width / mean) if mean != 0 else np.inf
+
+
+#region BatchMeans
+class BatchMeans(object):
+    """Online batch-means estimator for the steady-state mean of one long run.
+
+    Observations are averaged in batches; whenever ``2 * num_batches`` batches are full,
+    adjacent batches are merged and the batch size doubles, so memory stays constant and
+    the batch means become approximately independent as the run grows.
+    """
+    def __init__(self, num_batches=32):
+        self.num_batches = num_batches
+        self.batch_size = 1
+        self.batches = list()  # 완료된 batch들의 평균
+        self.n = 0  # 전체 관측 수
+
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value):
+        self._sum += value
+        self._count += 1
+        self.n += 1
+        if self._count == self.batch_size:
+            self.batches.append(self._sum / self._count)
+            self._sum, self._count = 0.0, 0
+            if len(self.batches) == 2 * self.num_batches:
+                batches = np.asarray(self.batches)
+                self.batches = list((batches[0::2] + batches[1::2]) / 2)
+                self.batch_size *= 2
+
+    def mean(self):
+        return np.mean(self.batches) if len(self.batches) > 0 else np.nan
+
+    def confidence_interval(self, confidence=0.95):
+        # batch 수가 너무 적으면 batch mean 간 상관이 커서 신뢰구간을 계산하지 않음
+        if len(self.batches) < self.num_batches:
+            return self.mean(), np.inf
+        return confidence_interval(self.batches, confidence)
+#endregion
+
+
+#region Warm-up detection
+def _mser_statistic(batches):
+    # d개의 batch를 삭제했을 때의 MSER 통계량: (남은 batch의 편차 제곱합) / (남은 batch 수)^2
+    batches = np.asarray(batches, dtype=float)
+    remaining = len(batches) - np.arange(len(batches))
+    suffix_sum = np.cumsum(batches[::-1])[::-1]
+    suffix_square = np.cumsum((batches ** 2)[::-1])[::-1]
+    return (suffix_square - suffix_sum ** 2 / remaining) / remaining ** 2
+
+
+def mser(values, batch_size=5):
+    """Warm-up length (in observations) of ``values`` by the MSER-``batch_size`` rule.
+
+    The truncation point is searched in the first half of the batches only; the statistic
+    of a short remaining tail is unstable and would otherwise often be the minimum.
+    """
+    values = np.asarray(values, dtype=float)
+    k = len(values) // batch_size
+    if k < 2:
+        return 0
+    batches = values[:k * batch_size].reshape(k, batch_size).mean(axis=1)
+    # 후보 truncation 지점 d는 batch의 앞쪽 절반 (MSEREstimator가 d > k / 2를 transient로 보는 것과 같은 기준)
+    return int(np.argmin(_mser_statistic(batches)[:k // 2 + 1])) * batch_size
+
+
+class MSEREstimator(object):
+    """Online steady-state mean estimator with MSER warm-up truncation.
+
+    Observations are kept as MSER batch averages. On every query the truncation point is
+    recomputed, observations before it are discarded, and the confidence interval is
+    built from ``num_batches`` batch means of the truncated stream. While the optimal
+    truncation lies in the second half of the data the run is considered still in its
+    transient and the half width is infinite.
+    """
+    def __init__(self, batch_size=5, num_batches=20):
+        self.mser_batch_size = batch_size
+        self.num_batches = num_batches
+        self.batches = list()  # MSER batch 평균
+        self.batch_times = list()  # 각 MSER batch의 마지막 관측 시각
+        self.n = 0
+
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value, time=None):
+        self._sum += value
+        self._count += 1
+        self.n += 1
+        if self._count == self.mser_batch_size:
+            self.batches.append(self._sum / self._count)
+            self.batch_times.append(time)
+            self._sum, self._count = 0.0, 0
+
+    def _truncation(self):
+        if len(self.batches) < 2:
+            return 0
+        return int(np.argmin(_mser_statistic(self.batches)[:len(self.batches) - 1]))
+
+    @property
+    def warmup(self):
+        # 삭제되는 관측 수
+        return self._truncation() * self.mser_batch_size
+
+    @property
+    def warmup_time(self):
+        d = self._truncation()
+        return self.batch_times[d - 1] if d > 0 else 0.0
+
+    @property
+    def batch_size(self):
+        # 신뢰구간 계산에 사용하는 batch의 관측 수
+        return self.mser_batch_size * max((len(self.batches) - self._truncation()) // self.num_batches, 1)
+
+    def mean(self):
+        return np.mean(self.batches[self._truncation():]) if len(self.batches) > 0 else np.nan
+
+    def confidence_interval(self, confidence=0.95):
+        d = self._truncation()
+        batches = np.asarray(self.batches[d:])
+        mean = np.mean(batches) if len(batches) > 0 else np.nan
+        if d > len(self.batches) / 2 or len(batches) < 2 * self.num_batches:
+            return mean, np.inf
+        size = len(batches) // self.num_batches
+        batches = batches[len(batches) - size * self.num_batches:].reshape(self.num_batches, size).mean(axis=1)
+        return confidence_interval(batches, confidence)
+#endregion
@@ -1,9 +1,50 @@
+import os
+import zlib
+import inspect
+import functools
+import tempfile
 import numpy as np
 import pandas as pd
-import datetime
-import random
 import matplotlib.pyplot as plt
-import plotly.figure_factory as ff
+import plotly.graph_objects as go
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from .EventSchema import EventType, COLUMN_ALIASES, to_event_codes, read_event_log
+    from .ResultCache import ResultCache
+except ImportError:
+    from EventSchema import EventType, COLUMN_ALIASES, to_event_codes, read_event_log
+    from ResultCache import ResultCache
+
+# enable_cache()로 설정되는 on-disk result cache
+_result_cache = None
+
+
+def enable_cache(cache_dir='../result/cache', max_size=512 * 1024 ** 2):
+    global _result_cache
+    _result_cache = ResultCache(cache_dir=cache_dir, max_size=max_size)
+    return _result_cache
+
+
+def disable_cache():
+    global _result_cache
+    _result_cache = None
+
+
+def _memoize(func):
+    # cache가 켜져 있으면 (log 내용, 함수, 인자)를 key로 결과를 재사용, 그래프 출력/저장 시에는 항상 계산
+    # (display / save는 위치 인자로 전달될 수도 있으므로 signature에 bind해서 확인)
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(log, *args, **kwargs):
+        if _result_cache is None:
+            return func(log, *args, **kwargs)
+        arguments = signature.bind(log, *args, **kwargs).arguments
+        if arguments.get("display") or arguments.get("save"):
+            return func(log, *args, **kwargs)
+        return _result_cache(func)(log, *args, **kwargs)
+    return wrapper
 
 
 def graph(x, y, title=None, display=False, save=False, filepath=None):
@@ -17,82 +58,116 @@ def graph(x, y, title=None, display=False, save=False, filepath=None):
         plt.close("all")
 
 
-def cal_utilization(log, name=None, type=None, num=1, start_time=0.0, finish_time=0.0, step=None, display=False, save=False, filepath=None):
-    log = log[(log[type] == name) & ((log["Event"] == "work_start") | (log["Event"] == "work_finish"))]
+class EventLog(object):
+    """Event tracer wrapper with lazily built, cached row indexes.
+
+    The first query on a column (e.g. "Process", "Machine", "Part", "Event") sorts the
+    row positions of that column once; later queries on the same column are slices of
+    that sorted array instead of full-column comparisons.
+    """
+    def __init__(self, log):
+        self.data = to_event_codes(log).reset_index(drop=True)
+        self._index = dict()  # column -> (value -> group number, sorted row positions, group boundaries)
+
+    @classmethod
+    def read_csv(cls, filepath):
+        return cls(read_event_log(filepath))
+
+    def __len__(self):
+        return len(self.data)
+
+    def _get_index(self, column):
+        column = COLUMN_ALIASES.get(column, column)
+        if column not in self._index:
+            codes, uniques = pd.factorize(self.data[column], sort=False)
+            order = np.argsort(codes, kind="stable")  # 같은 값 내에서는 row 순서(= 시간 순서) 유지
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            self._index[column] = ({key: i for i, key in enumerate(uniques)}, order, bounds)
+        return self._index[column]
+
+    def values(self, column):
+        return list(self._get_index(column)[0].keys())
+
+    def positions(self, column, value):
+        # column == value 인 row 위치 (오름차순)
+        lookup, order, bounds = self._get_index(column)
+        if isinstance(value, (list, tuple, set, np.ndarray)):
+            groups = [lookup[v] for v in value if v in lookup]
+            if len(groups) == 0:
+                return np.array([], dtype=np.intp)
+            return np.sort(np.concatenate([order[bounds[g]:bounds[g + 1]] for g in groups]))
+        if value not in lookup:
+            return np.array([], dtype=np.intp)
+        g = lookup[value]
+        return order[bounds[g]:bounds[g + 1]]
+
+    def select(self, **conditions):
+        # ex) log.select(Process="M1", Event=[EventType.WORK_START, EventType.WORK_FINISH])
+        positions = None
+        for column, value in conditions.items():
+            if value is None:
+                continue
+            idx = self.positions(column, value)
+            positions = idx if positions is None else np.intersect1d(positions, idx, assume_unique=True)
+        if positions is None:
+            return self.data
+        return self.data.iloc[positions]
+
+
+def _as_event_log(log):
+    if isinstance(log, str):
+        return EventLog.read_csv(log)
+    return log if isinstance(log, EventLog) else EventLog(log)
+
+
+def _pair_events(log, start_events, finish_events, keys=("Part", "Process")):
+    # start/finish event를 keys 단위로 순서대로 짝지음 (k번째 start <-> k번째 finish)
+    keys = list(keys)
+    events = log["Event"].values
+    start = log[np.isin(events, start_events)]
+    finish = log[np.isin(events, finish_events)]
+    start = start[keys + ["Time"]].assign(_k=start.groupby(keys, sort=False).cumcount().values)
+    finish = finish[keys + ["Time"]].assign(_k=finish.groupby(keys, sort=False).cumcount().values)
+    pairs = pd.merge(start, finish, on=keys + ["_k"], how="left", suffixes=("_start", "_finish"))
+    return pairs.drop(columns="_k").rename(columns={"Time_start": "Start", "Time_finish": "Finish"})
+
+
+def _work_intervals(log):
+    # 작업 구간(Part, Process, Start, Finish) - 종료되지 않은 작업의 Finish는 NaN
+    return _pair_events(log, [EventType.WORK_START], [EventType.WORK_FINISH])
+
+
+def _overlap(start, finish, window_start, window_finish):
+    # [start, finish] 구간이 [window_start, window_finish]와 겹치는 시간
+    finish = np.where(np.isnan(finish), np.inf, finish)
+    return np.clip(np.minimum(finish, window_finish) - np.maximum(start, window_start), 0.0, None)
 
+
+def _window_ends(start_time, finish_time, step):
     if step:
-        iteration = step
+        time = np.linspace(start_time, finish_time, num=step)
+        return time, time[1:]
     else:
-        iteration = 1
-
-    time = np.linspace(start_time, finish_time, num=iteration)
-    utilization = np.array([0.0 for _ in range(iteration)])
-    idle_time = np.array([0.0 for _ in range(iteration)])
-    working_time = np.array([0.0 for _ in range(iteration)])
-
-    for i in range(iteration):
-        if step and (i == iteration - 1):
-            break
-        if step:
-            finish_time = time[i + 1]
-        data = log[(log["Time"] >= start_time) & (log["Time"] <= finish_time)]
-
-        total_time = 0.0
-        for j in range(num):
-            if type == "Process":
-                name_of_subprocess = name + "_{0}".format(j)
-            else:
-                name_of_subprocess = name
-
-            group = data[data["SubProcess"] == name_of_subprocess]
-            work_start = group[group['Event'] == "work_start"]
-            work_finish = group[group['Event'] == "work_finish"]
-
-            if len(work_start) == 0 and len(work_finish) == 0:
-                temp = log[log["SubProcess"] == name]
-                if len(temp) != 0:
-                    idx = temp["Time"] >= start_time
-                    if temp[idx].iloc[0]["Event"] == "work_finsh":
-                        working_time += (finish_time - start_time)
-                        total_time += (finish_time - start_time)
-                        continue
-                working_time += 0.0
-                total_time += (finish_time - start_time)
-                continue
-            elif len(work_start) != 0 and len(work_finish) == 0:
-                row = dict(work_start.iloc[0])
-                row["Time"] = finish_time
-                row["Event"] = "work_finish"
-                work_finish = pd.DataFrame([row])
-            elif len(work_start) == 0 and len(work_finish) != 0:
-                row = dict(work_finish.iloc[0])
-                row["Time"] = start_time
-                row["Event"] = "work_start"
-                work_start = pd.DataFrame([row])
-            else:
-                if work_start.iloc[0]["Part"] != work_finish.iloc[0]["Part"]:
-                    row = dict(work_finish.iloc[0])
-                    row["Time"] = start_time
-                    row["Event"] = "work_start"
-                    work_start = pd.DataFrame([row]).append(work_start)
-                if work_start.iloc[-1]["Part"] != work_finish.iloc[-1]["Part"]:
-                    row = dict(work_start.iloc[-1])
-                    row["Time"] = finish_time
-                    row["Event"] = "work_finish"
-                    work_finish = work_finish.append(pd.DataFrame([row]))
-
-            work_start = work_start["Time"].reset_index(drop=True)
-            work_finish = work_finish["Time"].reset_index(drop=True)
-            working_time[i] += np.sum(work_finish - work_start)
-            total_time += (finish_time - start_time)
-
-        idle_time[i] = total_time - working_time[i]
-        utilization[i] = working_time[i] / total_time if total_time != 0.0 else 0.0
+        return None, np.array([finish_time], dtype=float)
+
+
+@_memoize
+def cal_utilization(log, name=None, type=None, num=1, start_time=0.0, finish_time=0.0, step=None, display=False, save=False, filepath=None):
+    log = _as_event_log(log)
+    intervals = _work_intervals(log.select(**{type: name, "Event": [EventType.WORK_START, EventType.WORK_FINISH]}))
+    start = intervals["Start"].values.astype(float)
+    finish = intervals["Finish"].values.astype(float)
+
+    time, window_ends = _window_ends(start_time, finish_time, step)
+    working_time = np.array([np.sum(_overlap(start, finish, start_time, end)) for end in window_ends])
+    total_time = num * (window_ends - start_time)
+    idle_time = total_time - working_time
+    utilization = np.divide(working_time, total_time, out=np.zeros_like(working_time), where=total_time != 0.0)
 
     if step:
-        utilization = pd.DataFrame({"Time": time[1:], "Utilization": utilization[:-1]})
-        idle_time = pd.DataFrame({"Time": time[1:], "Idle_time": idle_time[:-1]})
-        working_time = pd.DataFrame({"Time": time[1:], "Working_time": working_time[:-1]})
+        utilization = pd.DataFrame({"Time": time[1:], "Utilization": utilization})
+        idle_time = pd.DataFrame({"Time": time[1:], "Idle_time": idle_time})
+        working_time = pd.DataFrame({"Time": time[1:], "Working_time": working_time})
         if display or save:
             title = "utilization of {0} in ({1:.2f}, {2:.2f})".format(name, start_time, finish_time)
             graph(utilization["Time"], utilization["Utilization"], title=title, display=display, save=save, filepath=filepath)
@@ -101,63 +176,46 @@ def cal_utilization(log, name=None, type=None, num=1, start_time=0.0, finish_tim
         return utilization[0], idle_time[0], working_time[0]
 
 
+@_memoize
 def cal_leadtime(log, name=None, type=None, mode="m", start_time=0.0, finish_time=0.0):
-    event = {"m": ("part_created", "completed"),
-             "p": ("Process_entered", "part_transferred_to_next_process", "part_transferred_to_next_process_with_tp", "part_transferred_to_Sink")}
+    event = {"m": ([EventType.PART_CREATED], [EventType.PART_COMPLETED]),
+             "p": ([EventType.PROCESS_ENTERED], [EventType.PART_TRANSFERRED, EventType.PART_TRANSFERRED_TO_SINK])}
 
+    log = _as_event_log(log)
     if not mode == "m":
-        log = log[log[type] == name]
-
-    leadtime_start = log[log["Event"] == event[mode][0]]
-    if mode == "p":
-        leadtime_finish = log[(log["Event"] == event[mode][1]) | (log["Event"] == event[mode][2]) | (log["Event"] == event[mode][3])]
+        data = log.select(**{type: name, "Event": event[mode][0] + event[mode][1]})
     else:
-        leadtime_finish = log[log["Event"] == event[mode][1]]
+        data = log.select(Event=event[mode][0] + event[mode][1])
 
-    idx = (leadtime_finish["Time"] >= start_time) & (leadtime_finish["Time"] <= finish_time)
+    pairs = _pair_events(data, event[mode][0], event[mode][1], keys=["Part"])
+    pairs = pairs[(pairs["Finish"] >= start_time) & (pairs["Finish"] <= finish_time)]
 
-    if len(idx[idx]) == 0:
+    if len(pairs) == 0:
         return 0.0
 
-    leadtime_start = leadtime_start[:len(leadtime_finish)]
-    leadtime_start = leadtime_start[list(idx)].sort_values(["Part"])
-    leadtime_finish = leadtime_finish[list(idx)].sort_values(["Part"])
-    leadtime_start = leadtime_start["Time"].reset_index(drop=True)
-    leadtime_finish = leadtime_finish["Time"].reset_index(drop=True)
-
-    lead_time_list = leadtime_finish - leadtime_start
-    lead_time = np.mean(lead_time_list)
+    lead_time = np.mean(pairs["Finish"] - pairs["Start"])
 
     return lead_time
 
 
+@_memoize
 def cal_throughput(log, name, type, mode='m', start_time=0.0, finish_time=0.0, step=None, display=False, save=False, filepath=None):
     if mode == 'm':
-        log = log[(log[type] == name) & (log["Event"] == "part_transferred_to_Sink")]
-    else:
-        log = log[(log[type] == name) & ((log["Event"] == "part_transferred_to_next_process")
-                                         |(log["Event"] == "part_transferred_to_next_process_with_tp")
-                                         |(log["Event"] == "part_transferred_to_Sink"))]
-    if step:
-        iteration = step
+        event = [EventType.PART_TRANSFERRED_TO_SINK]
     else:
-        iteration = 1
-
-    time = np.linspace(start_time, finish_time, num=iteration)
-    throughput = np.array([0.0 for _ in range(iteration)])
+        event = [EventType.PART_TRANSFERRED, EventType.PART_TRANSFERRED_TO_SINK]
 
-    for i in range(iteration):
-        if step and (i == iteration - 1):
-            break
-        if step:
-            finish_time = time[i + 1]
+    log = _as_event_log(log)
+    transferred = np.sort(log.select(**{type: name, "Event": event})["Time"].values)
 
-        total_time = finish_time - start_time
-        part_transferred = log[(log["Time"] >= start_time) & (log["Time"] <= finish_time)]
-        throughput[i] = len(part_transferred) / total_time if total_time != 0.0 else 0.0
+    time, window_ends = _window_ends(start_time, finish_time, step)
+    num_transferred = np.searchsorted(transferred, window_ends, side="right") \
+                      - np.searchsorted(transferred, start_time, side="left")
+    total_time = window_ends - start_time
+    throughput = np.divide(num_transferred, total_time, out=np.zeros_like(total_time), where=total_time != 0.0)
 
     if step:
-        throughput = pd.DataFrame({"Time": time[1:], "Throughput": throughput[:-1]})
+        throughput = pd.DataFrame({"Time": time[1:], "Throughput": throughput})
         if display or save:
             title = "throughput of {0} in ({1:.2f}, {2:.2f})".format(name, start_time, finish_time)
             graph(throughput["Time"], throughput["Throughput"], title=title, display=display, save=save, filepath=filepath)
@@ -166,137 +224,276 @@ def cal_throughput(log, name, type, mode='m', start_time=0.0, finish_time=0.0, s
         return throughput[0]
 
 
+@_memoize
 def cal_wip(log, mode="entire", process_name=None, start_time=None, finish_time=None):
+    log = _as_event_log(log)
     if start_time is None:
-        start_time = log["Time"].min()
+        start_time = log.data["Time"].min()
     if finish_time is None:
-        finish_time = log["Time"].max()
-    log = log[(log["Time"] >= start_time) & (log["Time"] <= finish_time)]
+        finish_time = log.data["Time"].max()
     if mode == "entire":
-        event_log = log[(log['Event'] == "part_created") | (log['Event'] == "completed")]
+        data = log.select(Event=[EventType.PART_CREATED, EventType.PART_COMPLETED])
+        pairs = _pair_events(data, [EventType.PART_CREATED], [EventType.PART_COMPLETED], keys=["Part"])
     else:
-        event_log = log[(log['Event'] == "Process_entered") | (log["Event"] == "work_start")]
-        event_log = event_log[event_log["Process"] == process_name]
-
-    part_list = list(np.unique(list(event_log["Part"])))
-    event_grp = event_log.groupby(event_log["Part"])
+        data = log.select(Process=process_name, Event=[EventType.PROCESS_ENTERED, EventType.WORK_START])
+        pairs = _pair_events(data, [EventType.PROCESS_ENTERED], [EventType.WORK_START], keys=["Part"])
 
-    hanging_time = 0
-    for part in part_list:
-        each_part = event_grp.get_group(part)
-        time_list = list(each_part["Time"])
-        if len(time_list) == 2:  # Start ~ Finish 사이에 입고부터 출고까지 이루어진 경우
-            hanging_time += time_list[1] - time_list[0]
-        elif len(time_list) == 1:  # Start ~ Finish 사이에 입고만 된 경우 -> 아직 출고 전
-            hanging_time += finish_time - time_list[0]
+    # Start ~ Finish 사이에 머무른 시간 (아직 출고 전인 경우 finish_time까지)
+    hanging_time = np.sum(_overlap(pairs["Start"].values.astype(float), pairs["Finish"].values.astype(float),
+                                   start_time, finish_time))
 
     wip = hanging_time / (finish_time - start_time)
 
     return wip
 
-    # event = {"m": ("part_created", "completed"),
-    #          "p": ("Process_entered", "part_transferred_to_next_process", "part_transferred_to_next_process_with_tp", "part_transferred_to_Sink"),
-    #          "q": ("Process_entered", "work_start")}
-    #
-    # if not mode == "m":
-    #     log = log[log[type] == name]
-    # if mode == "p":
-    #     log = log[(log["Event"] == event[mode][0]) | (log["Event"] == event[mode][1])
-    #               | (log["Event"] == event[mode][2]) | (log["Event"] == event[mode][3])]
-    # else:
-    #     log = log[(log["Event"] == event[mode][0]) | (log["Event"] == event[mode][1])]
-    #
-    # if step:
-    #     iteration = step
-    # else:
-    #     iteration = 1
-    #
-    # time = np.linspace(start_time, finish_time, num=iteration)
-    # wip = np.array([0.0 for _ in range(iteration)])
-    # duration = np.array([0.0 for _ in range(iteration)])
-    #
-    # for i in range(iteration):
-    #     if step and (i == iteration - 1):
-    #         break
-    #     if step:
-    #         finish_time = time[i + 1]
-    #     data = log[(log["Time"] >= start_time) & (log["Time"] <= finish_time)]
-    #
-    #     total_time = finish_time - start_time
-    #     data_by_group = data.groupby(data["Process"])
-    #     for j, group in data_by_group:
-    #         wip_start = group[group["Event"] == event[mode][0]]
-    #         if not mode == "p":
-    #             wip_finish = group[group["Event"] == event[mode][1]]
-    #         else:
-    #             wip_finish = group[(group["Event"] == event[mode][1]) | (group["Event"] == event[mode][2]) | (group["Event"] == event[mode][3])]
-    #         if len(wip_start) == 0 and len(wip_finish) == 0:
-    #             temp = log[log["Process"] == j]
-    #             if len(temp) != 0:
-    #                 idx = temp["Time"] >= start_time
-    #                 if temp[idx].iloc[0]["Event"] == event[mode][1]:
-    #                     duration += (finish_time - start_time)
-    #             continue
-    #         elif len(wip_start) != 0 and len(wip_finish) == 0:
-    #             row = dict(wip_start.iloc[0])
-    #             row["Time"] = finish_time
-    #             row["Event"] = event[mode][1]
-    #             wip_finish = pd.DataFrame([row])
-    #         elif len(wip_start) == 0 and len(wip_finish) != 0:
-    #             row = dict(wip_finish.iloc[0])
-    #             row["Time"] = start_time
-    #             row["Event"] = event[mode][0]
-    #             wip_start = pd.DataFrame([row])
-    #         else:
-    #             if wip_start.iloc[0]["Part"] != wip_finish.iloc[0]["Part"]:
-    #                 row = dict(wip_finish.iloc[0])
-    #                 row["Time"] = start_time
-    #                 row["Event"] = event[mode][0]
-    #                 wip_start = pd.DataFrame([row]).append(wip_start)
-    #             if wip_start.iloc[-1]["Part"] != wip_finish.iloc[-1]["Part"]:
-    #                 row = dict(wip_start.iloc[-1])
-    #                 row["Time"] = finish_time
-    #                 row["Event"] = event[mode][1]
-    #                 wip_finish = wip_finish.append(pd.DataFrame([row]))
-    #
-    #         wip_start = wip_start["Time"].reset_index(drop=True)
-    #         wip_finish = wip_finish["Time"].reset_index(drop=True)
-    #         duration[i] += np.sum(wip_finish - wip_start)
-    #
-    #     wip[i] = duration[i] / total_time if total_time != 0.0 else 0.0
-    #
-    # if step:
-    #     wip = pd.DataFrame({"Time": time[1:], "WIP": wip[:-1]})
-    #     if display or save:
-    #         title = "WIP of {0} in ({1:.2f}, {2:.2f})".format(name, start_time, finish_time)
-    #         graph(wip["Time"], wip["WIP"], title=title, display=display, save=save, filepath=filepath)
-    #     return wip
-    # else:
-    #     return wip[0]
-
-
-def gantt(data, process_list):
-    list_part = list(data["Part"][data["Event"] == "part_created"])
-    start = datetime.date(2020,8,31)
-    r = lambda: random.randint(0, 255)
-    dataframe = []
-    # print('#%02X%02X%02X' % (r(),r(),r()))
-    colors = ['#%02X%02X%02X' % (r(), r(), r())]
-
-    for part in list_part:
-        part_data = data[data["Part"] == part]
-        #data_by_group = part_data.groupby(part_data["Process"])
-        for i in process_list:
-            group = part_data[part_data["Process"] == i]
-            if (i != "Sink") and (i != "Source") and len(group) != 0:
-                work_start = group[group["Event"] == "work_start"]
-                work_start = list(work_start["Time"].reset_index(drop=True))
-                work_finish = group[group["Event"] == "work_finish"]
-                work_finish = list(work_finish["Time"].reset_index(drop=True))
-                dataframe.append(dict(Task=i, Start=(start + datetime.timedelta(days=work_start[0])).isoformat(),Finish=(start + datetime.timedelta(days=work_finish[0])).isoformat(), Resource=part))
-                colors.append('#%02X%02X%02X' % (r(), r(), r()))
-            else:
-                pass
-
-    fig = ff.create_gantt(dataframe, colors=colors, index_col='Resource', group_tasks=True)
-    fig.show()
\ No newline at end of file
+
+def _process_metrics(log, process, num, start_time, finish_time):
+    # cal_process_metrics 결과 전체가 cache되므로 개별 함수는 cache를 거치지 않음
+    u, idle, working_time = cal_utilization.__wrapped__(log, process, "Process", num=num, start_time=start_time, finish_time=finish_time)
+    return {"Process": process, "Start": start_time, "Finish": finish_time,
+            "Utilization": u, "Idle_time": idle, "Working_time": working_time,
+            "Leadtime": cal_leadtime.__wrapped__(log, process, "Process", mode="p", start_time=start_time, finish_time=finish_time),
+            "Throughput": cal_throughput.__wrapped__(log, process, "Process", mode="p", start_time=start_time, finish_time=finish_time),
+            "WIP": cal_wip.__wrapped__(log, mode="p", process_name=process, start_time=start_time, finish_time=finish_time)}
+
+
+def _process_metrics_worker(dirpath, process, lo, hi, num, windows):
+    # 공유된 memory-mapped 배열에서 해당 process의 row만 읽어 계산
+    arrays = {key: np.load(os.path.join(dirpath, key + ".npy"), mmap_mode="r") for key in ("Time", "Event", "Part", "order")}
+    rows = np.asarray(arrays["order"][lo:hi])
+    log = pd.DataFrame({"Time": arrays["Time"][rows], "Event": arrays["Event"][rows], "Part": arrays["Part"][rows]})
+    log["Process"] = process
+    return [_process_metrics(log, process, num, start_time, finish_time) for start_time, finish_time in windows]
+
+
+@_memoize
+def cal_process_metrics(log, process_list, server_num=None, start_time=0.0, finish_time=None, step=None, n_jobs=None):
+    """Utilization, lead time, throughput and WIP of every process in ``process_list``.
+
+    With ``n_jobs`` other than 1 the log is partitioned by process and the partitions are
+    evaluated in a process pool. The time, event and part columns are written once to
+    memory-mapped .npy files that all workers read, so no DataFrame is pickled to the
+    workers. With ``step`` every process is additionally split into time windows like
+    the ``step`` option of ``cal_utilization``.
+    """
+    log = _as_event_log(log)
+    if server_num is None:
+        server_num = [1 for _ in range(len(process_list))]
+    if finish_time is None:
+        finish_time = log.data["Time"].max()
+    if step:
+        time = np.linspace(start_time, finish_time, num=step)
+        windows = [(start_time, end) for end in time[1:]]
+    else:
+        windows = [(start_time, finish_time)]
+
+    if n_jobs == 1:
+        rows = [_process_metrics(log, process, server_num[i], start, finish)
+                for i, process in enumerate(process_list) for start, finish in windows]
+        return pd.DataFrame(rows)
+
+    lookup, order, bounds = log._get_index("Process")
+    tasks = []
+    for i, process in enumerate(process_list):
+        g = lookup.get(process)
+        lo, hi = (bounds[g], bounds[g + 1]) if g is not None else (0, 0)
+        # (process, time window) 단위로 작업 분할
+        for window in windows:
+            tasks.append((process, lo, hi, server_num[i], [window]))
+
+    rows = []
+    with tempfile.TemporaryDirectory() as dirpath:
+        np.save(os.path.join(dirpath, "Time.npy"), log.data["Time"].values.astype(float))
+        np.save(os.path.join(dirpath, "Event.npy"), log.data["Event"].values)
+        np.save(os.path.join(dirpath, "Part.npy"), pd.factorize(log.data["Part"])[0])
+        np.save(os.path.join(dirpath, "order.npy"), order)
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [executor.submit(_process_metrics_worker, dirpath, *task) for task in tasks]
+            for future in futures:
+                rows += future.result()
+
+    return pd.DataFrame(rows)
+
+
+# 색상은 part type 이름의 hash로 고정 (실행마다 동일한 색상)
+GANTT_COLORS = ["#636EFA", "#EF553B", "#00CC96", "#AB63FA", "#FFA15A", "#19D3F3", "#FF6692", "#B6E880",
+                "#FF97FF", "#FECB52", "#1F77B4", "#8C564B", "#7F7F7F", "#BCBD22", "#17BECF"]
+
+
+def _color(key):
+    return GANTT_COLORS[zlib.crc32(str(key).encode("utf-8")) % len(GANTT_COLORS)]
+
+
+def _occupancy(intervals, process_list, edges):
+    # 각 process에서 bin별 평균 작업 중인 part 수 (= 점유 machine 수)
+    occupancy = np.zeros((len(process_list), len(edges) - 1))
+    for i, process in enumerate(process_list):
+        group = intervals[intervals["Process"].values == process]
+        if len(group) == 0:
+            continue
+        times = np.concatenate([group["Start"].values, group["Finish"].values])
+        change = np.concatenate([np.ones(len(group)), -np.ones(len(group))])
+        order = np.argsort(times, kind="stable")
+        times, count = times[order], np.cumsum(change[order])
+        # 점유 수의 누적 적분은 event 사이에서 선형 -> bin 경계에서 보간
+        integral = np.concatenate([[0.0], np.cumsum(count[:-1] * np.diff(times))])
+        occupancy[i] = np.diff(np.interp(edges, times, integral)) / np.diff(edges)
+    return occupancy
+
+
+def gantt(data, process_list, mode="part", bins=500, max_bars=5000, part_type=None, filepath=None, display=True):
+    """Gantt chart of the work intervals in an event log.
+
+    mode="part" draws one bar per (part, process) work interval, colored by part type;
+    mode="occupancy" draws the time-binned number of busy machines per process, which
+    stays readable for tens of thousands of parts. Part mode falls back to occupancy when
+    there are more than ``max_bars`` intervals. ``part_type`` maps a part id to its type
+    (default: the Source that created the part). A ``filepath`` ending with ".html" is
+    written as self-contained HTML, any other extension as a static image.
+    """
+    log = _as_event_log(data)
+    process_list = [process for process in process_list if process not in ("Source", "Sink")]
+
+    # 모든 작업 구간을 한 번에 추출
+    intervals = _work_intervals(log.select(Process=process_list, Event=[EventType.WORK_START, EventType.WORK_FINISH]))
+    intervals = intervals.assign(Finish=intervals["Finish"].fillna(log.data["Time"].max()))
+
+    if mode == "part" and len(intervals) > max_bars:
+        print("{0} work intervals exceed max_bars={1}, drawing occupancy instead".format(len(intervals), max_bars))
+        mode = "occupancy"
+
+    if mode == "part":
+        if part_type is None:
+            created = log.select(Event=EventType.PART_CREATED)
+            part_type = dict(zip(created["Part"], created["Process"]))
+        intervals = intervals.assign(Type=intervals["Part"].map(part_type).fillna("").astype(str).values)
+    elif mode == "occupancy":
+        edges = np.linspace(intervals["Start"].min(), intervals["Finish"].max(), num=bins + 1)
+        occupancy = _occupancy(intervals, process_list, edges)
+    else:
+        raise TypeError("Mode {0} is not supported.".format(mode))
+
+    if (filepath is not None and filepath.endswith(".html")) or (filepath is None and display):
+        fig = go.Figure()
+        if mode == "part":
+            for key, group in intervals.groupby("Type", sort=True):
+                fig.add_trace(go.Bar(base=group["Start"], x=group["Finish"] - group["Start"], y=group["Process"],
+                                     orientation="h", name=key, marker_color=_color(key), customdata=group["Part"],
+                                     hovertemplate="%{customdata}<br>%{base} ~ %{x}<extra>%{y}</extra>"))
+            fig.update_layout(barmode="overlay")
+        else:
+            fig.add_trace(go.Heatmap(z=occupancy, x=(edges[:-1] + edges[1:]) / 2, y=process_list,
+                                     colorbar=dict(title="busy machines")))
+        fig.update_layout(title="gantt chart", xaxis_title="time", yaxis=dict(categoryorder="array", categoryarray=process_list[::-1]))
+        if filepath is not None:
+            fig.write_html(filepath, include_plotlyjs=True)
+        if display:
+            fig.show()
+    else:
+        fig, ax = plt.subplots(figsize=(12, max(3, 0.4 * len(process_list))))
+        if mode == "part":
+            lane = {process: i for i, process in enumerate(process_list)}
+            for (key, process), group in intervals.groupby(["Type", "Process"], sort=True):
+                ax.broken_barh(np.column_stack([group["Start"], group["Finish"] - group["Start"]]),
+                               (lane[process] - 0.4, 0.8), facecolors=_color(key), label=key)
+            handles, labels = ax.get_legend_handles_labels()
+            unique = dict(zip(labels, handles))
+            ax.legend(unique.values(), unique.keys(), loc="upper right")
+            ax.set_yticks(range(len(process_list)))
+            ax.set_yticklabels(process_list)
+            ax.invert_yaxis()
+        else:
+            image = ax.pcolormesh(edges, np.arange(len(process_list) + 1) - 0.5, occupancy, shading="flat")
+            fig.colorbar(image, ax=ax, label="busy machines")
+            ax.set_yticks(range(len(process_list)))
+            ax.set_yticklabels(process_list)
+            ax.invert_yaxis()
+        ax.set_title("gantt chart")
+        ax.set_xlabel("time")
+        fig.tight_layout()
+        if filepath is not None:
+            fig.savefig(filepath)
+        if display:
+            plt.show()
+        plt.close(fig)
+
+    return intervals if mode == "part" else pd.DataFrame(occupancy.T, index=edges[1:], columns=process_list)
+
+
+def plan_deviation(log, plan, process_list=None, tolerance=0.0, top=20, filepath=None, display=False):
+    """Deviation of the simulated work intervals from a plan, per (part, process) activity.
+
+    ``plan`` has one row per planned activity with the columns Part, Process, Start and
+    optionally Finish (planned times on the simulation clock). The k-th planned visit of a
+    part to a process is aligned with its k-th simulated work interval in one merge, so the
+    whole comparison is a few sorts and group-bys. Delay is the simulated minus the planned
+    start; in the order of the plan, Inherited is the delay the part already had at its
+    previous activity and Added = Delay - Inherited is the delay introduced by the process.
+
+    Returns the activity table, the per-process summary (delay distribution, share of
+    activities later than ``tolerance``, mean added / inherited delay) and the ``top``
+    critical parts by the delay of their last activity. The delay histogram and the
+    added / inherited delay per process are drawn when ``filepath`` or ``display`` is given.
+    """
+    log = _as_event_log(log)
+    plan = plan.rename(columns={"Start": "Planned_start", "Finish": "Planned_finish"})
+    if process_list is None:
+        process_list = list(pd.unique(plan["Process"]))
+    plan = plan[plan["Process"].isin(process_list)]
+
+    intervals = _work_intervals(log.select(Process=process_list, Event=[EventType.WORK_START, EventType.WORK_FINISH]))
+    keys = ["Part", "Process"]
+    plan = plan.assign(_k=plan.groupby(keys, sort=False).cumcount().values)
+    intervals = intervals.assign(_k=intervals.groupby(keys, sort=False).cumcount().values)
+    table = pd.merge(plan, intervals, on=keys + ["_k"], how="left").drop(columns="_k")
+
+    # 계획 순서대로 정렬해 같은 part의 직전 activity 지연을 상속 지연으로 사용
+    part_code = pd.factorize(table["Part"])[0]
+    order = np.lexsort((table["Planned_start"].values, part_code))
+    table = table.iloc[order].reset_index(drop=True)
+    part_code = part_code[order]
+    delay = table["Start"].values - table["Planned_start"].values
+    first = np.concatenate([[True], part_code[1:] != part_code[:-1]]) if len(table) > 0 else np.zeros(0, dtype=bool)
+    inherited = np.where(first, 0.0, np.roll(delay, 1))
+    table["Delay"] = delay
+    table["Inherited"] = inherited
+    table["Added"] = delay - inherited
+    if "Planned_finish" in table.columns:
+        table["Finish_delay"] = table["Finish"].values - table["Planned_finish"].values
+
+    grouped = table.groupby("Process", sort=False)
+    summary = grouped["Delay"].describe(percentiles=[0.5, 0.9, 0.95])
+    summary["late_ratio"] = (table["Delay"] > tolerance).groupby(table["Process"], sort=False).mean()
+    summary["added_mean"] = grouped["Added"].mean()
+    summary["inherited_mean"] = grouped["Inherited"].mean()
+    summary = summary.reindex([process for process in process_list if process in summary.index])
+
+    last = np.concatenate([part_code[1:] != part_code[:-1], [True]]) if len(table) > 0 else np.zeros(0, dtype=bool)
+    critical = table.loc[last, ["Part", "Process", "Delay"]].rename(columns={"Process": "Last_process"})
+    critical["Max_added"] = table.groupby(part_code)["Added"].max().values
+    critical = critical.sort_values("Delay", ascending=False, kind="stable").head(top).reset_index(drop=True)
+
+    if filepath is not None or display:
+        fig, axes = plt.subplots(1, 2, figsize=(12, 4))
+        valid = table[np.isfinite(table["Delay"].values)]
+        bins = np.histogram_bin_edges(valid["Delay"].values, bins=50) if len(valid) > 0 else 10
+        for process in summary.index:
+            axes[0].hist(valid["Delay"].values[valid["Process"].values == process], bins=bins, histtype="step", label=process)
+        axes[0].set_title("start delay distribution")
+        axes[0].set_xlabel("delay")
+        axes[0].legend(loc="upper right")
+        position = np.arange(len(summary))
+        axes[1].bar(position - 0.2, summary["inherited_mean"], width=0.4, label="inherited")
+        axes[1].bar(position + 0.2, summary["added_mean"], width=0.4, label="added")
+        axes[1].set_xticks(position)
+        axes[1].set_xticklabels(summary.index)
+        axes[1].set_title("delay propagation")
+        axes[1].legend(loc="upper right")
+        fig.tight_layout()
+        if filepath is not None:
+            fig.savefig(filepath)
+        if display:
+            plt.show()
+        plt.close(fig)
+
+    return table, summary, critical
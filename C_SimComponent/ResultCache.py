@@ -0,0 +1,103 @@
+import os
+import pickle
+import hashlib
+import functools
+import pandas as pd
+
+
+#region ResultCache
+class ResultCache(object):
+    """On-disk memoization of analysis results.
+
+    Entries are keyed by a content hash of the event log (file, DataFrame or EventLog)
+    plus the function name and its arguments, so a changed log never hits an old entry.
+    When the total size of the cache directory exceeds ``max_size`` bytes, the least
+    recently used entries are deleted.
+    """
+    def __init__(self, cache_dir='../result/cache', max_size=512 * 1024 ** 2):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+        # (path, size, mtime) -> 파일 내용의 hash (변경되지 않은 파일은 다시 읽지 않음)
+        self._file_digest = dict()
+
+    def fingerprint(self, log):
+        if isinstance(log, str):
+            stat = os.stat(log)
+            key = (os.path.abspath(log), stat.st_size, stat.st_mtime_ns)
+            if key not in self._file_digest:
+                digest = hashlib.sha1()
+                with open(log, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1024 ** 2), b''):
+                        digest.update(chunk)
+                self._file_digest[key] = digest.hexdigest()
+            return self._file_digest[key]
+        if hasattr(log, 'data'):  # EventLog: hash를 객체에 저장해 재사용
+            if getattr(log, '_fingerprint', None) is None:
+                log._fingerprint = self.fingerprint(log.data)
+            return log._fingerprint
+        if isinstance(log, pd.DataFrame):
+            digest = hashlib.sha1(pd.util.hash_pandas_object(log, index=False).values.tobytes())
+            digest.update(','.join(map(str, log.columns)).encode('utf-8'))
+            return digest.hexdigest()
+        raise TypeError("Cannot fingerprint log of type {0}".format(type(log).__name__))
+
+    def key(self, func, log, args, kwargs):
+        digest = hashlib.sha1()
+        digest.update('{0}.{1}'.format(func.__module__, func.__qualname__).encode('utf-8'))
+        digest.update(self.fingerprint(log).encode('utf-8'))
+        digest.update(pickle.dumps((args, sorted(kwargs.items())), protocol=4))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + '.pkl')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None, False
+        os.utime(path)  # LRU 순서 갱신
+        return result, True
+
+    def put(self, key, result):
+        path = self._path(key)
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.pkl'):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(entry[1] for entry in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_size:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.pkl'):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def __call__(self, func):
+        # 첫 번째 인자가 event log인 함수를 감싸는 decorator
+        @functools.wraps(func)
+        def wrapper(log, *args, **kwargs):
+            key = self.key(func, log, args, kwargs)
+            result, hit = self.get(key)
+            if not hit:
+                result = func(log, *args, **kwargs)
+                self.put(key, result)
+            return result
+        return wrapper
+#endregion
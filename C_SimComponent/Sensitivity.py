@@ -0,0 +1,122 @@
+import os
+import numpy as np
+import pandas as pd
+from itertools import repeat
+from scipy.stats import qmc
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from .Experiment import _run_point
+except ImportError:
+    from Experiment import _run_point
+
+
+#region Evaluation
+def _evaluate(run, names, X, kpi, n_jobs=None):
+    # design의 각 행을 run(**point)로 평가 - process pool에 chunk 단위로 나누어 전달
+    points = [dict(zip(names, map(float, x))) for x in X]
+    if n_jobs == 1:
+        rows = [_run_point(run, point) for point in points]
+    else:
+        workers = n_jobs or os.cpu_count()
+        chunksize = max(1, len(points) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            rows = list(executor.map(_run_point, repeat(run), points, chunksize=chunksize))
+    return np.array([row[kpi] for row in rows], dtype=float)
+
+
+def _scale(U, bounds):
+    lower = np.array([bound[0] for bound in bounds.values()], dtype=float)
+    upper = np.array([bound[1] for bound in bounds.values()], dtype=float)
+    return qmc.scale(U, lower, upper) if len(U) > 0 else U
+
+
+def _bootstrap(statistic, n, num_bootstrap, confidence, rng):
+    # 행(sample) 단위 resampling으로 statistic의 percentile 신뢰구간
+    estimates = np.array([statistic(rng.integers(0, n, n)) for _ in range(num_bootstrap)])
+    alpha = (1 - confidence) / 2
+    return np.quantile(estimates, alpha, axis=0), np.quantile(estimates, 1 - alpha, axis=0)
+#endregion
+
+
+#region Sobol
+def sobol_indices(run, bounds, kpi, n=256, num_bootstrap=500, confidence=0.95, seed=None, n_jobs=None):
+    """First-order (S1) and total (ST) Sobol indices of ``kpi`` with bootstrap intervals.
+
+    ``bounds`` maps each parameter of ``run(**point)`` to its (lower, upper) range. The
+    design is the Saltelli scheme on a scrambled Sobol sequence: matrices A and B of ``n``
+    points (rounded up to a power of two) plus one matrix per parameter with that column
+    taken from B, i.e. n * (d + 2) runs. S1 uses the Saltelli (2010) estimator and ST the
+    Jansen estimator.
+    """
+    names = list(bounds.keys())
+    d = len(names)
+    sampler = qmc.Sobol(2 * d, scramble=True, seed=seed)
+    U = sampler.random_base2(int(np.ceil(np.log2(n))))
+    n = len(U)
+    A, B = _scale(U[:, :d], bounds), _scale(U[:, d:], bounds)
+    AB = np.tile(A, (d, 1))
+    for i in range(d):
+        AB[i * n:(i + 1) * n, i] = B[:, i]
+
+    y = _evaluate(run, names, np.vstack([A, B, AB]), kpi, n_jobs=n_jobs)
+    y_A, y_B, y_AB = y[:n], y[n:2 * n], y[2 * n:].reshape(d, n)
+
+    def indices(rows):
+        variance = np.var(np.concatenate([y_A[rows], y_B[rows]]))
+        if variance == 0:
+            return np.zeros(2 * d)
+        first = np.mean(y_B[rows] * (y_AB[:, rows] - y_A[rows]), axis=1) / variance
+        total = 0.5 * np.mean((y_A[rows] - y_AB[:, rows]) ** 2, axis=1) / variance
+        return np.concatenate([first, total])
+
+    estimate = indices(np.arange(n))
+    lower, upper = _bootstrap(indices, n, num_bootstrap, confidence, np.random.default_rng(seed))
+    return pd.DataFrame({"S1": estimate[:d], "S1_lower": lower[:d], "S1_upper": upper[:d],
+                         "ST": estimate[d:], "ST_lower": lower[d:], "ST_upper": upper[d:]}, index=names)
+#endregion
+
+
+#region Morris
+def morris_screening(run, bounds, kpi, num_trajectories=20, levels=4, num_bootstrap=500, confidence=0.95,
+                     seed=None, n_jobs=None):
+    """Morris elementary effects of ``kpi``: mu, mu_star (with bootstrap interval) and sigma.
+
+    Each trajectory starts at a random point of a ``levels``-level grid and moves one
+    parameter at a time by delta = levels / (2 (levels - 1)) of its range, so the screening
+    needs num_trajectories * (d + 1) runs. Effects are expressed per unit of the scaled
+    range, which makes them comparable between parameters.
+    """
+    names = list(bounds.keys())
+    d = len(names)
+    rng = np.random.default_rng(seed)
+    delta = levels / (2 * (levels - 1))
+
+    trajectories, steps = [], []
+    for _ in range(num_trajectories):
+        x = rng.integers(0, levels // 2, d) / (levels - 1)  # x + delta가 [0, 1] 안에 들도록
+        sign = np.where(rng.random(d) < 0.5, 1.0, -1.0)
+        x = np.where(sign > 0, x, x + delta)
+        order = rng.permutation(d)
+        points = [x.copy()]
+        for i in order:
+            x[i] += sign[i] * delta
+            points.append(x.copy())
+        trajectories.append(points)
+        steps.append((order, sign[order] * delta))
+
+    U = np.array(trajectories).reshape(-1, d)
+    y = _evaluate(run, names, _scale(U, bounds), kpi, n_jobs=n_jobs).reshape(num_trajectories, d + 1)
+
+    effects = np.empty((num_trajectories, d))
+    for t, (order, step) in enumerate(steps):
+        effects[t, order] = np.diff(y[t]) / step
+
+    def mu_star(rows):
+        return np.abs(effects[rows]).mean(axis=0)
+
+    lower, upper = _bootstrap(mu_star, num_trajectories, num_bootstrap, confidence, rng)
+    return pd.DataFrame({"mu": effects.mean(axis=0), "mu_star": mu_star(np.arange(num_trajectories)),
+                         "mu_star_lower": lower, "mu_star_upper": upper,
+                         "sigma": effects.std(axis=0, ddof=1)}, index=names)
+#endregion
@@ -1,31 +1,70 @@
-import simpy, os, random
+import simpy, os, zlib, bisect
 import pandas as pd
 import numpy as np
-from collections import OrderedDict
+from collections import deque
+
+try:
+    from .EventSchema import EventType, EVENT_DTYPE
+except ImportError:
+    from EventSchema import EventType, EVENT_DTYPE
 
 save_path = '../result'
 if not os.path.exists(save_path):
    os.makedirs(save_path)
 
+#region RandomStreams
+class RandomStreams(object):
+    """Independent ``numpy.random.Generator`` per model component, derived from one master seed.
+
+    A stream is keyed by the component name, not by creation order, so the same component
+    draws the same numbers in every scenario built from the same seed (common random
+    numbers), and adding a component does not shift the streams of the others. ``seed``
+    may be an int or a ``SeedSequence`` such as the one passed by Experiment.run_replications.
+    """
+    def __init__(self, seed=None):
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_seq = seed
+        else:
+            self.seed_seq = np.random.SeedSequence(seed)
+        self.streams = dict()
+
+    def stream(self, name):
+        if name not in self.streams:
+            seed_seq = np.random.SeedSequence(self.seed_seq.entropy,
+                                              spawn_key=self.seed_seq.spawn_key + (zlib.crc32(name.encode('utf-8')),))
+            self.streams[name] = np.random.Generator(np.random.PCG64(seed_seq))
+        return self.streams[name]
+
+
+# 'exponential(50)'과 같은 분포 문자열로부터 난수 생성 (rng가 없으면 전역 np.random 사용)
+def sample(distribution, rng=None):
+    rng = np.random if rng is None else rng
+    return eval('rng.' + distribution)
+#endregion
+
+
 #region Operation
 class Operation(object):
-    def __init__(self, name, service_time, proc_list):
+    def __init__(self, name, service_time, proc_list, rng=None):
         # 해당 operation의 이름
         self.id = name
         # 해당 operation의 시간
         self.service_time = service_time
         # 해당 operation이 가능한 process의 list
         self.proc_list = proc_list
+        # 호출하는 쪽에서 rng를 넘기지 않을 때 사용하는 난수 stream
+        self.rng = rng
 
-    # Operation의 시간을 호출하기 위한 함수
-    def get_time(self, proc):
+    # Operation의 시간을 호출하기 위한 함수 (rng: 호출하는 Process/Routing의 난수 stream)
+    def get_time(self, proc, rng=None):
+        rng = self.rng if rng is None else rng
         if type(self.service_time) is dict:
             if type(self.service_time[proc]) is str:
-                return eval('np.random.'+ self.service_time[proc])
+                return sample(self.service_time[proc], rng)
             else:
                 return self.service_time[proc]
         elif type(self.service_time) is str:
-            return eval('np.random.' + self.service_time)
+            return sample(self.service_time, rng)
         else:
             return self.service_time
 #endregion
@@ -33,11 +72,13 @@ class Operation(object):
 
 #region Part
 class Part(object):
-    def __init__(self, name, requirements):
+    def __init__(self, name, requirements, weight=0.0):
         # 해당 Part의 이름
         self.id = name
         # 작업 정보, production requirements
         self.requirements = requirements
+        # Part의 무게 (transporter의 capa와 비교)
+        self.weight = weight
         # 작업을 완료한 공정의 수
         self.step = -1
         # Part의 현재 위치
@@ -46,7 +87,8 @@ class Part(object):
 
 #region Source
 class Source(object):
-    def __init__(self, env, name, model, monitor, data=None, jobtype=None, IAT='expon(1)', num_parts=float('inf')):
+    def __init__(self, env, name, model, monitor, data=None, jobtype=None, IAT='expon(1)', num_parts=float('inf'),
+                 rng=None):
         self.env = env
         self.name = name # 해당 Source의 이름
         self.model = model
@@ -55,6 +97,7 @@ class Source(object):
         self.jobtype = jobtype # Source가 생산하는 Part의 jobtype(입력값 없을 시 data를 통한 Part 생성)
         self.IAT = IAT # Source가 생성하는 Part의 IAT(jobtype을 통한 Part 생성)
         self.num_parts = num_parts # Source가 생성하는 Part의 갯수(jobtype을 통한 Part 생성)
+        self.rng = rng # IAT 생성에 사용하는 난수 stream (None이면 전역 np.random)
 
         self.rec = 0 # 생성된 Part의 갯수를 기록하는 변수
         self.action = env.process(self.run())
@@ -72,11 +115,11 @@ class Source(object):
 
                 # record: part_created
                 part.loc = self.name
-                self.monitor.record(self.env.now, self.name, None, part_id=part.id, event="Part Created")
+                self.monitor.record(self.env.now, self.name, None, part_id=part.id, event=EventType.PART_CREATED)
 
                 # Routing Start
                 self.model['Routing'].queue.put(part)  # Routing class로 put
-                self.monitor.record(self.env.now, self.name, None, part_id=part.id, event="Routing Start")
+                self.monitor.record(self.env.now, self.name, None, part_id=part.id, event=EventType.ROUTING_START)
 
                 if len(self.data) == 0:  # 모든 블록의 일이 끝나면 Source에서의 활동 종료
                     print("all parts are sent at : ", self.env.now)
@@ -88,23 +131,236 @@ class Source(object):
 
                 # record: part_created
                 part.loc = self.name
-                self.monitor.record(self.env.now, self.name, None, part_id=part.id, event="Part Created")
+                self.monitor.record(self.env.now, self.name, None, part_id=part.id, event=EventType.PART_CREATED)
 
                 # Routing start
                 self.model['Routing'].queue.put(part) # Routing class로 put
-                self.monitor.record(self.env.now, self.name, None, part_id=part.id, event="Routing Start")
+                self.monitor.record(self.env.now, self.name, None, part_id=part.id, event=EventType.ROUTING_START)
                 if type(self.IAT) is str:
-                    IAT = eval('np.random.' + self.IAT)
+                    IAT = sample(self.IAT, self.rng)
                 else:
                     IAT = self.IAT
                 yield self.env.timeout(IAT)
                 self.rec += 1
 #endregion
 
+#region Workforce
+class Workforce(object):
+    """Shared worker pools with skill levels.
+
+    ``wf_info`` maps a worker name to {"skill": s, "pool": name} (pool defaults to "default").
+    A Process requests a worker of its pool with a minimum skill, and the processing time
+    of the operation is divided by the skill of the assigned worker. The free workers of a
+    pool are kept in one free list per skill level plus a sorted list of the levels that
+    have a free worker, so an assignment is a binary search over the skill levels:
+    ``policy='lowest'`` assigns the least skilled qualified worker (keeps the experts for
+    demanding operations), ``'highest'`` the most skilled one. Requests that cannot be
+    served wait in FIFO order, queued per minimum skill, so a released worker is handed to
+    the oldest request it qualifies for by comparing only the heads of those queues. The busy
+    time of every worker is accumulated online.
+    """
+    def __init__(self, env, wf_info, policy='lowest'):
+        self.env = env
+        self.policy = policy
+        self.skill = {name: float(info.get("skill", 1.0)) for name, info in wf_info.items()}
+        self.pool = {name: info.get("pool", "default") for name, info in wf_info.items()}
+
+        self.free = dict()  # pool -> {skill: [worker, ...]}
+        self.levels = dict()  # pool -> 빈 worker가 있는 skill level (오름차순)
+        self.waiting = dict()  # pool -> {min_skill: deque([(순번, event), ...])}
+        self.thresholds = dict()  # pool -> 대기 중인 요청의 min_skill (오름차순)
+        self.seq = 0
+        self.busy_time = {name: 0.0 for name in wf_info}  # worker별 작업 시간
+        self.since = dict()  # 작업 중인 worker -> 할당 시각
+        for name in wf_info:
+            self._put(name)
+
+    def _put(self, worker):
+        pool, skill = self.pool[worker], self.skill[worker]
+        free = self.free.setdefault(pool, dict())
+        if not free.get(skill):
+            free[skill] = []
+            bisect.insort(self.levels.setdefault(pool, []), skill)
+        free[skill].append(worker)
+
+    def _take(self, pool, min_skill):
+        levels = self.levels.get(pool)
+        if not levels:
+            return None
+        k = len(levels) - 1 if self.policy == 'highest' else bisect.bisect_left(levels, min_skill)
+        if k == len(levels) or levels[k] < min_skill:
+            return None
+        workers = self.free[pool][levels[k]]
+        worker = workers.pop()
+        if not workers:
+            del levels[k]
+        self.since[worker] = self.env.now
+        return worker
+
+    def request(self, pool='default', min_skill=0.0):
+        # 할당된 worker 이름을 값으로 갖는 event
+        event = self.env.event()
+        worker = self._take(pool, min_skill)
+        if worker is not None:
+            event.succeed(worker)
+        else:
+            waiting = self.waiting.setdefault(pool, dict())
+            if min_skill not in waiting:
+                waiting[min_skill] = deque()
+                bisect.insort(self.thresholds.setdefault(pool, []), min_skill)
+            waiting[min_skill].append((self.seq, event))
+            self.seq += 1
+        return event
+
+    def release(self, worker):
+        self.busy_time[worker] += self.env.now - self.since.pop(worker)
+        pool = self.pool[worker]
+        thresholds = self.thresholds.get(pool)
+        if thresholds:
+            # worker가 자격을 갖는 min_skill 중 가장 오래 기다린 요청에 바로 할당
+            qualified = thresholds[:bisect.bisect_right(thresholds, self.skill[worker])]
+            if qualified:
+                waiting = self.waiting[pool]
+                min_skill = min(qualified, key=lambda level: waiting[level][0][0])
+                _, event = waiting[min_skill].popleft()
+                if not waiting[min_skill]:
+                    del waiting[min_skill]
+                    thresholds.remove(min_skill)
+                self.since[worker] = self.env.now
+                event.succeed(worker)
+                return
+        self._put(worker)
+
+    def utilization(self, now=None):
+        # worker별 가동률 (작업 중인 시간 포함)
+        now = self.env.now if now is None else now
+        busy = pd.Series(self.busy_time) + pd.Series({name: now - self.since.get(name, now) for name in self.busy_time})
+        return busy / now if now > 0 else busy * 0.0
+#endregion
+
+#region Transporter
+class Transporter(object):
+    def __init__(self, name, capa, v_loaded, v_unloaded, loc):
+        self.name = name
+        self.capa = capa
+        self.v_loaded = v_loaded # 적재 시 속도
+        self.v_unloaded = v_unloaded # 빈 차량 속도
+        self.loc = loc # 현재 위치 (distance matrix의 index)
+
+        self.busy_time = 0.0
+        self.empty_distance = 0.0
+        self.loaded_distance = 0.0
+
+
+class TransporterFleet(object):
+    """Transporters that move parts between Processes over a precomputed distance matrix.
+
+    ``network`` is a square DataFrame of distances between locations (process names); a
+    missing entry means the move is not possible. ``tp_info`` maps a transporter name to
+    {"capa", "v_loaded", "v_unloaded"} and optionally its initial "location". For every
+    location the other locations are sorted by distance once, and the idle transporters are
+    kept per location, so dispatching walks the neighbour list of the pickup location and
+    takes the first idle transporter whose capa fits the part: the nearest feasible one,
+    without any shortest-path computation per move. Requests that cannot be served wait in
+    FIFO order. Empty and loaded travel are recorded with the transporter as Machine, and
+    the busy time and travelled distances of every transporter are accumulated online.
+    """
+    def __init__(self, env, monitor, tp_info, network):
+        self.env = env
+        self.monitor = monitor
+
+        self.locations = list(network.index)
+        self.index = {name: i for i, name in enumerate(self.locations)}
+        distance = network.reindex(columns=network.index).to_numpy(dtype=float, copy=True)
+        distance[np.isnan(distance)] = np.inf
+        np.fill_diagonal(distance, 0.0)
+        self.distance = distance
+        # 각 위치까지 도달 가능한 위치를 거리 순으로 정렬 (위치 j -> i 의 거리 기준)
+        order = np.argsort(distance.T, axis=1, kind='stable')
+        self.neighbors = [[j for j in order[i] if np.isfinite(distance[j, i])] for i in range(len(order))]
+
+        self.transporters = dict()
+        self.idle = [[] for _ in self.locations]  # 위치별 대기 중인 transporter
+        for name, info in tp_info.items():
+            loc = self.index[info.get("location", self.locations[0])]
+            self.transporters[name] = Transporter(name, info.get("capa", float('inf')), info["v_loaded"],
+                                                  info["v_unloaded"], loc)
+            self.idle[loc].append(self.transporters[name])
+        self.waiting = deque()  # (상차 위치, 무게, event)
+        self.since = dict()
+
+    def _take(self, origin, weight):
+        for loc in self.neighbors[origin]:
+            for k, tp in enumerate(self.idle[loc]):
+                if tp.capa >= weight:
+                    del self.idle[loc][k]
+                    self.since[tp.name] = self.env.now
+                    return tp
+        return None
+
+    def _location(self, name):
+        if name not in self.index:
+            raise KeyError("location '{0}' is not in the transporter network".format(name))
+        return self.index[name]
+
+    def request(self, origin, weight=0.0):
+        # origin에서 가장 가까운 (capa를 만족하는) 대기 중 transporter를 값으로 갖는 event
+        event = self.env.event()
+        o = self._location(origin)
+        tp = self._take(o, weight)
+        if tp is not None:
+            event.succeed(tp)
+        else:
+            self.waiting.append((o, weight, event))
+        return event
+
+    def release(self, tp):
+        tp.busy_time += self.env.now - self.since.pop(tp.name)
+        for k, (origin, weight, event) in enumerate(self.waiting):
+            if tp.capa >= weight and np.isfinite(self.distance[tp.loc, origin]):
+                del self.waiting[k]
+                self.since[tp.name] = self.env.now
+                event.succeed(tp)
+                return
+        self.idle[tp.loc].append(tp)
+
+    def move(self, part, origin, destination):
+        # transporter를 잡기 전에 경로 확인 (도달할 수 없는 이동은 즉시 오류)
+        o, d = self._location(origin), self._location(destination)
+        if not np.isfinite(self.distance[o, d]):
+            raise ValueError("no route from '{0}' to '{1}' in the transporter network".format(origin, destination))
+        tp = yield self.request(origin, part.weight)
+
+        # 빈 차량으로 상차 위치까지 이동
+        if tp.loc != o:
+            self.monitor.record(self.env.now, self.locations[tp.loc], tp.name, part_id=part.id,
+                                event=EventType.EMPTY_TRAVEL_START)
+            yield self.env.timeout(self.distance[tp.loc, o] / tp.v_unloaded)
+            tp.empty_distance += self.distance[tp.loc, o]
+            self.monitor.record(self.env.now, origin, tp.name, part_id=part.id, event=EventType.EMPTY_TRAVEL_FINISH)
+
+        # 적재 후 다음 process까지 이동
+        self.monitor.record(self.env.now, origin, tp.name, part_id=part.id, event=EventType.LOADED_TRAVEL_START)
+        yield self.env.timeout(self.distance[o, d] / tp.v_loaded)
+        tp.loaded_distance += self.distance[o, d]
+        tp.loc = d
+        self.monitor.record(self.env.now, destination, tp.name, part_id=part.id, event=EventType.LOADED_TRAVEL_FINISH)
+        self.release(tp)
+
+    def utilization(self, now=None):
+        # transporter별 가동률과 빈 차량 / 적재 이동 거리
+        now = self.env.now if now is None else now
+        busy = np.array([tp.busy_time + now - self.since.get(tp.name, now) for tp in self.transporters.values()])
+        return pd.DataFrame({"utilization": busy / now if now > 0 else busy * 0.0,
+                             "empty_distance": [tp.empty_distance for tp in self.transporters.values()],
+                             "loaded_distance": [tp.loaded_distance for tp in self.transporters.values()]},
+                            index=list(self.transporters.keys()))
+#endregion
+
 #region Process
 class Process(object):
     def __init__(self, env, name, model, monitor, capacity=float('inf'), priority=1, in_buffer=float('inf'),
-                 out_buffer=float('inf')):
+                 out_buffer=float('inf'), rng=None, calendar=None, workforce=None, pool='default', min_skill=0.0):
         # input data
         self.env = env
         self.name = name # 해당 프로세스의 이름
@@ -112,6 +368,11 @@ class Process(object):
         self.monitor = monitor
         self.capa = capacity # 해당 프로세스의 동시 작업 한도
         self.priority = priority # 해당 프로세스의 우선 순위
+        self.rng = rng # 작업 시간 생성에 사용하는 난수 stream
+        self.calendar = calendar # WorkingCalendar: 주어지면 작업 시간을 근무 시간(hour)으로 해석
+        self.workforce = workforce # Workforce: 주어지면 작업마다 pool에서 min_skill 이상의 worker를 할당
+        self.pool = pool
+        self.min_skill = min_skill
 
         # variable defined in class
         self.parts_sent = 0
@@ -151,19 +412,32 @@ class Process(object):
         if len(self.in_part.put_queue) != 0:
             self.in_part.put_queue.pop(-1)
             self.in_part.put_queue.insert(0, put_None)
-        part = yield self.in_part.get(lambda x: x is not None)
+        part = yield self.in_part.get(lambda x: isinstance(x, Part))  # None(작업 중 자리)과 이동 중인 part의 예약 자리는 제외
         operation = part.requirements[part.step]
-        proc_time = operation.get_time(self.name)
+        proc_time = operation.get_time(self.name, self.rng)
+        worker = None
+        if self.workforce is not None:
+            worker = yield self.workforce.request(self.pool, self.min_skill)
+            proc_time = proc_time / self.workforce.skill[worker]
 
         # Process start and finish
-        self.monitor.record(self.env.now, self.name, None, part_id=part.id, event=operation.id+" Start")
+        self.monitor.record(self.env.now, self.name, worker, part_id=part.id, event=EventType.WORK_START,
+                            operation=operation.id)
+        # 가동 시간은 실제 작업한 시간 (calendar 사용 시 근무 시간을 simulation 시간 단위로 환산, 비근무 시간 제외)
+        work_time = proc_time
+        if self.calendar is not None:
+            work_time = proc_time / self.calendar.time_unit
+            proc_time = self.calendar.delay(self.env.now, proc_time)
         yield self.env.timeout(proc_time)
-        self.monitor.record(self.env.now, self.name, None, part_id=part.id, event=operation.id+" Finish")
-        self.util_time += proc_time
+        self.monitor.record(self.env.now, self.name, worker, part_id=part.id, event=EventType.WORK_FINISH,
+                            operation=operation.id)
+        self.util_time += work_time
+        if worker is not None:
+            self.workforce.release(worker)
 
         # Routing start
         self.model['Routing'].queue.put(part)
-        self.monitor.record(self.env.now, self.name, None, part_id=part.id, event="Routing Start")
+        self.monitor.record(self.env.now, self.name, None, part_id=part.id, event=EventType.ROUTING_START)
 
     # with out_buffer
     def work_with_outbuffer(self):
@@ -172,31 +446,46 @@ class Process(object):
         if len(self.in_part.put_queue) != 0:
             self.in_part.put_queue.pop(-1)
             self.in_part.put_queue.insert(0, put_None)
-        part = yield self.in_part.get(lambda x: x is not None)
+        part = yield self.in_part.get(lambda x: isinstance(x, Part))  # None(작업 중 자리)과 이동 중인 part의 예약 자리는 제외
         operation = part.requirements[part.step]
-        proc_time = operation.get_time(self.name)
+        proc_time = operation.get_time(self.name, self.rng)
+        worker = None
+        if self.workforce is not None:
+            worker = yield self.workforce.request(self.pool, self.min_skill)
+            proc_time = proc_time / self.workforce.skill[worker]
 
         # Process start and finish
-        self.monitor.record(self.env.now, self.name, None, part_id=part.id, event=operation.id+" Start")
+        self.monitor.record(self.env.now, self.name, worker, part_id=part.id, event=EventType.WORK_START,
+                            operation=operation.id)
+        # 가동 시간은 실제 작업한 시간 (calendar 사용 시 근무 시간을 simulation 시간 단위로 환산, 비근무 시간 제외)
+        work_time = proc_time
+        if self.calendar is not None:
+            work_time = proc_time / self.calendar.time_unit
+            proc_time = self.calendar.delay(self.env.now, proc_time)
         yield self.env.timeout(proc_time)
-        self.monitor.record(self.env.now, self.name, None, part_id=part.id, event=operation.id+" Finish")
-        self.util_time += proc_time
+        self.monitor.record(self.env.now, self.name, worker, part_id=part.id, event=EventType.WORK_FINISH,
+                            operation=operation.id)
+        self.util_time += work_time
+        if worker is not None:
+            self.workforce.release(worker)
 
         # Routing start
         yield self.out_part.put(part)
         yield self.model['Routing'].queue.put(part)
-        self.monitor.record(self.env.now, self.name, None, part_id=part.id, event="Routing Start")
+        self.monitor.record(self.env.now, self.name, None, part_id=part.id, event=EventType.ROUTING_START)
         yield self.in_part.get(lambda x: x is None)
         yield self.machines.get()
 #endregion
 
 #region Routing
 class Routing(object):
-    def __init__(self, env, name, model, monitor, mode='least_util'):
+    def __init__(self, env, name, model, monitor, mode='least_util', rng=None, transporter=None):
         self.env = env
         self.name = name
         self.model = model
         self.monitor = monitor
+        self.rng = rng # SPT/LPT 판단 시 작업 시간 추정에 사용하는 난수 stream
+        self.transporter = transporter # TransporterFleet: 주어지면 process 간 이동에 transporter 사용
 
         self.mode = mode
 
@@ -240,7 +529,7 @@ class Routing(object):
         # Select shortest processing time proc
         operation = part.requirements[part.step]
         proc_list = [self.model[proc] for proc in operation.proc_list]
-        PT_list = [operation.get_time(proc.name) for proc in proc_list]
+        PT_list = [operation.get_time(proc.name, self.rng) for proc in proc_list]
         idx = PT_list.index(min(PT_list))
         next_proc = proc_list[idx]
 
@@ -252,7 +541,7 @@ class Routing(object):
         # Select shortest processing time proc
         operation = part.requirements[part.step]
         proc_list = [self.model[proc] for proc in operation.proc_list]
-        PT_list = [operation.get_time(proc.name) for proc in proc_list]
+        PT_list = [operation.get_time(proc.name, self.rng) for proc in proc_list]
         idx = PT_list.index(max(PT_list))
         next_proc = proc_list[idx]
 
@@ -265,8 +554,11 @@ class Routing(object):
         if part.loc in self.model.keys():
             pre_proc = self.model[part.loc]
             # Part의 현재 process가 without out_buffer인 경우
-            if pre_proc.out_part is None:
-                self.monitor.record(self.env.now, next_proc.name, None, part_id=part.id, event="Routing Finish")
+            if self.transporter is not None:
+                self.monitor.record(self.env.now, next_proc.name, None, part_id=part.id, event=EventType.ROUTING_FINISH)
+                yield self.env.process(self.transport(part, pre_proc, next_proc))
+            elif pre_proc.out_part is None:
+                self.monitor.record(self.env.now, next_proc.name, None, part_id=part.id, event=EventType.ROUTING_FINISH)
                 # to next process
                 yield next_proc.in_part.put(part)
                 next_proc.run_event.succeed()
@@ -274,37 +566,69 @@ class Routing(object):
                 yield pre_proc.machines.get()
                 yield pre_proc.in_part.get(lambda x: x is None)
                 part.loc = next_proc.name
-                self.monitor.record(self.env.now, next_proc.name, None, part_id=part.id, event="Part transferred")
+                self.monitor.record(self.env.now, pre_proc.name, None, part_id=part.id, event=EventType.PART_TRANSFERRED)
+                self.monitor.record(self.env.now, next_proc.name, None, part_id=part.id, event=EventType.PROCESS_ENTERED)
             # Part의 현재 process가 with out_buffer인 경우
             else:
-                self.monitor.record(self.env.now, next_proc.name, None, part_id=part.id, event="Routing Finish")
+                self.monitor.record(self.env.now, next_proc.name, None, part_id=part.id, event=EventType.ROUTING_FINISH)
                 # to next process
                 yield next_proc.in_part.put(part)
                 next_proc.run_event.succeed()
                 next_proc.run_event = simpy.Event(self.env)
                 yield pre_proc.out_part.get(lambda x: x.id == part.id)
                 part.loc = next_proc.name
-                self.monitor.record(self.env.now, next_proc.name, None, part_id=part.id, event="Part transferred")
+                self.monitor.record(self.env.now, pre_proc.name, None, part_id=part.id, event=EventType.PART_TRANSFERRED)
+                self.monitor.record(self.env.now, next_proc.name, None, part_id=part.id, event=EventType.PROCESS_ENTERED)
 
         # Part의 위치가 임의의 Source인 경우
         else:
-            self.monitor.record(self.env.now, next_proc.name, None, part_id=part.id, event="Routing Finish")
+            self.monitor.record(self.env.now, next_proc.name, None, part_id=part.id, event=EventType.ROUTING_FINISH)
             yield next_proc.in_part.put(part)
             next_proc.run_event.succeed()
             next_proc.run_event = simpy.Event(self.env)
             part.loc = next_proc.name
-            self.monitor.record(self.env.now, next_proc.name, None, part_id=part.id, event="Part transferred")
+            self.monitor.record(self.env.now, next_proc.name, None, part_id=part.id, event=EventType.PROCESS_ENTERED)
+
+    # transporter를 이용한 이동
+    # 출발 process의 자리는 이동을 요청할 때 바로 비우고 (상차를 기다리는 part는 출발지 대기 구역에 있는 것으로 봄),
+    # 다음 process의 in_part에 자리를 예약한 후에 transporter가 출발
+    # (자리를 붙잡은 채 transporter와 도착지 자리를 기다리면 process 간 순환 대기로 gridlock이 발생)
+    def transport(self, part, pre_proc, next_proc):
+        yield self.env.process(self.leave(part, pre_proc))
+        reservation = object()
+        yield next_proc.in_part.put(reservation)
+        yield self.env.process(self.transporter.move(part, pre_proc.name, next_proc.name))
+        # 예약한 자리를 part로 교체 (비운 자리를 put_queue의 다른 part가 가져가지 않도록 store 안에서 바로 교체)
+        next_proc.in_part.items[next_proc.in_part.items.index(reservation)] = part
+        next_proc.in_part._trigger_get(None)
+        next_proc.run_event.succeed()
+        next_proc.run_event = simpy.Event(self.env)
+        part.loc = next_proc.name
+        self.monitor.record(self.env.now, pre_proc.name, None, part_id=part.id, event=EventType.PART_TRANSFERRED)
+        self.monitor.record(self.env.now, next_proc.name, None, part_id=part.id, event=EventType.PROCESS_ENTERED)
+
+    def leave(self, part, pre_proc):
+        # 출발 process에서 part가 차지하던 자리 반환
+        if pre_proc.out_part is None:
+            yield pre_proc.machines.get()
+            yield pre_proc.in_part.get(lambda x: x is None)
+        else:
+            yield pre_proc.out_part.get(lambda x: x.id == part.id)
 
     def put_sink(self, part):
         if part.loc in self.model.keys():
             pre_proc = self.model[part.loc]
             # Part의 현재 process가 without out_buffer인 경우
             if pre_proc.out_part is None:
+                self.monitor.record(self.env.now, pre_proc.name, None, part_id=part.id,
+                                    event=EventType.PART_TRANSFERRED_TO_SINK)
                 self.model['Sink'].put(part)
                 yield pre_proc.machines.get()
                 yield pre_proc.in_part.get(lambda x: x is None)
             # Part의 현재 process가 with out_buffer인 경우
             else:
+                self.monitor.record(self.env.now, pre_proc.name, None, part_id=part.id,
+                                    event=EventType.PART_TRANSFERRED_TO_SINK)
                 self.model['Sink'].put(part)
                 yield pre_proc.out_part.get(lambda x: x.id == part.id)
 #endregion
@@ -326,35 +650,42 @@ class Sink(object):
     def put(self, part):
         self.parts_rec += 1
         self.last_arrival = self.env.now
-        self.monitor.record(self.env.now, self.name, None, part_id=part.id, event="Part Completed")
+        self.monitor.record(self.env.now, self.name, None, part_id=part.id, event=EventType.PART_COMPLETED)
 #endregion
 
 
 #region Monitor
 class Monitor(object):
-    def __init__(self, filepath):
+    def __init__(self, filepath, calendar=None):
         self.filepath = filepath  ## Event tracer 저장 경로
+        self.calendar = calendar  ## WorkingCalendar: 주어지면 event tracer에 달력 날짜(Date)를 추가
 
         self.time = list()
         self.event = list()
         self.part = list()
         self.process_name = list()
         self.machine_name = list()
+        self.operation = list()
 
-    def record(self, time, process, machine, part_id=None, event=None):
+    # event는 EventSchema.EventType의 정수 코드로 기록
+    def record(self, time, process, machine, part_id=None, event=None, operation=None):
         self.time.append(time)
         self.event.append(event)
         self.part.append(part_id)
         self.process_name.append(process)
         self.machine_name.append(machine)
+        self.operation.append(operation)
 
     def save_event_tracer(self):
-        event_tracer = pd.DataFrame(columns=['Time', 'Event', 'Part', 'Process', 'Machine'])
+        event_tracer = pd.DataFrame(columns=['Time', 'Event', 'Part', 'Process', 'Machine', 'Operation'])
         event_tracer['Time'] = self.time
-        event_tracer['Event'] = self.event
+        event_tracer['Event'] = np.array(self.event, dtype=EVENT_DTYPE)
         event_tracer['Part'] = self.part
         event_tracer['Process'] = self.process_name
         event_tracer['Machine'] = self.machine_name
+        event_tracer['Operation'] = self.operation
+        if self.calendar is not None:
+            event_tracer['Date'] = self.calendar.to_date(self.time)
 
         event_tracer.to_csv(self.filepath)
 
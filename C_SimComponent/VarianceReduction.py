@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import scipy.stats as st
+
+try:
+    from .OutputAnalysis import confidence_interval
+except ImportError:
+    from OutputAnalysis import confidence_interval
+
+
+#region Sampler
+class Sampler(object):
+    """Inverse-transform sampler for a frozen ``scipy.stats`` distribution.
+
+    With ``antithetic=True`` every uniform U is replaced by 1 - U, so a replication run with
+    the same seed and ``antithetic=True`` is the antithetic twin of the plain one. The
+    sampler also keeps the mean of the values it generated, which is the natural control
+    variate for that input.
+    """
+    def __init__(self, distribution, seed=None, antithetic=False):
+        self.distribution = distribution
+        self.rng = np.random.default_rng(seed)
+        self.antithetic = antithetic
+
+        self.sum = 0.0
+        self.n = 0
+
+    def __call__(self):
+        u = self.rng.random()
+        if self.antithetic:
+            u = 1.0 - u
+        value = float(self.distribution.ppf(u))
+        self.sum += value
+        self.n += 1
+        return value
+
+    def mean(self):
+        return self.sum / self.n if self.n > 0 else np.nan
+#endregion
+
+
+#region Estimators
+def antithetic_estimate(y, y_antithetic, confidence=0.95):
+    """Estimate from antithetic pairs, with the variance reduction against independent runs."""
+    y = np.asarray(y, dtype=float)
+    y_antithetic = np.asarray(y_antithetic, dtype=float)
+    pairs = (y + y_antithetic) / 2
+    mean, half_width = confidence_interval(pairs, confidence)
+
+    # 같은 수(2n)의 독립 replication으로 얻었을 평균의 분산과 비교
+    variance = np.var(pairs, ddof=1) / len(pairs)
+    variance_crude = np.var(np.concatenate([y, y_antithetic]), ddof=1) / (2 * len(pairs))
+    return pd.Series({"mean": mean, "half_width": half_width, "variance": variance,
+                      "variance_crude": variance_crude, "variance_reduction": 1 - variance / variance_crude,
+                      "n": len(pairs)})
+
+
+def control_variate_estimate(y, controls, control_means, confidence=0.95, variance_crude=None):
+    """Control-variate corrected estimate of E[y].
+
+    ``controls`` holds one column per control variate (e.g. the mean inter-arrival and
+    service time of each replication) and ``control_means`` their known expectations. The
+    coefficients are fitted by least squares and the corrected observations are
+    y - (controls - control_means) @ beta. The variance reduction is computed against
+    ``variance_crude``, by default that of the plain mean of ``y``; when ``y`` are already
+    combined observations (e.g. antithetic pair means) pass the variance of the crude
+    estimator with the same number of runs.
+    """
+    y = np.asarray(y, dtype=float)
+    controls = np.asarray(controls, dtype=float).reshape(len(y), -1)
+    deviation = controls - np.asarray(control_means, dtype=float)
+
+    centered = deviation - deviation.mean(axis=0)
+    beta = np.linalg.lstsq(centered, y - y.mean(), rcond=None)[0]
+    y_corrected = y - deviation @ beta
+    mean = np.mean(y_corrected)
+
+    # beta 추정으로 잃는 자유도(k)를 반영한 분산과 신뢰구간
+    k = controls.shape[1]
+    variance = np.sum((y_corrected - mean) ** 2) / (len(y) - 1 - k) / len(y)
+    half_width = st.t.ppf((1 + confidence) / 2, len(y) - 1 - k) * np.sqrt(variance)
+    if variance_crude is None:
+        variance_crude = np.var(y, ddof=1) / len(y)
+    return pd.Series({"mean": mean, "half_width": half_width, "variance": variance,
+                      "variance_crude": variance_crude, "variance_reduction": 1 - variance / variance_crude,
+                      "beta": beta, "n": len(y)})
+#endregion
@@ -1,35 +1,55 @@
 from C_SimComponent.SimComponents import *
+from C_SimComponent.Experiment import run_replications
 import simpy
 import numpy as np
 import random
 
-np.random.seed(42)
-random.seed(42)
 
-filepath = '../result/event_log_MM3.csv'
-env = simpy.Environment()
-monitor = Monitor(filepath)
+def build_model(filepath='../result/event_log_MM3.csv', until=100000, streams=None):
+    env = simpy.Environment()
+    monitor = Monitor(filepath)
+    # component별 독립 난수 stream (streams가 없으면 전역 np.random 사용)
+    stream = streams.stream if streams is not None else (lambda name: None)
 
-operation = dict()
-operation['Ops1-1'] = Operation('Ops1-1', 'exponential(50)', ['M1'])
+    operation = dict()
+    operation['Ops1-1'] = Operation('Ops1-1', 'exponential(50)', ['M1'])
 
+    model = dict()
+    model['M1'] = Process(env, 'M1', model, monitor, capacity=3, in_buffer=0, out_buffer=0, rng=stream('M1'))
+    model['Routing'] = Routing(env, 'Routing', model, monitor, mode='SPT', rng=stream('Routing'))
+    model['Sink'] = Sink(env, monitor)
 
-model = dict()
-model['M1'] = Process(env, 'M1', model, monitor, capacity=3, in_buffer=0, out_buffer=0)
-model['Routing'] = Routing(env, 'Routing', model, monitor, mode='SPT')
-model['Sink'] = Sink(env, monitor)
+    jobtype1 = [operation['Ops1-1']]
 
-jobtype1 = [operation['Ops1-1']]
+    source = Source(env, 'Source_jobtype1', model, monitor, jobtype=jobtype1, IAT='exponential(20)',
+                    rng=stream('Source_jobtype1'))
 
+    env.run(until=until)
 
-source = Source(env, 'Source_jobtype1', model, monitor, jobtype=jobtype1, IAT='exponential(20)')
+    return model, monitor
 
-env.run(until=100000)
 
-monitor.save_event_tracer()
+# replication 당 KPI (event log 대신 요약값만 반환)
+def replication(seed_seq):
+    model, monitor = build_model(until=10000, streams=RandomStreams(seed_seq))
+    return {"Makespan": model['Sink'].last_arrival, "Makepart": model['Sink'].parts_rec,
+            "Utilization": model['M1'].util_time / (model['M1'].capa * 10000)}
 
-print('#' * 80)
-print("Results of MM3 simulation")
 
-print("Makespan : ", model['Sink'].last_arrival)
-print("Makepart : ", model['Sink'].parts_rec)
\ No newline at end of file
+if __name__ == "__main__":
+    np.random.seed(42)
+    random.seed(42)
+
+    model, monitor = build_model()
+    monitor.save_event_tracer()
+
+    print('#' * 80)
+    print("Results of MM3 simulation")
+
+    print("Makespan : ", model['Sink'].last_arrival)
+    print("Makepart : ", model['Sink'].parts_rec)
+
+    kpis, summary = run_replications(replication, 30, seed=42)
+    print('#' * 80)
+    print("Results of 30 replications")
+    print(summary)
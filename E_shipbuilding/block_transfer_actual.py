@@ -3,6 +3,7 @@ import time
 import pandas as pd
 import numpy as np
 
+from FlowLine import is_flow_line, simulate_flow_line
 from SimComponent.SimComponents import Source, Sink, Process, Monitor, Part
 
 # 코드 실행 시작 시각
@@ -53,38 +54,50 @@ for i in range(len(process_list)):
 
 df[(3, 'start_time')], df[(3, 'process_time')], df[(3, 'process')] = None, None, 'Sink'
 
-parts = []
-for i in range(len(df)):
-    parts.append(Part(df.index[i], df.iloc[i]))
-
-# Modeling
-env = simpy.Environment()
-
-##
-model = {}
-
 # 작업장 수
 m_assy = 2
 m_oft = 2
 m_pnt = 2
 server_num = [m_assy, m_oft, m_pnt]
 filepath = '../result/event_log_block_movement_actual.csv'
-Monitor = Monitor(filepath)
 
-# Source
-Source = Source(env, parts, model, Monitor)
+# 모든 part가 같은 공정 순서를 따르는 직렬 라인이면 Lindley recursion으로 바로 계산, 아니면 SimPy 시뮬레이션
+# (한 공정에 같은 시각에 도착하는 part가 있으면 SimPy와 server 할당이 달라질 수 있으므로 simulate_flow_line이 None을 반환)
+event_tracer = None
+if is_flow_line(df, process_list):
+    start = time.time()  # 시뮬레이션 시작 시각
+    event_tracer, last_arrival = simulate_flow_line(df, process_list, server_num, filepath=filepath)
+    finish = time.time()  # 시뮬레이션 종료 시각
+if event_tracer is None:
+    parts = []
+    for i in range(len(df)):
+        parts.append(Part(df.index[i], df.iloc[i]))
+
+    # Modeling
+    env = simpy.Environment()
+
+    ##
+    model = {}
+
+    Monitor = Monitor(filepath)
 
-# Process Modeling
-for i in range(len(process_list) + 1):
-    if i == len(process_list):
-        model['Sink'] = Sink(env, Monitor)
-    else:
-        model[process_list[i]] = Process(env, process_list[i], server_num[i], model, Monitor)
+    # Source
+    Source = Source(env, parts, model, Monitor)
 
-# Run it
-start = time.time()  # 시뮬레이션 시작 시각
-env.run()
-finish = time.time()  # 시뮬레이션 종료 시각
+    # Process Modeling
+    for i in range(len(process_list) + 1):
+        if i == len(process_list):
+            model['Sink'] = Sink(env, Monitor)
+        else:
+            model[process_list[i]] = Process(env, process_list[i], server_num[i], model, Monitor)
+
+    # Run it
+    start = time.time()  # 시뮬레이션 시작 시각
+    env.run()
+    finish = time.time()  # 시뮬레이션 종료 시각
+
+    event_tracer = Monitor.save_event_tracer()
+    last_arrival = model['Sink'].last_arrival
 
 
 print('#' * 80)
@@ -96,8 +109,6 @@ print("data pre-processing : ", start - start_0)
 print("simulation execution time :", finish - start)
 print("total time : ", finish - start_0)
 
-event_tracer = Monitor.save_event_tracer()
-
 # DATA POST-PROCESSING
 # Event Tracer을 이용한 후처리
 from PostProcessing import *
@@ -105,14 +116,32 @@ print('#' * 80)
 print("Data Post-Processing")
 print('#' * 80)
 
+# 반복 분석을 위해 process/part/event별 index를 캐싱하는 EventLog 사용
+event_log = EventLog(event_tracer)
+
 # 가동률
 print('#' * 80)
 for i in range(len(process_list)):
     process = process_list[i]
-    u, idle, working_time = cal_utilization(event_tracer, process, "Process", finish_time=model['Sink'].last_arrival)
+    u, idle, working_time = cal_utilization(event_log, process, "Process", finish_time=last_arrival)
     print("utilization of {0} : ".format(process), u)
     print("idle time of {0} : ".format(process), idle)
     print("total working time of {0} : ".format(process), working_time)
     print("#"*80)
 
-print("total lead time: ", model['Sink'].last_arrival)
\ No newline at end of file
+print("total lead time: ", last_arrival)
+
+# 계획 대비 시뮬레이션 지연 분석 (AAS_CAL / OAS_CAL / PAS_CAL 기준)
+plan = pd.DataFrame({"Part": np.tile(data["part"].values, len(process_list)),
+                     "Process": np.repeat(process_list, len(data)),
+                     "Start": np.concatenate([data[column].values for column in start_time_list]).astype(float),
+                     "Finish": np.concatenate([(data[start] + data[duration]).values
+                                               for start, duration in zip(start_time_list, process_time_list)]).astype(float)})
+deviation, deviation_summary, critical_blocks = plan_deviation(event_log, plan, process_list,
+                                                               filepath='../result/plan_deviation_actual.png')
+deviation.to_csv('../result/plan_deviation_actual.csv')
+print('#' * 80)
+print("delay of the simulation from the plan")
+print(deviation_summary)
+print("critical blocks")
+print(critical_blocks)
\ No newline at end of file
@@ -1,10 +1,10 @@
 import simpy
 import time
-import os
 import scipy.stats as st
 import numpy as np
 import pandas as pd
 
+from FlowLine import is_flow_line, simulate_flow_line
 from SimComponent.SimComponents import Sink, Process, Source, Monitor, Part
 
 # 코드 실행 시작 시각
@@ -45,38 +45,50 @@ data[(3, 'process')] = 'Sink'
 data = pd.concat([df_part, data], axis=1)
 process_list = ['Assembly', 'Outfitting', 'Painting']
 
-parts = []
-for i in range(len(data)):
-    parts.append(Part(data.index[i], data.iloc[i]))
-
-# Modeling
-env = simpy.Environment()
-
-##
-model = {}
-
 # 작업장 수
 m_assy = 2
 m_oft = 2
 m_pnt = 2
 server_num = [m_assy, m_oft, m_pnt]
 filepath = '../result/event_log_block_movement_fitting.csv'
-Monitor = Monitor(filepath)
 
-# Source
-Source = Source(env, parts, model, Monitor)
+# 모든 part가 같은 공정 순서를 따르는 직렬 라인이면 Lindley recursion으로 바로 계산, 아니면 SimPy 시뮬레이션
+# (한 공정에 같은 시각에 도착하는 part가 있으면 SimPy와 server 할당이 달라질 수 있으므로 simulate_flow_line이 None을 반환)
+event_tracer = None
+if is_flow_line(data, process_list):
+    start = time.time()  # 시뮬레이션 시작 시각
+    event_tracer, last_arrival = simulate_flow_line(data, process_list, server_num, filepath=filepath)
+    finish = time.time()  # 시뮬레이션 종료 시각
+if event_tracer is None:
+    parts = []
+    for i in range(len(data)):
+        parts.append(Part(data.index[i], data.iloc[i]))
+
+    # Modeling
+    env = simpy.Environment()
+
+    ##
+    model = {}
+
+    Monitor = Monitor(filepath)
+
+    # Source
+    Source = Source(env, parts, model, Monitor)
+
+    # Process Modeling
+    for i in range(len(process_list) + 1):
+        if i == len(process_list):
+            model['Sink'] = Sink(env, Monitor)
+        else:
+            model[process_list[i]] = Process(env, process_list[i], server_num[i], model, Monitor)
 
-# Process Modeling
-for i in range(len(process_list) + 1):
-    if i == len(process_list):
-        model['Sink'] = Sink(env, Monitor)
-    else:
-        model[process_list[i]] = Process(env, process_list[i], server_num[i], model, Monitor)
+    # Run it
+    start = time.time()  # 시뮬레이션 시작 시각
+    env.run()
+    finish = time.time()  # 시뮬레이션 종료 시각
 
-# Run it
-start = time.time()  # 시뮬레이션 시작 시각
-env.run()
-finish = time.time()  # 시뮬레이션 종료 시각
+    event_tracer = Monitor.save_event_tracer()
+    last_arrival = model['Sink'].last_arrival
 
 # for process in process_list:
 #     print("server: ", np.max(model[process].len_of_server))
@@ -92,20 +104,18 @@ print("total time : ", finish - start_0)
 
 # DATA POST-PROCESSING
 # Event Tracer을 이용한 후처리
-from PostProcessing import *
 print('#' * 80)
 print("Data Post-Processing")
 print('#' * 80)
 
-event_tracer = Monitor.save_event_tracer()
 # # 가동률
 # print('#' * 80)
 # for i in range(len(process_list)):
 #     process = process_list[i]
-#     u, idle, working_time = cal_utilization(event_tracer, process, "Process", finish_time=model['Sink'].last_arrival)
+#     u, idle, working_time = cal_utilization(event_tracer, process, "Process", finish_time=last_arrival)
 #     print("utilization of {0} : ".format(process), u)
 #     print("idle time of {0} : ".format(process), idle)
 #     print("total working time of {0} : ".format(process), working_time)
 #     print("#"*80)
 #
-# print("total lead time: ", model['Sink'].last_arrival)
\ No newline at end of file
+# print("total lead time: ", last_arrival)
\ No newline at end of file
@@ -1,124 +1,81 @@
 import os
-import pandas as pd
+import pickle
 import numpy as np
-import simpy
 import time
-import random
-from datetime import datetime
-from collections import OrderedDict
 
-from SimComponent.SimComponents import Source, Process, Sink, Monitor, Part
-from PostProcessing import cal_wip, cal_utilization, cal_throughput, cal_leadtime
+from InputCache import read_excel_cached
+from preprocessing import preprocess_master_plan
+from scenario import compile_scenario, load_scenario
+from MaxPlus import MaxPlusSchedule, IncrementalSchedule
 
 start_run = time.time()
 
 # 코드 실행 시각
 
-## Pre-Processing
-# DATA INPUT
-data_all = pd.read_excel('../data/master_planning.xlsx', engine = 'openpyxl')
-data = data_all[['PROJECTNO', 'ACTIVITYCODE', 'LOCATIONCODE', 'PLANSTARTDATE', 'PLANFINISHDATE', 'PLANDURATION']]
-
-# DATA PRE-PROCESSING
-data = data[data['PLANSTARTDATE'].dt.year >= 2018]
-data = data[data['LOCATIONCODE'] != 'OOO']
-
-initial_date = data['PLANSTARTDATE'].min()
-
-data['PLANSTARTDATE'] = data['PLANSTARTDATE'].apply(lambda x: (x - initial_date).days)
-data['PLANFINISHDATE'] = data['PLANFINISHDATE'].apply(lambda x: (x - initial_date).days)
-data['ACTIVITY'] = data['ACTIVITYCODE'].apply(lambda x: x[5:])
-data['BLOCKCODE'] = data['PROJECTNO'] + ' ' + data['LOCATIONCODE']
-
-process_list = list(data.drop_duplicates(['ACTIVITY'])['ACTIVITY'])
-block_list = list(data.drop_duplicates(['BLOCKCODE'])['BLOCKCODE'])
-
-df_part = pd.DataFrame(block_list, columns=["part"])
-
-# 각 블록별 activity 개수
-activity_num = []
-for block_code in block_list:
-    temp = data[data['BLOCKCODE'] == block_code]
-    temp_1 = temp.sort_values(by=['PLANSTARTDATE'], axis=0, inplace=False)
-    temp = temp_1.reset_index(drop=True, inplace=False)
-    activity_num.append(len(temp))
-
-## 최대 activity 개수
-max_num_of_activity = np.max(activity_num)
-
-# S-Module에 넣어 줄 dataframe(중복된 작업시간 처리)
-columns = pd.MultiIndex.from_product([[i for i in range(max_num_of_activity + 1)], ['start_time', 'process_time', 'process']])
-df = pd.DataFrame([], columns=columns)
-idx = 0  # df에 저장된 block 개수
-block_dict = dict()
-for block_code in block_list:
-    temp = data[data['BLOCKCODE'] == block_code]
-    temp_1 = temp.sort_values(by=['PLANSTARTDATE'], axis=0, inplace=False)
-    temp = temp_1.reset_index(drop=True)
-    block_dict[block_code] = {"start_time": list(), "process_time": list(), "process": list()}
-    # n = 0  # 저장된 공정 개수
-    for i in range(0, len(temp)):
-        activity = temp['ACTIVITY'][i]
-        block_dict[block_code]['start_time'].append(temp['PLANSTARTDATE'][i])
-        block_dict[block_code]['process_time'].append(temp['PLANDURATION'][i])
-        block_dict[block_code]['process'].append(activity)
-        # df.loc[block_code][(n, 'start_time')] = temp['PLANSTARTDATE'][i]
-        # df.loc[block_code][(n, 'process_time')] = temp['PLANDURATION'][i]
-        # df.loc[block_code][(n, 'process')] = activity
-        # n += 1
-    block_dict[block_code]['start_time'].append(None)
-    block_dict[block_code]['process_time'].append(None)
-    block_dict[block_code]['process'].append("Sink")
-    #df.loc[block_code][(n, 'process')] = 'Sink'
-
-# df.sort_values(by=[(0, 'start_time')], axis=0, inplace=True)
-block_dict = sorted(block_dict.items(), key=lambda x: x[1]['start_time'][0])
-block_dict = OrderedDict(block_dict)
-parts = []
-
-for block_code in block_dict:
-    parts.append(Part(block_code, block_dict[block_code]))
-
-env = simpy.Environment()
-model = {}
-server_num = np.full(len(process_list), 1)
-
-Monitor = Monitor('../result/event_log_master_plan_with_tp_df.csv')
-Source = Source(env, parts, model, Monitor)
-###################
-# transporter 사용 시 True, 아니면 False
-network_using = True
-
-if network_using:
-    # network -> distance data
-    # network_dist = pd.read_excel('../network/distance_data_masterplan.xlsx')
-    # network_dist = network_dist.set_index('Unnamed: 0', drop=True)
-    # # Resource
-    # tp_info = {}
-    # tp_num = 100
-    # for i in range(tp_num):
-    #     tp_info["TP_{0}".format(i+1)] = {"capa": 100, "v_loaded": 0.5, "v_unloaded": 1.0}
-    # Resource = Resource(env, model, Monitor, tp_info=tp_info, network=network_dist)
-
-    for i in range(len(process_list) + 1):
-        if i == len(process_list):
-            model['Sink'] = Sink(env, Monitor)
-        else:
-            model[process_list[i]] = Process(env, process_list[i], server_num[i], model, Monitor)
-else:
-    for i in range(len(process_list) + 1):
-        if i == len(process_list):
-            model['Sink'] = Sink(env, Monitor)
-        else:
-            model[process_list[i]] = Process(env, process_list[i], server_num[i], model, Monitor)
+## Pre-Processing (전처리 결과를 scenario bundle로 저장해 다음 실행부터 재사용)
+input_path = '../data/master_planning.xlsx'
+scenario_path = '../result/scenario_master_plan.pkl'
+scenario = load_scenario(scenario_path)
+if scenario is None:
+    # DATA INPUT
+    data_all = read_excel_cached(input_path, engine='openpyxl',
+                                 columns=['PROJECTNO', 'ACTIVITYCODE', 'LOCATIONCODE', 'PLANSTARTDATE', 'PLANFINISHDATE', 'PLANDURATION'])
+
+    # DATA PRE-PROCESSING (block별 routing: 한 번의 정렬 + split)
+    data, process_list, block_dict, activity_num = preprocess_master_plan(data_all)
+    server_num = np.full(len(process_list), 1)
+    scenario = compile_scenario(scenario_path, list(block_dict.items()), process_list, server_num,
+                                sources=[input_path])
+
+process_list = scenario.process_list
+server_num = scenario.server_num
+
+# max-plus 증분 평가도 실행할 때 True - 수정된 master plan을 처음 영향을 받는 시각부터만 다시 평가
+incremental_using = False
+
+## SimPy simulation (event log 저장)
+env, model, Monitor = scenario.build('../result/event_log_master_plan_with_tp_df.csv')
+# transporter network: stub - 이 script의 SimComponent 모델에는 Routing이 없어 process 간 이동은 즉시 이루어짐.
+# 이동 시간이 필요하면 C_SimComponent의 Routing(transporter=TransporterFleet(env, Monitor, tp_info, distance))으로
+# 모델을 구성 (Flexible_jobshop.build_model의 tp_info / network 참고)
 
 # recording time
 start = time.time()
 env.run()
 finish = time.time()
 
+print('#' * 80)
+print("data pre-processing : ", start - start_run)
+print("simulation execution time :", finish - start)
+print("total time : ", finish - start_run)
+
 event_tracer = Monitor.save_event_tracer()
 
+## max-plus evaluation (no SimPy processes) - simulation 결과의 cross-validation 및 수정된 plan의 빠른 재평가
+if incremental_using:
+    # 직전 실행의 timeline(checkpoint)을 저장해 두고, master plan이 수정되면 처음 영향을 받는 시각부터만 다시 평가
+    maxplus_start = time.time()
+    timeline_path = '../result/timeline_master_plan.pkl'
+    timeline = None
+    if os.path.exists(timeline_path):
+        with open(timeline_path, 'rb') as f:
+            timeline = pickle.load(f)
+    if timeline is None or timeline.server_num != list(server_num):
+        timeline = IncrementalSchedule(server_num)
+    schedule = MaxPlusSchedule.from_routings([data for _, data in scenario.routings], process_list,
+                                             ids=[block for block, _ in scenario.routings])
+    kpi = timeline.kpis(schedule)
+    with open(timeline_path, 'wb') as f:
+        pickle.dump(timeline, f, protocol=pickle.HIGHEST_PROTOCOL)
+    maxplus_finish = time.time()
+
+    print("max-plus evaluation time :", maxplus_finish - maxplus_start)
+    print("re-evaluated operations : {0:.1%}".format(timeline.resimulated))
+    print("makespan (SimPy / max-plus) : ", model['Sink'].last_arrival, kpi["makespan"])
+    print("leadtime : ", kpi["leadtime"])
+    for i in range(len(process_list)):
+        print("utilization of {0} : ".format(process_list[i]), kpi["utilization"][i])
+
 # # result of each precess
 # wip = 0.0
 # for i in range(len(process_list)):
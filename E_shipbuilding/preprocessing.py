@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+
+
+def clean_master_plan(data_all, start_year=2018):
+    # 필요한 column 선택, 2018년 이후 / 비정상 location code 제거, 날짜를 정수(일)로 변환
+    data = data_all[['PROJECTNO', 'ACTIVITYCODE', 'LOCATIONCODE', 'PLANSTARTDATE', 'PLANFINISHDATE', 'PLANDURATION']]
+    data = data[(data['PLANSTARTDATE'].dt.year >= start_year) & (data['LOCATIONCODE'] != 'OOO')].copy()
+
+    initial_date = data['PLANSTARTDATE'].min()
+    data['PLANSTARTDATE'] = (data['PLANSTARTDATE'] - initial_date).dt.days
+    data['PLANFINISHDATE'] = (data['PLANFINISHDATE'] - initial_date).dt.days
+    data['ACTIVITY'] = data['ACTIVITYCODE'].str[5:]
+    data['BLOCKCODE'] = data['PROJECTNO'] + ' ' + data['LOCATIONCODE']
+
+    return data
+
+
+def block_routing(data):
+    """Per-block routing of the master plan with a single sort.
+
+    Rows are sorted once by (block, planned start) and split at the block boundaries, so
+    the cost is O(rows log rows) instead of one filter + sort of the whole table per block.
+    Returns the routing of each block as an OrderedDict ``{block code: {"start_time": [...],
+    "process_time": [...], "process": [...]}}`` ending with the Sink, ordered by the start
+    of the first activity (ties keep the order of first appearance), and the number of
+    activities of each block.
+    """
+    codes, blocks = pd.factorize(data['BLOCKCODE'])
+    start_time = data['PLANSTARTDATE'].to_numpy()
+    order = np.lexsort((start_time, codes))  # 안정 정렬: 같은 시작일은 원래 순서 유지
+
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    start_time = np.split(start_time[order], bounds)
+    process_time = np.split(data['PLANDURATION'].to_numpy()[order], bounds)
+    process = np.split(data['ACTIVITY'].to_numpy()[order], bounds)
+    activity_num = np.bincount(codes, minlength=len(blocks))
+
+    block_dict = OrderedDict()
+    for i in np.argsort([start[0] for start in start_time], kind='stable'):
+        block_dict[blocks[i]] = {"start_time": start_time[i].tolist() + [None],
+                                 "process_time": process_time[i].tolist() + [None],
+                                 "process": process[i].tolist() + ["Sink"]}
+
+    return block_dict, pd.Series(activity_num, index=blocks)
+
+
+def preprocess_master_plan(data_all, start_year=2018):
+    # 정제된 data, process 목록, block별 routing, block별 activity 개수
+    data = clean_master_plan(data_all, start_year=start_year)
+    process_list = list(data['ACTIVITY'].drop_duplicates())
+    block_dict, activity_num = block_routing(data)
+    return data, process_list, block_dict, activity_num
@@ -0,0 +1,76 @@
+import os
+import pickle
+import simpy
+
+from SimComponent.SimComponents import Source, Process, Sink, Monitor, Part
+
+
+def _stamp(sources):
+    # 입력 파일의 (경로, 크기, 수정 시각) - 변경되면 bundle을 다시 compile
+    return [(os.path.abspath(path), os.stat(path).st_size, os.stat(path).st_mtime_ns) for path in sources]
+
+
+#region Scenario
+class Scenario(object):
+    """Preprocessed input of a shipbuilding model: part routings and server configuration.
+
+    ``routings`` is a list of (part id, routing data) in release order, ``server_num`` the
+    number of servers of each process and ``process_kwargs`` extra arguments passed to every
+    Process (e.g. capacity). ``build`` creates a ready-to-run environment with fresh Part
+    objects, so one scenario can be built any number of times.
+    """
+    def __init__(self, routings, process_list, server_num, process_kwargs=None, sources=()):
+        self.routings = routings
+        self.process_list = process_list
+        self.server_num = list(server_num)
+        self.process_kwargs = process_kwargs if process_kwargs is not None else dict()
+        self.sources = _stamp(sources)
+
+    def build(self, filepath, server_num=None):
+        server_num = self.server_num if server_num is None else server_num
+
+        env = simpy.Environment()
+        model = {}
+        monitor = Monitor(filepath)
+        parts = [Part(part_id, data) for part_id, data in self.routings]
+        source = Source(env, parts, model, monitor)
+        for i in range(len(self.process_list)):
+            model[self.process_list[i]] = Process(env, self.process_list[i], server_num[i], model, monitor,
+                                                  **self.process_kwargs)
+        model['Sink'] = Sink(env, monitor)
+
+        return env, model, monitor
+#endregion
+
+
+#region Bundle
+def compile_scenario(filepath, routings, process_list, server_num, process_kwargs=None, sources=()):
+    # 전처리가 끝난 scenario를 하나의 binary bundle로 저장
+    scenario = Scenario(routings, process_list, server_num, process_kwargs=process_kwargs, sources=sources)
+    if os.path.dirname(filepath) and not os.path.exists(os.path.dirname(filepath)):
+        os.makedirs(os.path.dirname(filepath))
+    with open(filepath + '.tmp', 'wb') as f:
+        pickle.dump(scenario, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(filepath + '.tmp', filepath)
+    return scenario
+
+
+_loaded = dict()  # worker process 안에서는 같은 bundle을 한 번만 읽음
+
+
+def load_scenario(filepath):
+    """Load a compiled bundle, or return None when it is missing or its inputs have changed."""
+    if not os.path.exists(filepath):
+        return None
+    key = (os.path.abspath(filepath), os.stat(filepath).st_mtime_ns)
+    if key not in _loaded:
+        with open(filepath, 'rb') as f:
+            _loaded[key] = pickle.load(f)
+    scenario = _loaded[key]
+    try:
+        if _stamp([source[0] for source in scenario.sources]) != scenario.sources:
+            return None
+    except FileNotFoundError:
+        return None
+    return scenario
+#endregion
@@ -15,6 +15,8 @@ import random
 import simpy
 import numpy as np
 
+from C_SimComponent.Experiment import run_sweep
+
 
 RANDOM_SEED = 42
 NEW_CUSTOMERS = 5  # Total number of customers
@@ -57,21 +59,20 @@ def customer(env, name, counter, time_in_bank):
             print('%7.4f %s: RENEGED after %6.3f' % (env.now, name, wait))
 
 
-def optimize(num_of_counters, service_time):
-    num_of_counters_optimized = 0
-    service_time_optimized = 0
-    simulation_time = 0
-    for i in num_of_counters:
-        for j in service_time:
-            env = simpy.Environment()
-            counter = simpy.Resource(env, capacity=i)
-            env.process(source(env, NEW_CUSTOMERS, j, INTERVAL_CUSTOMERS, counter))
-            env.run()
-            if abs(env.now - 200) < abs(simulation_time - 200):
-                simulation_time = env.now
-                num_of_counters_optimized = i
-                service_time_optimized = j
-    return num_of_counters_optimized, service_time_optimized, simulation_time
+def simulate(num_of_counters, service_time):
+    # 각 parameter 조합을 같은 난수열로 평가 (병렬 실행 순서와 무관하게 재현 가능)
+    random.seed(RANDOM_SEED)
+    env = simpy.Environment()
+    counter = simpy.Resource(env, capacity=num_of_counters)
+    env.process(source(env, NEW_CUSTOMERS, service_time, INTERVAL_CUSTOMERS, counter))
+    env.run()
+    return {"simulation_time": env.now}
+
+
+def optimize(num_of_counters, service_time, n_jobs=None):
+    result = run_sweep(simulate, {"num_of_counters": num_of_counters, "service_time": service_time}, n_jobs=n_jobs)
+    best = result.loc[(result["simulation_time"] - 200).abs().idxmin()]
+    return int(best["num_of_counters"]), int(best["service_time"]), float(best["simulation_time"])
 
 
 if __name__ == "__main__":
@@ -21,6 +21,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 from mpl_toolkits.mplot3d import Axes3D
+from C_SimComponent.Experiment import run_sweep
 
 
 RANDOM_SEED = 42
@@ -167,12 +168,16 @@ def optimize(washtime, t_inter, monitoring_inter, display=False):
     return num_machines_optimized
 
 
-def parameter_analysis(wash_time, t_inter):
-    num_machines_optimized = np.full([len(t_inter), len(wash_time)], 0)
+def optimize_point(wash_time, t_inter):
+    # 각 parameter 조합을 같은 난수열로 평가 (병렬 실행 순서와 무관하게 재현 가능)
+    random.seed(RANDOM_SEED)
+    return {"num_machines": optimize(wash_time, t_inter, MONITORING_INTER)}
+
 
-    for i in range(len(wash_time)):
-        for j in range(len(t_inter)):
-            num_machines_optimized[j, i] = optimize(wash_time[i], t_inter[j], MONITORING_INTER)
+def parameter_analysis(wash_time, t_inter, filepath=None, n_jobs=None):
+    # filepath에 결과가 남아 있으면 중단된 sweep을 이어서 실행
+    result = run_sweep(optimize_point, {"wash_time": wash_time, "t_inter": t_inter}, filepath=filepath, n_jobs=n_jobs)
+    num_machines_optimized = result.pivot(index="t_inter", columns="wash_time", values="num_machines").values.astype(int)
 
     n_max = np.max(num_machines_optimized)
     n_min = np.min(num_machines_optimized)
@@ -225,4 +230,4 @@ if __name__ == "__main__":
     # Example of studying the relationship between the number of machine optimized and t_inter, wash_time
     wash_time = np.arange(15, 26)
     t_inter = np.arange(2, 11)
-    parameter_analysis(wash_time, t_inter)
\ No newline at end of file
+    parameter_analysis(wash_time, t_inter, filepath="./result/carwash_parameter_analysis.csv")
\ No newline at end of file
@@ -17,31 +17,33 @@ class Monitor():
         log = pd.DataFrame({"ID": self.id, "Time": self.time, "Event": self.event})
         log.to_csv(file_name, index=False)
 
-    def calculate_L(self):
+    # start_time: warm-up 구간을 제외할 경우 통계 수집 시작 시각
+    def calculate_L(self, start_time=0.0):
         log = pd.DataFrame({"ID": self.id, "Time": self.time, "Event": self.event})
-        duration = log["Time"].max()
+        duration = log["Time"].max() - start_time
         queue_entered = log[["ID", "Time"]][log["Event"] == "queue_entered"]
         service_finished = log[["ID", "Time"]][log["Event"] == "service_finished"]
         data = pd.merge(queue_entered, service_finished, left_on="ID", right_on="ID",
                         suffixes=("_queue_entered", "_service_finished"))
         data = data.dropna()
-        L = np.sum(data["Time_service_finished"] - data["Time_queue_entered"]) / duration
+        L = np.sum(data["Time_service_finished"].clip(lower=start_time) - data["Time_queue_entered"].clip(lower=start_time)) / duration
         return L
 
-    def calculate_L_Q(self):
+    # start_time: warm-up 구간을 제외할 경우 통계 수집 시작 시각
+    def calculate_L_Q(self, start_time=0.0):
         log = pd.DataFrame({"ID": self.id, "Time": self.time, "Event": self.event})
-        duration = log["Time"].max()
+        duration = log["Time"].max() - start_time
         queue_entered = log[["ID", "Time"]][log["Event"] == "queue_entered"]
         service_finished = log[["ID", "Time"]][log["Event"] == "queue_released"]
         data = pd.merge(queue_entered, service_finished, left_on="ID", right_on="ID",
                         suffixes=("_queue_entered", "_queue_released"))
         data = data.dropna()
-        L_Q = np.sum(data["Time_queue_released"] - data["Time_queue_entered"]) / duration
+        L_Q = np.sum(data["Time_queue_released"].clip(lower=start_time) - data["Time_queue_entered"].clip(lower=start_time)) / duration
         return L_Q
 
-    def calculate_W(self):
+    def calculate_W(self, start_time=0.0):
         log = pd.DataFrame({"ID": self.id, "Time": self.time, "Event": self.event})
-        queue_entered = log[["ID", "Time"]][log["Event"] == "queue_entered"]
+        queue_entered = log[["ID", "Time"]][(log["Event"] == "queue_entered") & (log["Time"] >= start_time)]
         service_finished = log[["ID", "Time"]][log["Event"] == "service_finished"]
         data = pd.merge(queue_entered, service_finished, left_on="ID", right_on="ID",
                         suffixes=("_queue_entered", "_service_finished"))
@@ -49,9 +51,9 @@ class Monitor():
         W = np.mean(data["Time_service_finished"] - data["Time_queue_entered"])
         return W
 
-    def calculate_W_Q(self):
+    def calculate_W_Q(self, start_time=0.0):
         log = pd.DataFrame({"ID": self.id, "Time": self.time, "Event": self.event})
-        queue_entered = log[["ID", "Time"]][log["Event"] == "queue_entered"]
+        queue_entered = log[["ID", "Time"]][(log["Event"] == "queue_entered") & (log["Time"] >= start_time)]
         service_finished = log[["ID", "Time"]][log["Event"] == "queue_released"]
         data = pd.merge(queue_entered, service_finished, left_on="ID", right_on="ID",
                         suffixes=("_queue_entered", "_queue_released"))
@@ -1,29 +1,54 @@
 import os
 import simpy
+import numpy as np
+import pandas as pd
 
 from scipy.stats import *
 from postprocessing import Monitor
+from C_SimComponent.OutputAnalysis import MSEREstimator
+from C_SimComponent.Experiment import run_with_batch_means
+from C_SimComponent.VarianceReduction import Sampler, antithetic_estimate, control_variate_estimate
 
 
-def setup(env, server, monitor, arrival_rate, service_rate):
+# sampler: {"IAT": Sampler, "service": Sampler} - 없으면 scipy.stats의 전역 난수 사용
+def setup(env, server, monitor, arrival_rate, service_rate, estimator=None, sampler=None):
     i = 0
     while True:
-        IAT = expon.rvs(scale=1/arrival_rate)
+        IAT = sampler["IAT"]() if sampler is not None else expon.rvs(scale=1/arrival_rate)
         yield env.timeout(IAT)
         monitor.record(i, env.now, "queue_entered")
-        env.process(model(i, env, server, monitor, service_rate))
+        env.process(model(i, env, server, monitor, service_rate, estimator, sampler))
         i += 1
 
 
-def model(id, env, server, monitor, service_rate):
+def model(id, env, server, monitor, service_rate, estimator=None, sampler=None):
+    arrival = env.now
     with server.request() as req:
         yield req
         monitor.record(id, env.now, "queue_released")
 
-        service_time = expon.rvs(scale=1/service_rate)
+        service_time = sampler["service"]() if sampler is not None else expon.rvs(scale=1/service_rate)
         monitor.record(id, env.now, "service_started")
         yield env.timeout(service_time)
         monitor.record(id, env.now, "service_finished")
+        if estimator is not None:
+            estimator.observe(env.now - arrival, env.now)
+
+
+def replication(seed, arrival_rate, service_rate, antithetic=False, run_length=2000, warmup=100):
+    # IAT와 service time에 별도의 stream을 사용해야 antithetic 쌍의 동기화가 유지됨
+    iat_seed, service_seed = np.random.SeedSequence(seed).spawn(2)
+    sampler = {"IAT": Sampler(expon(scale=1/arrival_rate), iat_seed, antithetic),
+               "service": Sampler(expon(scale=1/service_rate), service_seed, antithetic)}
+
+    env = simpy.Environment()
+    server = simpy.Resource(env, capacity=3)
+    monitor = Monitor()
+    env.process(setup(env, server, monitor, arrival_rate, service_rate, sampler=sampler))
+    env.run(until=run_length)
+
+    return {"W": monitor.calculate_W(start_time=warmup), "IAT": sampler["IAT"].mean(),
+            "service": sampler["service"].mean()}
 
 
 if __name__ == "__main__":
@@ -37,15 +62,35 @@ if __name__ == "__main__":
     env = simpy.Environment()
     server = simpy.Resource(env, capacity=3)
     monitor = Monitor()
-    env.process(setup(env, server, monitor, arrival_rate, service_rate))
-    env.run(until=10000000)
+    W_estimator = MSEREstimator()
+    env.process(setup(env, server, monitor, arrival_rate, service_rate, W_estimator))
+    # warm-up(MSER-5)을 제외한 W의 batch-means 신뢰구간 half width가 평균의 1% 이내가 될 때까지만 실행 (최대 10000000)
+    summary = run_with_batch_means(env, {"W": W_estimator}, relative_precision=0.01, check_interval=10000,
+                                   max_time=10000000)
+    print(summary)
+    warmup = W_estimator.warmup_time
 
     monitor.save_file(file_path + "/log.csv")
-    L_Q = monitor.calculate_L_Q()
-    L = monitor.calculate_L()
-    W = monitor.calculate_W()
-    W_Q = monitor.calculate_W_Q()
+    L_Q = monitor.calculate_L_Q(start_time=warmup)
+    L = monitor.calculate_L(start_time=warmup)
+    W = monitor.calculate_W(start_time=warmup)
+    W_Q = monitor.calculate_W_Q(start_time=warmup)
     print("average number of customers in queue(L_Q): {0}".format(L_Q))
     print("average number of customers in system(L): {0}".format(L))
     print("average time customer spends in system(W): {0}".format(W))
-    print("average time customer spends in queue(W_Q): {0}".format(W_Q))
\ No newline at end of file
+    print("average time customer spends in queue(W_Q): {0}".format(W_Q))
+
+    # Example 2
+    # variance reduction with short replications: antithetic pairs and control variates(known input means)
+    plain = pd.DataFrame([replication(k, arrival_rate, service_rate) for k in range(20)])
+    antithetic = pd.DataFrame([replication(k, arrival_rate, service_rate, antithetic=True) for k in range(20)])
+    # variance reduction은 모두 같은 수의 독립 replication(crude)과 비교 - 쌍 평균에 대한 control variate는 2n개 기준
+    pair = antithetic_estimate(plain["W"], antithetic["W"])
+    estimates = pd.DataFrame({
+        "antithetic": pair,
+        "control variate": control_variate_estimate(plain["W"], plain[["IAT", "service"]],
+                                                    [1/arrival_rate, 1/service_rate]),
+        "antithetic + control variate": control_variate_estimate(
+            (plain["W"] + antithetic["W"]) / 2, (plain[["IAT", "service"]] + antithetic[["IAT", "service"]]) / 2,
+            [1/arrival_rate, 1/service_rate], variance_crude=pair["variance_crude"])})
+    print(estimates.loc[["mean", "half_width", "variance_reduction"]])
@@ -3,19 +3,22 @@ import simpy
 
 from scipy.stats import *
 from postprocessing import Monitor
+from C_SimComponent.OutputAnalysis import MSEREstimator
+from C_SimComponent.Experiment import run_with_batch_means
 
 
-def setup(env, server, monitor, arrival_rate, service_time_mean, service_time_std):
+def setup(env, server, monitor, arrival_rate, service_time_mean, service_time_std, estimator=None):
     i = 0
     while True:
         IAT = expon.rvs(scale=1 / arrival_rate)
         yield env.timeout(IAT)
         monitor.record(i, env.now, "queue_entered")
-        env.process(model(i, env, server, monitor, service_time_mean, service_time_std))
+        env.process(model(i, env, server, monitor, service_time_mean, service_time_std, estimator))
         i += 1
 
 
-def model(id, env, server, monitor, service_time_mean, service_time_std):
+def model(id, env, server, monitor, service_time_mean, service_time_std, estimator=None):
+    arrival = env.now
     with server.request() as req:
         yield req
         monitor.record(id, env.now, "queue_released")
@@ -24,10 +27,12 @@ def model(id, env, server, monitor, service_time_mean, service_time_std):
         upper = service_time_mean + service_time_mean
         service_time = truncnorm.rvs((lower - service_time_mean) / service_time_std,
                                      (upper - service_time_mean) / service_time_std,
-                                     loc=service_time_mean, scale=service_time_std)[0]
+                                     loc=service_time_mean, scale=service_time_std)
         monitor.record(id, env.now, "service_started")
         yield env.timeout(service_time)
         monitor.record(id, env.now, "service_finished")
+        if estimator is not None:
+            estimator.observe(env.now - arrival, env.now)
 
 
 if __name__ == "__main__":
@@ -42,14 +47,19 @@ if __name__ == "__main__":
     env = simpy.Environment()
     server = simpy.Resource(env, capacity=3)
     monitor = Monitor()
-    env.process(setup(env, server, monitor, arrival_rate, service_time_mean, service_time_std))
-    env.run(until=10000000)
+    W_estimator = MSEREstimator()
+    env.process(setup(env, server, monitor, arrival_rate, service_time_mean, service_time_std, W_estimator))
+    # warm-up(MSER-5)을 제외한 W의 batch-means 신뢰구간 half width가 평균의 1% 이내가 될 때까지만 실행 (최대 10000000)
+    summary = run_with_batch_means(env, {"W": W_estimator}, relative_precision=0.01, check_interval=10000,
+                                   max_time=10000000)
+    print(summary)
+    warmup = W_estimator.warmup_time
 
     monitor.save_file(file_path + "/log.csv")
-    L_Q = monitor.calculate_L_Q()
-    L = monitor.calculate_L()
-    W = monitor.calculate_W()
-    W_Q = monitor.calculate_W_Q()
+    L_Q = monitor.calculate_L_Q(start_time=warmup)
+    L = monitor.calculate_L(start_time=warmup)
+    W = monitor.calculate_W(start_time=warmup)
+    W_Q = monitor.calculate_W_Q(start_time=warmup)
     print("average number of customers in queue(L_Q): {0}".format(L_Q))
     print("average number of customers in system(L): {0}".format(L))
     print("average time customer spends in system(W): {0}".format(W))
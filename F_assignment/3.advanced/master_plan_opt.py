@@ -6,60 +6,99 @@ import matplotlib.pyplot as plt
 
 from datetime import datetime
 from SimComponent.SimComponents import Source, Sink, Process, Monitor, Part
-from PostProcessing import cal_utilization
-
-
-def optimimze(process_list, parts):
-
-    # initialize the number of servers(sub-processes) and utilization
-    server_num = np.full(len(process_list), 1)
-    utilization = np.ones(len(process_list))
-
-    # repeat the simulation and adjust the number of servers
-    while np.any(utilization > 0.9):
-
-        # modeling the source, process, and monitor
-        env = simpy.Environment()
-        model = {}
-        monitor = Monitor('../result/event_log_master_plan_opt.csv')
-        source = Source(env, parts[:], model, monitor)
-        for i in range(len(process_list) + 1):
-            if i == len(process_list):
-                model['Sink'] = Sink(env, monitor)
-            else:
-                model[process_list[i]] = Process(env, process_list[i], server_num[i], model, monitor)
-
-        # run the simulation
-        simulation_start = time.time()
-        env.run()
-        simulation_finish = time.time()
-        print("simulation time: {0}".format(simulation_finish - simulation_start))
-        monitor.save_event_tracer()
-
-        # calculate the utilization
-        log = pd.read_csv('../result/event_log_master_plan_opt.csv')
-        for i in range(len(process_list)):
-            utilization[i], _, _ = cal_utilization(log, name=process_list[i], type="Process", num=server_num[i],
-                                                   start_time=0.0, finish_time=model["Sink"].last_arrival)
-
-        # if the utilization is higher than 0.9, increase the number of servers in the corresponding process
-        idx_up = utilization > 0.9
-        server_num[idx_up] += 1
-
-        for part in parts:
-            part.step = 0
-
-    return server_num, utilization
+from PostProcessing import EventLog, cal_process_metrics, cal_leadtime
+from MaxPlus import MaxPlusSchedule
+from Optimization import ServerOptimizer
+from Metamodel import Metamodel
+from InputCache import read_excel_cached
+
+
+# simulation 실행에 필요한 데이터 (worker process마다 한 번만 전달)
+_process_list = None
+_parts = None
+_schedule = None
+
+
+def _init_worker(process_list, parts):
+    global _process_list, _parts, _schedule
+    _process_list = process_list
+    _parts = parts
+    _schedule = MaxPlusSchedule.from_routings([part.data for part in parts], process_list)
+
+
+def evaluate(server_num):
+    # deterministic plan -> max-plus evaluation (no SimPy processes)
+    return _schedule.kpis(server_num)
+
+
+def evaluate_simpy(server_num):
+    # modeling the source, process, and monitor
+    env = simpy.Environment()
+    model = {}
+    monitor = Monitor('../result/event_log_master_plan_opt.csv')
+    source = Source(env, _parts[:], model, monitor)
+    for i in range(len(_process_list) + 1):
+        if i == len(_process_list):
+            model['Sink'] = Sink(env, monitor)
+        else:
+            model[_process_list[i]] = Process(env, _process_list[i], server_num[i], model, monitor)
+
+    # run the simulation
+    env.run()
+    for part in _parts:
+        part.step = 0
+
+    # calculate the KPIs from the in-memory event log (no csv round trip)
+    log = pd.DataFrame({"Time": monitor.time, "Event": monitor.event, "Part": monitor.part,
+                        "Process": monitor.process_name, "Machine": monitor.machine_name})
+    log = EventLog(log)
+    finish_time = model["Sink"].last_arrival
+    metrics = cal_process_metrics(log, _process_list, server_num=server_num,
+                                  start_time=0.0, finish_time=finish_time, n_jobs=1)
+    leadtime = cal_leadtime(log, mode="m", start_time=0.0, finish_time=finish_time)
+
+    return {"utilization": metrics["Utilization"].values, "leadtime": leadtime}
+
+
+def optimimze(process_list, parts, utilization_limit=0.9, leadtime_limit=None, n_jobs=None, fast=True):
+    # per-process bisection + genetic search (total number of servers 최소화)
+    optimizer = ServerOptimizer(evaluate if fast else evaluate_simpy, len(process_list), utilization_limit=utilization_limit,
+                                leadtime_limit=leadtime_limit, n_jobs=n_jobs,
+                                initializer=_init_worker, initargs=(process_list, parts))
+    optimization_start = time.time()
+    try:
+        server_num, kpi = optimizer.optimize()
+    finally:
+        optimizer.close()
+    optimization_finish = time.time()
+    print("optimization time: {0} ({1} evaluations)".format(optimization_finish - optimization_start,
+                                                            optimizer.num_simulations))
+
+    return server_num, kpi["utilization"], optimizer.cache
+
+
+def simulate(**point):
+    # what-if 시뮬레이션: point = {"server_<process>": server 수}
+    kpi = evaluate([int(point["server_" + name]) for name in _process_list])
+    return {"leadtime": kpi["leadtime"], "max_utilization": np.max(kpi["utilization"])}
+
+
+def whatif_model(process_list, evaluated):
+    # optimization 중 시뮬레이션한 모든 configuration으로 metamodel 초기화
+    metamodel = Metamodel(simulate, ["server_" + name for name in process_list], kpis=["leadtime", "max_utilization"])
+    for server_num, kpi in evaluated.items():
+        metamodel.observe(dict(zip(metamodel.parameters, server_num)),
+                          {"leadtime": kpi["leadtime"], "max_utilization": np.max(kpi["utilization"])})
+    return metamodel
 
 
 if __name__ == "__main__":
     preprocessing_start = time.time()
 
-    # import raw data
-    raw_data = pd.read_excel("../data/master_planning.xlsx", engine="openpyxl")
-
-    # select the columns containing essesntial information to run simulation
-    data_selected = raw_data[["PROJECTNO", "LOCATIONCODE", "ACTIVITYCODE", "PLANSTARTDATE", "PLANDURATION"]]
+    # import raw data, selecting the columns containing essesntial information to run simulation
+    # (the workbook is parsed once and later runs load the cached columns)
+    data_selected = read_excel_cached("../data/master_planning.xlsx", engine="openpyxl",
+                                      columns=["PROJECTNO", "LOCATIONCODE", "ACTIVITYCODE", "PLANSTARTDATE", "PLANDURATION"])
 
     # set the block id(part id) as the project number + location code
     data_selected["BLOCKID"] = data_selected["PROJECTNO"] + data_selected["LOCATIONCODE"]
@@ -108,7 +147,20 @@ if __name__ == "__main__":
     print("preprocessing time: {0}".format(preprocessing_finish - preprocessing_start))
 
     # find the optimal number of sub-processes for each process
-    server_num, utilization = optimimze(process_list, parts)
+    server_num, utilization, evaluated = optimimze(process_list, parts)
+
+    # cross-validate the max-plus evaluation of the optimum with the SimPy simulation
+    _init_worker(process_list, parts)
+    kpi_maxplus, kpi_simpy = evaluate(server_num), evaluate_simpy(server_num)
+    print("max-plus vs SimPy - max utilization difference: {0}, leadtime: {1} / {2}".format(
+        np.max(np.abs(kpi_maxplus["utilization"] - kpi_simpy["utilization"])), kpi_maxplus["leadtime"], kpi_simpy["leadtime"]))
+
+    # what-if query: one more server in the busiest process (answered by the surrogate when it is confident)
+    whatif = whatif_model(process_list, evaluated)
+    point = {"server_" + name: num for name, num in zip(process_list, server_num)}
+    point["server_" + process_list[int(np.argmax(utilization))]] += 1
+    kpi, source = whatif(**point)
+    print("what-if ({0}): {1}".format(source, kpi))
 
     # graph the results of optimization
     fig, ax1 = plt.subplots()
@@ -0,0 +1,27 @@
+import os
+import sys
+import importlib.util
+
+import pytest
+
+# C_SimComponent의 모듈은 flat import(from SimComponents import ...)를 사용
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'C_SimComponent'))
+
+
+@pytest.fixture(scope="session")
+def legacy(tmp_path_factory):
+    # E_shipbuilding 스크립트가 사용하는 (문자열 event를 기록하는) 이전 SimComponents 모델
+    # import 시 '../result' 폴더를 만들므로 임시 폴더에서 load
+    run = tmp_path_factory.mktemp("legacy") / "run"
+    run.mkdir()
+    cwd = os.getcwd()
+    os.chdir(str(run))
+    try:
+        spec = importlib.util.spec_from_file_location("legacy_SimComponents",
+                                                      os.path.join(ROOT, 'G_archive', 'SimComponents.py'))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.chdir(cwd)
+    return module
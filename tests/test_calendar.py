@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from Calendar import WorkingCalendar
+
+
+@pytest.fixture
+def calendar():
+    # 주간 2개 shift와 자정 이후까지 이어지는 야간 shift, 주말과 공휴일 휴무, 시간 단위: 일
+    return WorkingCalendar('2020-03-02 06:00', '2020-06-30', shifts=((8, 12), (13, 17), (22, 30)),
+                           holidays=['2020-04-15', '2020-05-05'])
+
+
+def test_origin_within_a_shift():
+    # origin 이전에 시작한 shift의 근무 시간은 포함하지 않음 (10:00 origin, 08:00-10:00 제외)
+    calendar = WorkingCalendar('2020-03-03 10:00', '2020-03-10', shifts=((8, 17),))
+    assert calendar.working_time(0.0) == 0.0
+    assert calendar.working_time(7.0 / 24) == pytest.approx(7.0)
+    assert calendar.calendar_time(7.0) == pytest.approx(7.0 / 24)
+
+
+def test_working_time_round_trip(calendar):
+    rng = np.random.default_rng(0)
+    working = np.sort(rng.uniform(0, calendar.total_hours, 1000))
+    time = calendar.calendar_time(working)
+    np.testing.assert_allclose(calendar.working_time(time), working, atol=1e-9)
+    assert np.all(np.diff(time) >= 0)
+
+
+def test_calendar_time_is_earliest(calendar):
+    # 근무 구간의 끝에서는 다음 근무 구간의 시작이 아니라 구간의 끝을 반환
+    working = calendar.cumulative[1:10]
+    np.testing.assert_allclose(calendar.calendar_time(working) * calendar.time_unit, calendar.end[:9])
+
+
+def test_delay_matches_conversions(calendar):
+    rng = np.random.default_rng(1)
+    for now, hours in zip(rng.uniform(0, 100, 200), rng.uniform(0.1, 40, 200)):
+        finish = calendar.calendar_time(calendar.working_time(now) + hours)
+        assert now + calendar.delay(now, hours) == pytest.approx(finish, abs=1e-9)
+    assert calendar.delay(10.0, 0.0) == 0.0
+
+
+def test_weekend_and_holidays_are_not_worked(calendar):
+    # 전날 시작한 야간 shift가 끝나는 06:00부터 다음 근무일 06:00까지 근무 시간이 없음
+    day = lambda date: (np.datetime64(date) - np.datetime64('2020-03-02T06:00')) / np.timedelta64(1, 'D')
+    assert calendar.working_time(day('2020-03-09T06:00')) == pytest.approx(calendar.working_time(day('2020-03-07T06:00')))
+    assert calendar.working_time(day('2020-04-16T06:00')) == pytest.approx(calendar.working_time(day('2020-04-15T06:00')))
+    # 평일 하루의 근무 시간: 4 + 4 + 8
+    assert calendar.working_time(day('2020-04-17T06:00')) - calendar.working_time(day('2020-04-16T06:00')) == pytest.approx(16.0)
+
+
+def test_beyond_calendar_end(calendar):
+    with pytest.raises(ValueError):
+        calendar.calendar_time(calendar.total_hours + 1)
+    with pytest.raises(ValueError):
+        calendar.delay(0.0, calendar.total_hours + 1)
+
+
+def test_to_date_round_trip(calendar):
+    time = np.array([0.0, 0.25, 3.5, 47.125])
+    date = calendar.to_date(time)
+    assert date[0] == calendar.origin
+    np.testing.assert_allclose((date - calendar.origin) / np.timedelta64(1, 'h') / calendar.time_unit, time)
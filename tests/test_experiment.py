@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Experiment import ocba_allocation, run_replications, run_sweep, select_best
+from SimComponents import RandomStreams
+
+GRID = {"capacity": [1, 2, 3], "IAT": [5.0, 7.5]}
+
+
+def model(capacity, IAT):
+    return {"throughput": capacity / IAT, "wip": capacity * IAT}
+
+
+def normal_kpi(seed_seq, mean=0.0):
+    return {"value": mean + RandomStreams(seed_seq).stream("value").normal()}
+
+
+def constant_kpi(seed_seq, mean=0.0):
+    return {"value": mean}
+
+
+def test_run_sweep_resumes_interrupted_sweep(tmp_path):
+    filepath = str(tmp_path / "sweep" / "result.csv")
+    calls = []
+
+    def interrupted(capacity, IAT):
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        calls.append((capacity, IAT))
+        return model(capacity, IAT)
+
+    with pytest.raises(KeyboardInterrupt):
+        run_sweep(interrupted, GRID, filepath=filepath, n_jobs=1)
+    assert len(pd.read_csv(filepath)) == 3
+
+    # 저장된 point는 다시 실행하지 않음
+    resumed = []
+    result = run_sweep(lambda **point: resumed.append(point) or model(**point), GRID, filepath=filepath, n_jobs=1)
+    assert len(resumed) == 3
+    assert not set(calls) & set((point["capacity"], point["IAT"]) for point in resumed)
+
+    expected = run_sweep(model, GRID, n_jobs=1)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert len(pd.read_csv(filepath)) == 6
+
+
+def test_run_sweep_on_result(tmp_path):
+    rows = []
+    result = run_sweep(model, GRID, n_jobs=1, on_result=rows.append)
+    assert len(rows) == len(result) == 6
+    assert list(result.columns) == ["capacity", "IAT", "throughput", "wip"]
+
+
+def test_run_replications_is_reproducible():
+    kpis, summary = run_replications(normal_kpi, 20, seed=7, n_jobs=1)
+    again, _ = run_replications(normal_kpi, 20, seed=7, n_jobs=1)
+    pd.testing.assert_frame_equal(kpis, again)
+    assert summary.loc["value", "n"] == 20
+    assert summary.loc["value", "lower"] < summary.loc["value", "mean"] < summary.loc["value", "upper"]
+
+
+def test_ocba_allocation():
+    means, stds, n = np.array([1.0, 1.2, 3.0]), np.array([1.0, 1.0, 1.0]), np.array([10, 10, 10])
+    additional = ocba_allocation(means, stds, n, 30)
+    assert additional.sum() == 30
+    # 명백히 나쁜 대안에는 거의 배정하지 않음
+    assert additional[2] < additional[0] and additional[2] < additional[1]
+    # 변동이 없는 대안들은 replication을 더 해도 순위가 바뀌지 않음
+    assert ocba_allocation(means, np.zeros(3), n, 30).sum() == 0
+
+
+def test_select_best():
+    alternatives = {"a": {"mean": 0.0}, "b": {"mean": 1.5}, "c": {"mean": 3.0}}
+    best, summary, pcs = select_best(normal_kpi, alternatives, "value", initial=5, seed=1, n_jobs=1)
+    assert best == "a" and pcs >= 0.95
+    best, summary, _ = select_best(normal_kpi, alternatives, "value", minimize=False, initial=5, seed=1, n_jobs=1)
+    assert best == "c"
+
+    # 결정론적 모델은 초기 replication 후 종료
+    best, summary, _ = select_best(constant_kpi, alternatives, "value", initial=3, seed=1, n_jobs=1)
+    assert best == "a" and summary["n"].tolist() == [3, 3, 3]
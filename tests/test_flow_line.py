@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import simpy
+
+from EventSchema import EventType, to_event_codes
+from FlowLine import flow_line, is_flow_line, simulate_flow_line, simultaneous_arrivals
+
+PROCESS_LIST = ['Assembly', 'Outfitting', 'Painting']
+
+
+def routing_table(n, integer, seed=5, zero=False):
+    # block_transfer_fitting과 같은 형태의 routing table (integer: 일 단위 데이터, 동시 event가 많음)
+    rng = np.random.default_rng(seed)
+    columns = pd.MultiIndex.from_product([range(len(PROCESS_LIST) + 1), ['start_time', 'process_time', 'process']])
+    data = pd.DataFrame(index=range(n), columns=columns)
+    gap = rng.chisquare(1.5, n) * 0.22
+    data[(0, 'start_time')] = (np.floor(gap) if integer else gap).cumsum()
+    for i, name in enumerate(PROCESS_LIST):
+        if i > 0:
+            data[(i, 'start_time')] = 0
+        time = rng.exponential(4 + 2 * i, n)
+        data[(i, 'process_time')] = np.round(time) + (0 if zero else 1) if integer else time
+        data[(i, 'process')] = name
+    data[(3, 'start_time')], data[(3, 'process_time')], data[(3, 'process')] = None, None, 'Sink'
+    return data
+
+
+def simulate(legacy, data, server_num, tmp_path):
+    parts = [legacy.Part(i, {field: [data.loc[i, (step, field)] for step in range(len(PROCESS_LIST) + 1)]
+                             for field in ['start_time', 'process_time', 'process']}) for i in data.index]
+    env = simpy.Environment()
+    model = {}
+    monitor = legacy.Monitor(str(tmp_path / 'log.csv'))
+    legacy.Source(env, parts, model, monitor)
+    for name, num in zip(PROCESS_LIST, server_num):
+        model[name] = legacy.Process(env, name, num, model, monitor)
+    model['Sink'] = legacy.Sink(env, monitor)
+    env.run()
+    log = pd.DataFrame({'Time': monitor.time, 'Event': monitor.event, 'Part': monitor.part,
+                        'Process': monitor.process_name, 'Machine': monitor.machine_name})
+    return to_event_codes(log), model['Sink'].last_arrival
+
+
+def assert_same_events(log, event_tracer):
+    keys = ['Part', 'Process', 'Event']
+    a = log.sort_values(keys, kind='stable').reset_index(drop=True)
+    b = event_tracer.sort_values(keys, kind='stable').reset_index(drop=True)
+    assert len(a) == len(b)
+    assert (a[keys].values == b[keys].values).all()
+    np.testing.assert_allclose(a['Time'].astype(float), b['Time'].astype(float), rtol=0, atol=1e-9)
+    assert (a['Machine'].fillna('').values == b['Machine'].fillna('').values).all()
+
+
+def test_is_flow_line():
+    data = routing_table(10, integer=True)
+    assert is_flow_line(data, PROCESS_LIST)
+    data.loc[3, (1, 'process')] = 'Painting'
+    assert not is_flow_line(data, PROCESS_LIST)
+
+
+def test_continuous_times_match_simpy(legacy, tmp_path):
+    data = routing_table(1000, integer=False)
+    for server_num in ([2, 3, 2], [1, 1, 1]):
+        event_tracer, last_arrival = simulate_flow_line(data, PROCESS_LIST, server_num)
+        assert event_tracer is not None
+        log, simpy_last_arrival = simulate(legacy, data, server_num, tmp_path)
+        assert_same_events(log, event_tracer)
+        assert np.isclose(last_arrival, simpy_last_arrival)
+
+
+def test_tied_data_falls_back_to_simpy(legacy, tmp_path):
+    # 일 단위 데이터에서 여러 server가 있으면 같은 시각에 한 공정에 도착하는 part가 생김
+    data = routing_table(1000, integer=True)
+    for server_num in ([2, 3, 2], [2, 2, 2]):
+        event_tracer, last_arrival = simulate_flow_line(data, PROCESS_LIST, server_num)
+        assert event_tracer is None and last_arrival is None
+        _, finish, _ = flow_line(data[(0, 'start_time')].astype(float).values,
+                                 data[[(i, 'process_time') for i in range(3)]].astype(float).values, server_num)
+        assert simultaneous_arrivals(finish)
+
+
+def test_tied_releases_match_simpy(legacy, tmp_path):
+    # 같은 시각의 투입은 Source의 list 순서대로 처리되므로 fast path에서도 SimPy와 같은 결과
+    data = routing_table(1000, integer=True)
+    assert data[(0, 'start_time')].duplicated().any()
+    event_tracer, last_arrival = simulate_flow_line(data, PROCESS_LIST, [1, 1, 1])
+    assert event_tracer is not None
+    log, simpy_last_arrival = simulate(legacy, data, [1, 1, 1], tmp_path)
+    assert_same_events(log, event_tracer)
+    assert last_arrival == simpy_last_arrival
+
+
+def test_zero_process_times_match_simpy(legacy, tmp_path):
+    # 작업 시간이 0인 작업은 Work Start / Finish 없이 다음 공정으로 이동
+    # (대기 후 시작하면 이전 작업과 동시에 다음 공정에 도착하므로 대기가 거의 없는 투입 간격 사용)
+    data = routing_table(500, integer=False)
+    data[(0, 'start_time')] = data[(0, 'start_time')] * 100
+    data.loc[data.index[::20], (1, 'process_time')] = 0.0
+    event_tracer, _ = simulate_flow_line(data, PROCESS_LIST, [3, 3, 3])
+    assert event_tracer is not None
+    log, _ = simulate(legacy, data, [3, 3, 3], tmp_path)
+    assert_same_events(log, event_tracer)
+    assert not ((event_tracer['Process'] == 'Outfitting') & (event_tracer['Event'] == EventType.WORK_START)
+                & event_tracer['Part'].isin(data.index[::20])).any()
+
+
+def test_part_released_events():
+    data = routing_table(50, integer=False)
+    event_tracer, _ = simulate_flow_line(data, PROCESS_LIST, [2, 2, 2])
+    released = event_tracer[event_tracer['Event'] == EventType.PART_RELEASED]
+    created = event_tracer[event_tracer['Event'] == EventType.PART_CREATED]
+    assert len(released) == len(data)
+    assert (released.set_index('Part')['Time'].sort_index() == created.set_index('Part')['Time'].sort_index()).all()
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from FlowLine import flow_line
+from MaxPlus import IncrementalSchedule, MaxPlusSchedule
+
+PROCESS_LIST = ['A', 'B', 'C', 'D']
+SERVER_NUM = [2, 3, 1, 2]
+
+
+def plan(n, seed=0):
+    # 연속 시간 plan (동시 도착 없음): part마다 공정 순서와 길이가 다름
+    rng = np.random.default_rng(seed)
+    release = np.cumsum(rng.exponential(1.0, n))
+    routes, process_times = [], []
+    for _ in range(n):
+        route = list(rng.permutation(PROCESS_LIST)[:rng.integers(1, len(PROCESS_LIST) + 1)])
+        routes.append(route)
+        process_times.append(list(rng.exponential(1.5, len(route))))
+    return release, routes, process_times
+
+
+def schedule(release, routes, process_times, ids):
+    return MaxPlusSchedule(release, routes, process_times, PROCESS_LIST, ids=ids)
+
+
+def test_serial_line_matches_flow_line():
+    rng = np.random.default_rng(1)
+    n, k = 300, len(PROCESS_LIST)
+    release = np.cumsum(rng.exponential(1.0, n))
+    process_time = rng.exponential(1.5, (n, k))
+    line = MaxPlusSchedule(release, [PROCESS_LIST] * n, process_time.tolist(), PROCESS_LIST)
+    for routing_logic in ['cyclic', 'fifo']:
+        start, finish, completion = line.evaluate(SERVER_NUM, routing_logic=routing_logic)
+        expected_start, expected_finish, _ = flow_line(release, process_time, SERVER_NUM, routing_logic=routing_logic)
+        np.testing.assert_allclose(start.reshape(n, k), expected_start, rtol=0, atol=1e-9)
+        np.testing.assert_allclose(finish.reshape(n, k), expected_finish, rtol=0, atol=1e-9)
+        np.testing.assert_allclose(completion, expected_finish[:, -1], rtol=0, atol=1e-9)
+
+
+def edit(release, routes, process_times, ids, kind, i):
+    release, routes, process_times, ids = list(release), list(routes), [list(t) for t in process_times], list(ids)
+    if kind == "time":
+        process_times[i][0] *= 2
+    elif kind == "route":
+        routes[i], process_times[i] = ['D', 'A'], [0.5, 0.7]
+    elif kind == "remove":
+        del release[i], routes[i], process_times[i], ids[i]
+    elif kind == "insert":
+        release.insert(i, release[i]), routes.insert(i, ['B', 'C']), process_times.insert(i, [1.0, 2.0])
+        ids.insert(i, "new")
+    return release, routes, process_times, ids
+
+
+@pytest.mark.parametrize("routing_logic", ['cyclic', 'fifo'])
+@pytest.mark.parametrize("kind", ["time", "route", "remove", "insert"])
+@pytest.mark.parametrize("position", [0.05, 0.8])
+def test_incremental_matches_full_evaluate(routing_logic, kind, position):
+    n = 1000
+    release, routes, process_times = plan(n)
+    ids = list(range(n))
+    incremental = IncrementalSchedule(SERVER_NUM, routing_logic=routing_logic, checkpoint_every=100)
+    incremental.evaluate(schedule(release, routes, process_times, ids))
+
+    new = schedule(*edit(release, routes, process_times, ids, kind, int(position * n)))
+    result = incremental.evaluate(new)
+    expected = new.evaluate(SERVER_NUM, routing_logic=routing_logic)
+    for value, reference in zip(result, expected):
+        np.testing.assert_array_equal(value, reference)
+    if position > 0.5:
+        # 나중의 변경은 마지막 일부만 다시 계산
+        assert incremental.resimulated < 0.5
+
+
+def test_incremental_edits_in_sequence():
+    n = 600
+    release, routes, process_times = plan(n, seed=3)
+    ids = list(range(n))
+    incremental = IncrementalSchedule(SERVER_NUM, checkpoint_every=50)
+    incremental.evaluate(schedule(release, routes, process_times, ids))
+
+    # 변경하지 않은 plan은 다시 계산하지 않음
+    incremental.evaluate(schedule(release, routes, process_times, ids))
+    assert incremental.resimulated == 0.0
+
+    rng = np.random.default_rng(4)
+    for kind in ["time", "insert", "route", "remove", "time"]:
+        release, routes, process_times, ids = edit(release, routes, process_times, ids, kind,
+                                                   int(rng.integers(0, len(ids))))
+        new = schedule(release, routes, process_times, ids)
+        result = incremental.evaluate(new)
+        for value, reference in zip(result, new.evaluate(SERVER_NUM)):
+            np.testing.assert_array_equal(value, reference)
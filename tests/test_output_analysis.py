@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from OutputAnalysis import BatchMeans, MSEREstimator, confidence_interval, mser
+
+
+def ar1(n, rho=0.8, mean=10.0, start=0.0, seed=0):
+    # 평균이 mean인 AR(1) 과정 (start에서 시작하면 초기 transient가 생김)
+    rng = np.random.default_rng(seed)
+    values = np.empty(n)
+    x = start - mean
+    for i in range(n):
+        x = rho * x + rng.normal()
+        values[i] = mean + x
+    return values
+
+
+def test_confidence_interval():
+    mean, half_width = confidence_interval([1.0, 2.0, 3.0, 4.0])
+    assert mean == 2.5
+    assert half_width == pytest.approx(3.182446 * np.std([1, 2, 3, 4], ddof=1) / 2, rel=1e-5)
+    assert confidence_interval([1.0])[1] == np.inf
+
+
+def test_batch_means_keeps_num_batches():
+    estimator = BatchMeans(num_batches=8)
+    values = ar1(10000)
+    for value in values:
+        estimator.observe(value)
+    assert estimator.num_batches <= len(estimator.batches) < 2 * estimator.num_batches
+    assert len(estimator.batches) * estimator.batch_size <= estimator.n
+    mean, half_width = estimator.confidence_interval()
+    assert abs(mean - 10.0) < half_width
+
+
+def test_mser_detects_warmup():
+    values = ar1(2000, start=-40.0)
+    warmup = mser(values)
+    # 초기값 -40에서 평균 10까지 (0.8^k * 50 < 1: 약 20개 관측)
+    assert 10 <= warmup <= 100
+    assert warmup % 5 == 0
+
+
+def test_mser_ignores_short_tail():
+    # 마지막 몇 개의 관측이 평균에 가까워도 truncation 지점은 앞쪽 절반에서만 선택
+    values = np.concatenate([ar1(400, seed=1), np.full(10, 10.0)])
+    assert mser(values) <= len(values) // 2
+    assert mser(np.arange(5.0)) == 0
+
+
+def test_mser_estimator_matches_mser():
+    values = ar1(3000, start=-40.0, seed=2)
+    estimator = MSEREstimator(batch_size=5, num_batches=20)
+    for i, value in enumerate(values):
+        estimator.observe(value, time=float(i))
+    assert 0 < estimator.warmup <= 100
+    assert estimator.warmup_time == estimator.warmup - 1
+    mean, half_width = estimator.confidence_interval()
+    assert np.isfinite(half_width) and abs(mean - 10.0) < 2 * half_width
@@ -0,0 +1,88 @@
+import os
+
+import pandas as pd
+import pytest
+
+import PostProcessing
+from EventSchema import EventType
+from PostProcessing import EventLog, cal_leadtime, cal_utilization, disable_cache, enable_cache
+from ResultCache import ResultCache
+
+
+def event_log(shift=0.0):
+    # M1에서 두 part가 [0, 4], [5 + shift, 8] 동안 작업
+    rows = [(0.0, EventType.PART_CREATED, "p1", "Source"), (0.0, EventType.WORK_START, "p1", "M1"),
+            (4.0, EventType.WORK_FINISH, "p1", "M1"), (4.0, EventType.PART_COMPLETED, "p1", "Sink"),
+            (1.0, EventType.PART_CREATED, "p2", "Source"), (5.0 + shift, EventType.WORK_START, "p2", "M1"),
+            (8.0, EventType.WORK_FINISH, "p2", "M1"), (8.0, EventType.PART_COMPLETED, "p2", "Sink")]
+    log = pd.DataFrame(rows, columns=["Time", "Event", "Part", "Process"]).sort_values("Time", kind="stable")
+    return log.assign(Machine=None).reset_index(drop=True)
+
+
+def entries(cache):
+    return sorted(name for name in os.listdir(cache.cache_dir) if name.endswith('.pkl'))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    yield enable_cache(cache_dir=str(tmp_path / "cache"))
+    disable_cache()
+
+
+def test_hit_and_miss(tmp_path):
+    cache = ResultCache(cache_dir=str(tmp_path / "cache"))
+    calls = []
+
+    @cache
+    def count(log, column, scale=1):
+        calls.append(column)
+        return len(log.data if isinstance(log, EventLog) else log) * scale
+
+    log = event_log()
+    assert count(log, "Part") == count(log, "Part") == 8
+    assert count(EventLog(log), "Part") == 8  # 내용이 같은 EventLog
+    assert count(log, "Part", scale=2) == 16
+    assert count(event_log(shift=0.5), "Part") == 8  # 내용이 바뀐 log
+    assert len(calls) == 3
+
+    filepath = str(tmp_path / "event_log.csv")
+    log.to_csv(filepath, index=False)
+    count(filepath, "Part"), count(filepath, "Part")
+    assert len(calls) == 4
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(cache_dir=str(tmp_path / "cache"), max_size=2500)
+    for i in range(5):
+        cache.put("key{0}".format(i), bytes(1000))
+        os.utime(cache._path("key{0}".format(i)), (i, i))
+    assert cache.get("key0") == (None, False)
+    assert cache.get("key4")[1]
+    assert sum(os.path.getsize(cache._path(key)) for key in ["key3", "key4"]) <= 2500
+    cache.clear()
+    assert entries(cache) == []
+
+
+def test_memoized_metrics(cache):
+    log = event_log()
+    utilization, idle, working = cal_utilization(log, "M1", "Process", 1, 0.0, 8.0)
+    assert (utilization, idle, working) == (7.0 / 8.0, 1.0, 7.0)
+    assert cal_leadtime(log, mode="m", finish_time=10.0) == 5.5
+    assert len(entries(cache)) == 2
+    assert cal_utilization(log, "M1", "Process", 1, 0.0, 8.0) == (utilization, idle, working)
+    assert len(entries(cache)) == 2
+
+
+@pytest.mark.parametrize("display", ["keyword", "positional"])
+def test_graph_output_is_not_cached(cache, monkeypatch, display):
+    # display / save가 켜지면 위치 인자로 전달되어도 항상 계산 (그래프 출력)
+    drawn = []
+    monkeypatch.setattr(PostProcessing, "graph", lambda *args, **kwargs: drawn.append(kwargs["title"]))
+    log = event_log()
+    for _ in range(2):
+        if display == "keyword":
+            cal_utilization(log, "M1", "Process", 1, 0.0, 8.0, 4, display=True)
+        else:
+            cal_utilization(log, "M1", "Process", 1, 0.0, 8.0, 4, True)
+    assert len(drawn) == 2
+    assert entries(cache) == []
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Flexible_jobshop import build_model
+from SimComponents import EventType, Part, RandomStreams
+
+NAMES = ['M1', 'M2', 'M3', 'M4', 'M5']
+
+
+def network():
+    # 5개 process의 격자 배치 (Manhattan 거리)
+    xy = np.array([[0, 0], [0, 10], [20, 0], [20, 10], [20, 20]], dtype=float)
+    return pd.DataFrame(np.abs(xy[:, None, :] - xy[None, :, :]).sum(axis=2), index=NAMES, columns=NAMES)
+
+
+def tp_info(speed):
+    return {"TP_{0}".format(i): {"capa": 100, "v_loaded": speed, "v_unloaded": 2 * speed} for i in range(3)}
+
+
+@pytest.mark.parametrize("seed", [1, 3])
+def test_transporters_keep_throughput(seed, tmp_path):
+    # 이동 시간이 짧은 경우 transporter가 있어도 처리량이 거의 같아야 함 (출발지 자리를 붙잡고 있으면 gridlock)
+    until = 1000
+    filepath = str(tmp_path / "event_log.csv")
+    base, _ = build_model(filepath=filepath, until=until, streams=RandomStreams(seed), stochastic=True)
+    model, monitor = build_model(filepath=filepath, until=until, streams=RandomStreams(seed), stochastic=True,
+                                 tp_info=tp_info(4.0), network=network())
+    assert model['Sink'].parts_rec >= 0.9 * base['Sink'].parts_rec
+
+    # 마지막까지 이동이 계속 이루어짐
+    time, event = np.array(monitor.time), np.array(monitor.event)
+    assert time[event == EventType.LOADED_TRAVEL_FINISH].max() > 0.9 * until
+
+
+def test_slow_transporters_do_not_gridlock(tmp_path):
+    # 이동 시간이 긴 경우 처리량은 줄지만 process 간 순환 대기로 멈추지 않아야 함
+    until = 1000
+    model, monitor = build_model(filepath=str(tmp_path / "event_log.csv"), until=until, streams=RandomStreams(3),
+                                 stochastic=True, tp_info=tp_info(2.0), network=network())
+    time, event = np.array(monitor.time), np.array(monitor.event)
+    assert time[event == EventType.LOADED_TRAVEL_FINISH].max() > 0.9 * until
+    assert model['Sink'].parts_rec > 100
+
+
+def test_part_enters_when_loaded_travel_finishes(tmp_path):
+    model, monitor = build_model(filepath=str(tmp_path / "event_log.csv"), until=300, tp_info=tp_info(4.0),
+                                 network=network())
+    log = pd.DataFrame({"Time": monitor.time, "Event": monitor.event, "Part": monitor.part})
+    arrived = log[log["Event"] == EventType.LOADED_TRAVEL_FINISH].set_index("Part")["Time"]
+    entered = log[log["Event"] == EventType.PROCESS_ENTERED].groupby("Part")["Time"].apply(set)
+    assert len(arrived) > 0
+    for part, time in arrived.items():
+        assert time in entered[part]
+
+    # 예약한 자리는 모두 part로 교체되었거나 이동 중인 part의 것
+    in_transit = sum(1 for e in monitor.event if e == EventType.LOADED_TRAVEL_START) - len(arrived)
+    reserved = sum(1 for name in NAMES for x in model[name].in_part.items
+                   if x is not None and not isinstance(x, Part))
+    assert reserved >= in_transit >= 0
+
+
+def test_invalid_moves(tmp_path):
+    distance = network()
+    distance.loc['M1', 'M5'] = np.nan
+    model, monitor = build_model(filepath=str(tmp_path / "event_log.csv"), until=1, tp_info=tp_info(4.0),
+                                 network=distance)
+    fleet = model['Transporter']
+    part = type('Part', (), {"id": "part", "weight": 1})()
+    with pytest.raises(KeyError):
+        next(fleet.move(part, 'M1', 'Unknown'))
+    with pytest.raises(ValueError):
+        next(fleet.move(part, 'M1', 'M5'))
@@ -0,0 +1,48 @@
+import simpy
+
+from SimComponents import Workforce
+
+WF_INFO = {"junior": {"skill": 0.5}, "regular": {"skill": 1.0}, "expert": {"skill": 2.0},
+           "welder": {"skill": 1.0, "pool": "welding"}}
+
+
+def test_assignment_policy():
+    env = simpy.Environment()
+    lowest = Workforce(env, WF_INFO)
+    assert lowest.request(min_skill=0.8).value == "regular"
+    assert lowest.request().value == "junior"
+    assert lowest.request(pool="welding").value == "welder"
+
+    highest = Workforce(simpy.Environment(), WF_INFO, policy='highest')
+    assert highest.request(min_skill=0.8).value == "expert"
+    assert not highest.request(pool="welding", min_skill=1.5).triggered
+
+
+def test_released_worker_goes_to_oldest_qualified_request():
+    env = simpy.Environment()
+    workforce = Workforce(env, {"junior": {"skill": 0.5}, "expert": {"skill": 2.0}})
+    workforce.request(), workforce.request()  # 모든 worker가 작업 중
+    first = workforce.request(min_skill=1.0)
+    second = workforce.request(min_skill=0.0)
+    third = workforce.request(min_skill=0.0)
+
+    env.run(until=2.0)
+    workforce.release("junior")  # skill 부족: 두 번째 요청에 할당
+    assert not first.triggered and second.triggered and second.value == "junior"
+    workforce.release("expert")  # 가장 오래 기다린 첫 번째 요청에 할당
+    assert first.triggered and first.value == "expert" and not third.triggered
+
+
+def test_utilization():
+    env = simpy.Environment()
+    workforce = Workforce(env, {"a": {}, "b": {}})
+
+    def job():
+        worker = yield workforce.request()
+        yield env.timeout(3.0)
+        workforce.release(worker)
+
+    env.process(job())
+    env.run(until=4.0)
+    utilization = workforce.utilization()
+    assert utilization["a"] + utilization["b"] == 0.75